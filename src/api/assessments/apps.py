@@ -3,3 +3,8 @@ from django.apps import AppConfig
 
 class AssessmentsConfig(AppConfig):
     name = 'assessments'
+
+    def ready(self):
+        from . import signals
+        from .attempts import signals as attempt_signals
+        from .reports import signals as report_signals
@@ -1,6 +1,6 @@
 from django.core.exceptions import ObjectDoesNotExist
 
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.utils.translation import gettext_lazy as _
 
 from ext.django.db.models import BaseModel
@@ -145,6 +145,16 @@ class RatingField(models.PositiveSmallIntegerField):
 class Attempt(BaseModel):
     class Meta:
         abstract = True
+        constraints = [
+            models.UniqueConstraint(
+                fields=['assessment', 'attempt_number'],
+                name='unique_%(class)s_attempt_number'
+            )
+        ]
+
+    # The number of times to retry creating an attempt if a concurrent
+    # attempt at the same assessment claimed the attempt number first.
+    create_retries = 3
 
     attempt_type = AttemptTypeField()
     assessment = models.ForeignKey('assessments.Assessment', related_name='+', on_delete=models.CASCADE)
@@ -168,7 +178,7 @@ class Attempt(BaseModel):
             Annotates any assessment options for the current subject node
             onto the assessment instance
             """
-            from api.assessments.models import AssessmentOptions
+            from ..models import AssessmentOptions
 
             assessment_options = (AssessmentOptions.objects
                 .filter_subject_node_or_defaults(
@@ -192,13 +202,69 @@ class Attempt(BaseModel):
                 raise ValueError('An assessment is required')
 
             kwargs = dict(kwargs)
-            kwargs.update(
-                assessment=assessment,
-                attempt_number=self
-                    .filter(assessment=assessment)
-                    .max_attempt_number() + 1
+            kwargs.update(assessment=assessment)
+
+            # The latest attempt doubles as a counter for the assessment's attempt
+            # numbers. Locking it serializes concurrent attempts at the same
+            # assessment, and the unique attempt number constraint catches two
+            # concurrent first attempts.
+            for retry in range(self.model.create_retries):
+                try:
+                    with transaction.atomic():
+                        attempt_number = AssessmentLatestAttempt.objects.next_attempt_number(assessment.id)
+                        if attempt_number is None or retry > 0:
+                            # There is no counter, or it is behind the attempt table
+                            attempt_number = (self.model._base_manager
+                                .filter(assessment_id=assessment.id)
+                                .aggregate(n=models.Max('attempt_number'))['n'] or 0) + 1
+                        kwargs.update(attempt_number=attempt_number)
+                        attempt = super().create(*args, **kwargs)
+                        AssessmentLatestAttempt.objects.record_attempt(attempt)
+                    return attempt
+                except IntegrityError as e:
+                    if not self.is_attempt_number_conflict(e) or retry == self.model.create_retries - 1:
+                        raise
+
+        def is_attempt_number_conflict(self, error):
+            """
+            Whether the error is a violation of the unique (assessment, attempt_number) constraint
+            """
+            message = str(error)
+            table = self.model._meta.db_table
+            return (
+                f'unique_{self.model._meta.model_name}_attempt_number' in message
+                # sqlite reports the columns of the constraint, rather than its name
+                or (f'{table}.assessment_id' in message and f'{table}.attempt_number' in message)
             )
-            return super().create(*args, **kwargs)
+
+        def bulk_create_attempts(self, attempts, batch_size=500):
+            """
+            Create many attempts, possibly at many assessments, in one transaction.
+
+            Attempts are numbered in the order given, following the existing
+            attempts at each assessment.
+            """
+            from ..models import Assessment
+            from ..reports.models import StaleReport
+            attempts = list(attempts)
+
+            with transaction.atomic():
+                attempt_numbers = AssessmentLatestAttempt.objects.latest_attempt_numbers(
+                    {attempt.assessment_id for attempt in attempts},
+                    attempt_model=self.model
+                )
+                for attempt in attempts:
+                    attempt_numbers[attempt.assessment_id] += 1
+                    attempt.attempt_number = attempt_numbers[attempt.assessment_id]
+
+                attempts = self.bulk_create(attempts, batch_size=batch_size)
+                AssessmentLatestAttempt.objects.record_attempts(attempts, batch_size=batch_size)
+
+                # bulk_create sends no post_save signals
+                StaleReport.objects.mark_assessments_stale(
+                    Assessment._base_manager.filter(pk__in=attempt_numbers.keys())
+                )
+            return attempts
 
     class Manager(models.Manager):
         def __init__(self, attempt_type, attempt_parameters=None):
@@ -222,15 +288,23 @@ class Attempt(BaseModel):
 
             return super().create(*args, assessment=assessment, **kwargs)
 
+        def bulk_create_attempts(self, attempts, **kwargs):
+            attempts = list(attempts)
+            for attempt in attempts:
+                attempt.attempt_type = self.attempt_type
+            return self.get_queryset().bulk_create_attempts(attempts, **kwargs)
+
         @property
         def assessment_properties(self):
             def get_is_attempted(assessment):
-                return assessment.attempt_set.exists()
+                try:
+                    return assessment.latest_attempt is not None
+                except ObjectDoesNotExist:
+                    return False
 
             def get_attempted_at(assessment):
                 try:
-                    last_assessment = assessment.attempt_set.last() 
-                    return last_assessment.created_at
+                    return assessment.latest_attempt.attempted_at
                 except ObjectDoesNotExist:
                     return None
 
@@ -240,13 +314,15 @@ class Attempt(BaseModel):
             )
 
         def annotate_assessments(self, assessments):
-            has_attempts = (
-                self.get_queryset().filter(assessment_id=models.OuterRef('id'))
-                .order_by('-attempt_number')
-            )
+            # Every derived field reads from the single join onto the
+            # latest attempt, rather than a correlated subquery per field.
             return assessments.annotate(
-                is_attempted=models.Exists(has_attempts),
-                attempted_at=models.Subquery(has_attempts.values('created_at')[:1])
+                is_attempted=models.Case(
+                    models.When(latest_attempt__isnull=False, then=models.Value(True)),
+                    default=models.Value(False),
+                    output_field=models.BooleanField()
+                ),
+                attempted_at=models.F('latest_attempt__attempted_at')
             )
 
         def get_assessment_option(self, schema, subject_node, name):
@@ -284,8 +360,7 @@ class PassFailAttempt(Attempt):
         def assessment_properties(self):
             def get_is_pass(assessment):
                 try: 
-                    attempt = self.attempt_set.last()
-                    return attempt.state == PassFailState.PASS
+                    return assessment.latest_attempt.state == PassFailState.PASS
                 except ObjectDoesNotExist:
                     return None
 
@@ -296,12 +371,13 @@ class PassFailAttempt(Attempt):
             return props
 
         def annotate_assessments(self, assessment_set):
-            is_pass = (
-                self.get_queryset()
-                .filter(assessment_id=models.OuterRef('id'), state=PassFailState.PASS)
-            )
+            assessment_set = super().annotate_assessments(assessment_set)
             return assessment_set.annotate(
-                is_pass=models.Exists(is_pass)
+                is_pass=models.Case(
+                    models.When(latest_attempt__state=PassFailState.PASS, then=models.Value(True)),
+                    default=models.Value(False),
+                    output_field=models.BooleanField()
+                )
             )
 
     objects = Manager.from_queryset(Attempt.QuerySet)()
@@ -326,8 +402,7 @@ class CompletionBasedAttempt(Attempt):
         def assessment_properties(self):
             def get_completion_state(assessment):
                 try:
-                    attempt = assessment.attempt_set.last()
-                    return attempt.state
+                    return assessment.latest_attempt.state
                 except ObjectDoesNotExist:
                     return None
 
@@ -348,14 +423,18 @@ class CompletionBasedAttempt(Attempt):
         def annotate_assessments(self, assessment_set):
             assessment_set = super().annotate_assessments(assessment_set)
 
-            most_recent_state = (
-                self.get_queryset()
-                .filter(assessment_id=models.OuterRef('id'), attempt_number=self.max_attempt_number())
-            )
             return assessment_set.annotate(
-                is_complete=models.Exists(most_recent_state.filter(state=CompletionState.COMPLETE)),
-                is_partially_complete=models.Exists(most_recent_state.filter(state=CompletionState.PARTIALLY_COMPLETE)),
-                completion_state=models.Subquery(most_recent_state.values('state'))
+                is_complete=models.Case(
+                    models.When(latest_attempt__state=CompletionState.COMPLETE, then=models.Value(True)),
+                    default=models.Value(False),
+                    output_field=models.BooleanField()
+                ),
+                is_partially_complete=models.Case(
+                    models.When(latest_attempt__state=CompletionState.PARTIALLY_COMPLETE, then=models.Value(True)),
+                    default=models.Value(False),
+                    output_field=models.BooleanField()
+                ),
+                completion_state=models.F('latest_attempt__state')
             )
 
     objects = Manager.from_queryset(Attempt.QuerySet)()
@@ -380,20 +459,24 @@ class RatedAttempt(Attempt):
         def assessment_properties(self):
             def rating(assessment):
                 try:
-                    attempt = assessment.attempt_set.last()
-                    return attempt.rating
+                    return assessment.latest_attempt.rating
                 except ObjectDoesNotExist:
                     return None
 
             def max_available_rating(assessment):
-                return assessment.get_option('ratedattempt_max_available_rating')
+                try:
+                    return assessment.get_option('ratedattempt_max_available_rating')
+                except KeyError:
+                    return None
 
             def rating_percent(assessment):
-                try:
-                    attempt = assessment.attempt_set.last()
-                    return attempt.rating_percent
-                except ObjectDoesNotExist:
+                rating = assessment.rating
+                max_available_rating = assessment.max_available_rating
+                if rating is None or max_available_rating is None:
                     return None
+                if max_available_rating == 0:
+                    return 0
+                return (100 * rating) / max_available_rating
 
             props = dict(super().assessment_properties)
             props.update(
@@ -409,14 +492,8 @@ class RatedAttempt(Attempt):
 
             # TODO: This doesn't have to be the most recent rating.
             #       It could be configured in the options, if 
-            most_recent_rating = (
-                self.get_queryset()
-                .filter(assessment_id=models.OuterRef('id'))
-                .order_by('-attempt_number')[:1]
-            )
-
             return assessment_set.annotate(
-                rating=models.Subquery(most_recent_rating.values('rating'))
+                rating=models.F('latest_attempt__rating')
             )
 
     objects = Manager.from_queryset(Attempt.QuerySet)()
@@ -433,8 +510,7 @@ class GradedAttempt(Attempt):
         def assesment_poroperties(self):
             def get_grade(assessment):
                 try:
-                    assessment = assessment.attempt_set.last()
-                    return attempt.grade
+                    return assessment.latest_attempt.grade
                 except ObjectDoesNotExist:
                     return None
 
@@ -448,22 +524,148 @@ class GradedAttempt(Attempt):
         def annotate_assessments(self, assessment_set):
             assessment_set = super().annotate_assessments(assessment_set)
 
-            most_recent_grade = (
-                self.get_queryset()
-                .filter(assessment_id=models.OuterRef('id'))
-                .order_by('-attempt_number')
-                .values('grade')[:1]
-            )
-
-            assessment_set.annotate(
-                grade=models.Subquery(most_recent_grade)
+            return assessment_set.annotate(
+                grade=models.F('latest_attempt__grade')
             )
 
     objects = Manager.from_queryset(Attempt.QuerySet)()
 
 
+class AssessmentLatestAttempt(models.Model):
+    """
+    The most recent attempt at each assessment, across every attempt type.
 
+    Recorded alongside the attempt tables by `Attempt.QuerySet.create` and 
+    `bulk_create_attempts`, and rebuilt for the assessment whenever an existing
+    attempt is saved or deleted (see `attempts.signals`), so that assessments can be 
+    annotated with a single join rather than searching the attempt tables for 
+    the latest attempt.
+
+    Writes which bypass both (eg. bulk inserts or queryset updates and deletes) 
+    must call `rebuild` for the assessments they touch.
+
+    Rebuild with `manage.py backfill_latest_attempts`.
+    """
+    assessment = models.OneToOneField(
+        'assessments.Assessment',
+        primary_key=True,
+        related_name='latest_attempt',
+        on_delete=models.CASCADE
+    )
+    attempt_type = AttemptTypeField()
+    attempt_number = models.PositiveSmallIntegerField()
+    attempted_at = models.DateTimeField()
+
+    state = models.CharField(max_length=20, null=True)
+    rating = RatingField(null=True)
+    grade = GradeStateField(null=True)
+
+    @classmethod
+    def from_attempt(cls, attempt):
+        return cls(
+            assessment_id=attempt.assessment_id,
+            attempt_type=attempt.attempt_type,
+            attempt_number=attempt.attempt_number,
+            attempted_at=attempt.created_at,
+            state=getattr(attempt, 'state', None),
+            rating=getattr(attempt, 'rating', None),
+            grade=getattr(attempt, 'grade', None)
+        )
+
+    class Manager(models.Manager):
+        def next_attempt_number(self, assessment_id):
+            """
+            Lock the latest attempt at the assessment until the end of the
+            current transaction and return the number of the next attempt,
+            or `None` if no latest attempt has been recorded.
+            """
+            attempt_number = (self.select_for_update()
+                .filter(assessment_id=assessment_id)
+                .values_list('attempt_number', flat=True)
+                .first())
+            return attempt_number and attempt_number + 1
 
+        def latest_attempt_numbers(self, assessment_ids, attempt_model=None):
+            """
+            Lock the latest attempts at the assessments until the end of the current
+            transaction and return the number of the latest attempt at each.
 
+            Assessments with no recorded latest attempt are numbered from the
+            attempts in the attempt table, if given.
+            """
+            attempt_numbers = dict.fromkeys(assessment_ids, 0)
+            recorded = dict(self.select_for_update()
+                .filter(assessment_id__in=attempt_numbers.keys())
+                .values_list('assessment_id', 'attempt_number'))
+            attempt_numbers.update(recorded)
+
+            missing_ids = attempt_numbers.keys() - recorded.keys()
+            if attempt_model is not None and missing_ids:
+                attempt_numbers.update(attempt_model._base_manager
+                    .filter(assessment_id__in=missing_ids)
+                    .values('assessment_id')
+                    .annotate(n=models.Max('attempt_number'))
+                    .values_list('assessment_id', 'n'))
+            return attempt_numbers
+
+        def record_attempts(self, attempts, batch_size=None):
+            """
+            Bulk equivalent of `record_attempt`. 
+            """
+            latest = {}
+            for attempt in attempts:
+                latest[attempt.assessment_id] = self.model.from_attempt(attempt)
+
+            existing = set(self
+                .filter(assessment_id__in=latest.keys())
+                .values_list('assessment_id', flat=True))
+            self.bulk_update(
+                [latest[assessment_id] for assessment_id in existing],
+                [field.name for field in self.model._meta.concrete_fields if not field.primary_key],
+                batch_size=batch_size
+            )
+            self.bulk_create(
+                [latest[assessment_id] for assessment_id in latest.keys() - existing],
+                batch_size=batch_size
+            )
+            return list(latest.values())
 
+        def record_attempt(self, attempt):
+            """
+            Record the attempt as the latest attempt at its assessment.
+            Must be called in the same transaction which creates the attempt.
+            """
+            latest = self.model.from_attempt(attempt)
+            values = {
+                field.attname: getattr(latest, field.attname)
+                for field in self.model._meta.concrete_fields
+                if not field.primary_key
+            }
+            if not self.filter(assessment_id=attempt.assessment_id).update(**values):
+                latest.save(force_insert=True)
+            return latest
+
+        def rebuild(self, assessment_ids=None):
+            """
+            Rebuild the latest attempts from the attempt tables, for the given
+            assessments or for every assessment if none are given.
 
+            Returns the number of latest attempts written.
+            """
+            latest = {}
+            for attempt_model in (PassFailAttempt, CompletionBasedAttempt, RatedAttempt, GradedAttempt):
+                attempts = attempt_model._base_manager.order_by('assessment_id', 'attempt_number')
+                if assessment_ids is not None:
+                    attempts = attempts.filter(assessment_id__in=assessment_ids)
+                for attempt in attempts.iterator():
+                    latest[attempt.assessment_id] = self.model.from_attempt(attempt)
+
+            with transaction.atomic():
+                stale = self.all()
+                if assessment_ids is not None:
+                    stale = stale.filter(assessment_id__in=assessment_ids)
+                stale.delete()
+                self.bulk_create(latest.values(), batch_size=500)
+            return len(latest)
+
+    objects = Manager()
@@ -1,16 +1,46 @@
+from uuid import UUID, uuid4
+
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
 from ..models import AssessmentSchema, Assessment
 
 from .models import (
-	AttemptType,
+	Attempt, AttemptType,
 	PassFailState, PassFailAttempt,
 	CompletionState, CompletionBasedAttempt,
 	RatedAttempt,
 	GradeState, GradedAttempt
 )
 
+class AttemptAssessmentField(serializers.PrimaryKeyRelatedField):
+	"""
+	When attempts are validated in bulk, the assessments they reference are
+	loaded up front and provided in the serializer context, rather than
+	being fetched for each attempt.
+
+	An id which is not a UUID is reported as an unknown assessment.
+	"""
+	default_error_messages = {
+		'does_not_exist': 'Unknown assessment "{pk_value}".'
+	}
+
+	def to_internal_value(self, data):
+		try:
+			assessment_id = UUID(str(data))
+		except ValueError:
+			self.fail('does_not_exist', pk_value=data)
+
+		assessments = self.context.get('assessments', None)
+		if assessments is None:
+			return super().to_internal_value(assessment_id)
+
+		try:
+			return assessments[assessment_id]
+		except KeyError:
+			self.fail('does_not_exist', pk_value=data)
+
+
 class AttemptSerializer(serializers.Serializer):
 	@staticmethod
 	def for_attempt_type(attempt_type, *args, **kwargs):
@@ -23,7 +53,7 @@ class AttemptSerializer(serializers.Serializer):
 
 		return cls(*args, **kwargs)
 
-	assessment 		= serializers.PrimaryKeyRelatedField(queryset=Assessment._base_manager.all())
+	assessment 		= AttemptAssessmentField(queryset=Assessment._base_manager.all())
 	assessment_type = serializers.CharField()
 	attempt_type 	= serializers.CharField(max_length=64, read_only=True)
 
@@ -34,9 +64,23 @@ class AttemptSerializer(serializers.Serializer):
 	def attempt_type(self):
 		return type(self).Meta.attempt_type
 
+	@property
+	def assessment_schema(self):
+		"""
+		The schema of the assessment type, if provided by the serializer context
+		"""
+		return self.context.get('assessment_schema', None)
+
 	def validate_assessment_type(self, assessment_type):
+		if self.assessment_schema is not None:
+			if self.assessment_schema.type != assessment_type:
+				raise ValidationError(detail={
+					'assessment_type': f'Expected a {self.assessment_schema.type} assessment'
+				})
+			return assessment_type
+
 		try:
-			AssessmentSchema.objects.get(type=assessment_type)
+			AssessmentSchema.objects.get_for_type(assessment_type)
 		except AssessmentSchema.DoesNotExist:
 			raise ValidationError(detail={
 				'assessment_type': 'Unrecognised assessment type'
@@ -50,15 +94,41 @@ class AttemptSerializer(serializers.Serializer):
 		except KeyError:
 			raise ValidationError(detail={'assessment_type', 'assessment_type is required'})
 
-		assessment_schema = AssessmentSchema.objects.get(type=assessment_type)
+		assessment_schema = self.assessment_schema or AssessmentSchema.objects.get_for_type(assessment_type)
 		if assessment_schema.attempt_type != self.attempt_type:
-			raise ValidationError(f'A {self.attempt_type.label} attempt cannot be directly associated with a {assessment.type} assessment')
+			raise ValidationError(f'A {self.attempt_type.label} attempt cannot be directly associated with a {assessment_schema.type} assessment')
 
-		assessment = assessment_schema.assessment_set.get(pk=data['assessment'].id)
-		data['assessment'] = assessment
+		if self.assessment_schema is not None:
+			if data['assessment'].schema_id != assessment_schema.id:
+				raise ValidationError(detail={
+					'assessment': f'Not a {assessment_schema.type} assessment'
+				})
+		else:
+			data['assessment'] = assessment_schema.assessment_set.get(pk=data['assessment'].id)
 
 		return data
 
+	def build_attempt(self, validated_data):
+		"""
+		An unsaved attempt, for creating attempts in bulk.
+
+		The values of the type specific fields of the attempt are provided by 
+		`get_attempt_values`, which each attempt type's serializer defines.
+		"""
+		model = Attempt.objects_of_type(self.attempt_type).model
+		return model(
+			id=uuid4(),
+			assessment=validated_data['assessment'],
+			**self.get_attempt_values(validated_data)
+		)
+
+	def create(self, validated_data):
+		return Attempt.objects_of_type(self.attempt_type).create(
+			id=uuid4(),
+			assessment=validated_data['assessment'],
+			**self.get_attempt_values(validated_data)
+		)
+
 
 class PassFailAttemptSerializer(AttemptSerializer):
 	is_pass = serializers.BooleanField()
@@ -66,9 +136,8 @@ class PassFailAttemptSerializer(AttemptSerializer):
 	class Meta:
 		attempt_type = AttemptType.PASS_FAIL
 
-	def create(self, validated_data):
-		return PassFailAttempt.objects.create(
-			assessment=validated_data['assessment'],
+	def get_attempt_values(self, validated_data):
+		return dict(
 			state=PassFailState.PASS if validated_data['is_pass'] else PassFailState.FAIL
 		)
 
@@ -82,11 +151,8 @@ class CompletionBasedAttemptSerializer(AttemptSerializer):
 	is_partially_complete = serializers.BooleanField(read_only=True)
 
 
-	def create(self, validated_data):
-		return CompletionBasedAttempt.objects.create(
-			assessment=validated_data['assessment'],
-			state=validated_data['state']
-		)
+	def get_attempt_values(self, validated_data):
+		return dict(state=validated_data['state'])
 
 
 
@@ -99,11 +165,8 @@ class RatedAttemptSerializer(AttemptSerializer):
 
 	percent_rating = serializers.FloatField(read_only=True)
 
-	def create(self, validated_data):
-		return RatedAttempt.objects.create(
-			assessment=validated_data['assessment'],
-			rating=validated_data['rating']
-		)
+	def get_attempt_values(self, validated_data):
+		return dict(rating=validated_data['rating'])
 
 
 
@@ -113,10 +176,5 @@ class GradedAttemptSerializer(AttemptSerializer):
 
 	grade = serializers.ChoiceField(choices=GradeState.choices)
 
-	def create(self, validated_data):
-		return GradedAttempt.objects.create(
-			assessment=validated_data['assessment'],
-			grade=validated_data['grade']
-		)
-
-
+	def get_attempt_values(self, validated_data):
+		return dict(grade=validated_data['grade'])
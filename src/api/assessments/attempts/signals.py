@@ -0,0 +1,23 @@
+from django.db.models.signals import post_save, post_delete
+
+from .models import (
+    AssessmentLatestAttempt,
+    PassFailAttempt,
+    CompletionBasedAttempt,
+    RatedAttempt,
+    GradedAttempt
+)
+
+
+ATTEMPT_MODELS = (PassFailAttempt, CompletionBasedAttempt, RatedAttempt, GradedAttempt)
+
+
+def rebuild_latest_attempt(sender, instance, created=False, **kwargs):
+    # New attempts are recorded by `Attempt.QuerySet.create`, but attempts 
+    # which are edited or deleted may change the latest attempt.
+    if not created:
+        AssessmentLatestAttempt.objects.rebuild([instance.assessment_id])
+
+for attempt_model in ATTEMPT_MODELS:
+    post_save.connect(rebuild_latest_attempt, sender=attempt_model)
+    post_delete.connect(rebuild_latest_attempt, sender=attempt_model)
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from assessments.models import AssessmentLatestAttempt
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the latest attempt at each assessment from the attempt tables'
+
+    def handle(self, *args, **options):
+        count = AssessmentLatestAttempt.objects.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Recorded latest attempts for {count} assessments'))
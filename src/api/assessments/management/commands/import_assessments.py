@@ -0,0 +1,38 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from assessments.models import Assessment, AssessmentLatestAttempt, StaleReport
+from utils.importer.pipeline import AssessmentImport
+
+
+class Command(BaseCommand):
+    help = 'Import the assessments and attempts recorded in the source workbook'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500,
+            help='The number of assessments to accumulate before each bulk insert')
+        parser.add_argument('--upsert', action='store_true',
+            help='Re-import into a database which already contains assessments, '
+                 'inserting and updating only the rows which differ from the workbook')
+
+    def handle(self, *args, **options):
+        if not options['upsert'] and Assessment._base_manager.exists():
+            raise CommandError(
+                'The database already contains assessments. '
+                'Importing the workbook again would duplicate them (use --upsert to re-sync).'
+            )
+
+        with transaction.atomic():
+            assessment_import = AssessmentImport(
+                apps, 
+                batch_size=options['batch_size'], 
+                upsert=options['upsert']
+            ).run()
+
+            # Attempts are bulk inserted, so the latest attempts and stale
+            # reports are not maintained as the attempts are created.
+            AssessmentLatestAttempt.objects.rebuild(assessment_ids=assessment_import.assessment_ids)
+            StaleReport.objects.mark_assessments_stale(assessment_import.changed_assessments())
+
+        self.stdout.write(self.style.SUCCESS(assessment_import.summary()))
@@ -0,0 +1,53 @@
+# Generated by Django 3.0.5 on 2026-10-18 13:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0007_auto_20200505_1636'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='completionbasedprogress',
+            name='input_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='completionbasedprogress',
+            name='inputs_updated_at',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name='gradedprogress',
+            name='input_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gradedprogress',
+            name='inputs_updated_at',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name='passfailprogress',
+            name='input_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='passfailprogress',
+            name='inputs_updated_at',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name='ratedprogress',
+            name='input_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='ratedprogress',
+            name='inputs_updated_at',
+            field=models.DateTimeField(null=True),
+        ),
+    ]
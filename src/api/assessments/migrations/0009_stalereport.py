@@ -0,0 +1,35 @@
+# Generated by Django 3.0.5 on 2026-10-18 13:23
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subjects', '0004_auto_20200505_1621'),
+        ('schools', '0006_auto_20200505_1621'),
+        ('assessments', '0008_progress_watermark'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StaleReport',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, primary_key=True, serialize=False)),
+                ('marked_at', models.DateTimeField(auto_now=True)),
+                ('assessment_schema', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='assessments.AssessmentSchema')),
+                ('subject_class', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='schools.SubjectClass')),
+                ('subject_node', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='subjects.SubjectNode')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='stalereport',
+            constraint=models.UniqueConstraint(fields=('assessment_schema_id', 'subject_node_id', 'subject_class_id'), name='unique_stalereport'),
+        ),
+        migrations.AddConstraint(
+            model_name='stalereport',
+            constraint=models.UniqueConstraint(condition=models.Q(subject_class_id=None), fields=('assessment_schema_id', 'subject_node_id'), name='unique_wo_class_stalereport'),
+        ),
+    ]
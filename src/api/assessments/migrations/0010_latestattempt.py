@@ -0,0 +1,56 @@
+# Generated by Django 3.0.5 on 2026-10-18 13:28
+
+import assessments.attempts.models
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def latest_attempt_select(table, state='NULL', rating='NULL', grade='NULL'):
+    return f"""
+    SELECT assessment_id, attempt_type, attempt_number, created_at,
+           {state} AS state, {rating} AS rating, {grade} AS grade
+    FROM (
+        SELECT *, ROW_NUMBER() OVER (
+            PARTITION BY assessment_id ORDER BY attempt_number DESC
+        ) AS attempt_rank
+        FROM {table}
+    ) AS ranked_attempt
+    WHERE attempt_rank = 1
+    """
+
+
+CREATE_LATEST_ATTEMPT_VIEW = 'CREATE VIEW assessments_latestattempt AS ' + ' UNION ALL '.join([
+    latest_attempt_select('assessments_passfailattempt', state='state'),
+    latest_attempt_select('assessments_completionbasedattempt', state='state'),
+    latest_attempt_select('assessments_ratedattempt', rating='rating'),
+    latest_attempt_select('assessments_gradedattempt', grade='grade'),
+])
+
+DROP_LATEST_ATTEMPT_VIEW = 'DROP VIEW IF EXISTS assessments_latestattempt'
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0009_stalereport'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LatestAttempt',
+            fields=[
+                ('assessment', models.OneToOneField(on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='latest_attempt', serialize=False, to='assessments.Assessment')),
+                ('attempt_type', assessments.attempts.models.AttemptTypeField()),
+                ('attempt_number', models.PositiveSmallIntegerField()),
+                ('created_at', models.DateTimeField()),
+                ('state', models.CharField(max_length=20, null=True)),
+                ('rating', assessments.attempts.models.RatingField(null=True)),
+                ('grade', assessments.attempts.models.GradeStateField(null=True)),
+            ],
+            options={
+                'db_table': 'assessments_latestattempt',
+                'managed': False,
+            },
+        ),
+        migrations.RunSQL(CREATE_LATEST_ATTEMPT_VIEW, DROP_LATEST_ATTEMPT_VIEW),
+    ]
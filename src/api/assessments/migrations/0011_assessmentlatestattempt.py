@@ -0,0 +1,49 @@
+# Generated by Django 3.0.5 on 2026-10-18 13:29
+
+import assessments.attempts.models
+from django.db import migrations, models
+import django.db.models.deletion
+from importlib import import_module
+
+latest_attempt_view = import_module('assessments.migrations.0010_latestattempt')
+
+BACKFILL_LATEST_ATTEMPTS = (
+    'INSERT INTO assessments_assessmentlatestattempt '
+    '(assessment_id, attempt_type, attempt_number, attempted_at, state, rating, grade) '
+    + ' UNION ALL '.join([
+        latest_attempt_view.latest_attempt_select('assessments_passfailattempt', state='state'),
+        latest_attempt_view.latest_attempt_select('assessments_completionbasedattempt', state='state'),
+        latest_attempt_view.latest_attempt_select('assessments_ratedattempt', rating='rating'),
+        latest_attempt_view.latest_attempt_select('assessments_gradedattempt', grade='grade'),
+    ])
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0010_latestattempt'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            latest_attempt_view.DROP_LATEST_ATTEMPT_VIEW,
+            latest_attempt_view.CREATE_LATEST_ATTEMPT_VIEW
+        ),
+        migrations.DeleteModel(
+            name='LatestAttempt',
+        ),
+        migrations.CreateModel(
+            name='AssessmentLatestAttempt',
+            fields=[
+                ('assessment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='latest_attempt', serialize=False, to='assessments.Assessment')),
+                ('attempt_type', assessments.attempts.models.AttemptTypeField()),
+                ('attempt_number', models.PositiveSmallIntegerField()),
+                ('attempted_at', models.DateTimeField()),
+                ('state', models.CharField(max_length=20, null=True)),
+                ('rating', assessments.attempts.models.RatingField(null=True)),
+                ('grade', assessments.attempts.models.GradeStateField(null=True)),
+            ],
+        ),
+        migrations.RunSQL(BACKFILL_LATEST_ATTEMPTS, migrations.RunSQL.noop),
+    ]
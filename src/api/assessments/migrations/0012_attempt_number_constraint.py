@@ -0,0 +1,29 @@
+# Generated by Django 3.0.5 on 2026-10-18 13:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0011_assessmentlatestattempt'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='completionbasedattempt',
+            constraint=models.UniqueConstraint(fields=('assessment', 'attempt_number'), name='unique_completionbasedattempt_attempt_number'),
+        ),
+        migrations.AddConstraint(
+            model_name='gradedattempt',
+            constraint=models.UniqueConstraint(fields=('assessment', 'attempt_number'), name='unique_gradedattempt_attempt_number'),
+        ),
+        migrations.AddConstraint(
+            model_name='passfailattempt',
+            constraint=models.UniqueConstraint(fields=('assessment', 'attempt_number'), name='unique_passfailattempt_attempt_number'),
+        ),
+        migrations.AddConstraint(
+            model_name='ratedattempt',
+            constraint=models.UniqueConstraint(fields=('assessment', 'attempt_number'), name='unique_ratedattempt_attempt_number'),
+        ),
+    ]
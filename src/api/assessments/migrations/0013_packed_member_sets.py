@@ -0,0 +1,884 @@
+# Generated by Django 3.0.5 on 2026-10-18 13:35
+
+from array import array
+from uuid import UUID
+
+from django.db import migrations, models
+
+
+GRADES = [
+    'a_plus', 'a', 'a_minus', 'b_plus', 'b', 'b_minus', 
+    'c_plus', 'c', 'c_minus', 'd_plus', 'd', 'd_minus', 'f'
+]
+
+CANDIDATE_SETS = [
+    ('_candidate_ids', 'candidate'),
+    ('_attempt_candidate_ids', 'attempted_candidate'),
+]
+
+ASSESSMENT_SETS = [
+    ('_assessment_ids', 'assessment'),
+    ('_attempted_assessment_ids', 'attempted_assessment'),
+]
+
+# For each document model, the comma delimited column of each set of ids, along with 
+# the name of its packed set. A set `name` is stored in the `_{name}_bitmap` and 
+# `{name}_count` fields.
+PACKED_SETS = {
+    'PassFailReport': CANDIDATE_SETS + [
+        ('_passed_candidate_ids', 'passed_candidate'),
+    ],
+    'CompletionBasedReport': CANDIDATE_SETS + [
+        ('_partially_complete_candidate_ids', 'partially_complete_candidate'),
+        ('_complete_candidate_ids', 'complete_candidate'),
+    ],
+    'GradedReport': CANDIDATE_SETS + [
+        (f'_grade_{grade}_candidate_ids', f'grade_{grade}_candidate') for grade in GRADES
+    ],
+    'RatedReport': CANDIDATE_SETS,
+    'PassFailProgress': ASSESSMENT_SETS + [
+        ('_passed_assessments', 'passed_assessment'),
+    ],
+    'CompletionBasedProgress': ASSESSMENT_SETS + [
+        ('_partially_complete_assessments', 'partially_complete_assessment'),
+        ('_complete_assessments', 'complete_assessment'),
+    ],
+    'GradedProgress': ASSESSMENT_SETS + [
+        (f'_grade_{grade}_assessment_ids', f'grade_{grade}_assessment') for grade in GRADES
+    ],
+    'RatedProgress': ASSESSMENT_SETS,
+}
+
+# The 'id:rating' delimited columns which are converted to arrays of ratings over 
+# the packed members. The old columns are renamed so the new fields can take their name.
+PACKED_VALUES = {
+    'RatedReport': ('_legacy_candidate_ratings', '_candidate_ratings'),
+    'RatedProgress': ('_legacy_assessment_ratings', '_assessment_ratings'),
+}
+
+MISSING_VALUE = 0xFFFF
+
+
+def parse_ids(text):
+    return [UUID(hex=member_id) for member_id in text.split(',') if member_id]
+
+def parse_values(text):
+    values = {}
+    for pair in text.split(','):
+        member_id, _, value = pair.partition(':')
+        if member_id and value not in ('', 'None'):
+            values[UUID(hex=member_id)] = int(float(value))
+    return values
+
+
+def pack_document(document, sets, packed_values):
+    pool = {}
+    def member_index(member_id):
+        return pool.setdefault(member_id, len(pool))
+
+    for old_attr, name in sets:
+        member_ids = list(dict.fromkeys(parse_ids(getattr(document, old_attr))))
+        bits = 0
+        for member_id in member_ids:
+            bits |= 1 << member_index(member_id)
+        setattr(document, f'_{name}_bitmap', bits.to_bytes((bits.bit_length() + 7) // 8, 'little'))
+        setattr(document, f'{name}_count', len(member_ids))
+
+    if packed_values is not None:
+        old_attr, attr = packed_values
+        values = parse_values(getattr(document, old_attr))
+        indexes = {member_id: member_index(member_id) for member_id in values}
+        packed = array('H', [MISSING_VALUE] * len(pool))
+        for member_id, value in values.items():
+            packed[indexes[member_id]] = value
+        setattr(document, attr, packed.tobytes())
+
+    document._member_ids = b''.join(member_id.bytes for member_id in pool)
+
+def unpack_document(document, sets, packed_values):
+    members = bytes(document._member_ids)
+    pool = [UUID(bytes=members[offset:offset + 16]) for offset in range(0, len(members), 16)]
+
+    for old_attr, name in sets:
+        bits = int.from_bytes(bytes(getattr(document, f'_{name}_bitmap')), 'little')
+        setattr(document, old_attr, ','.join(
+            member_id.hex for index, member_id in enumerate(pool) if (bits >> index) & 1
+        ))
+
+    if packed_values is not None:
+        old_attr, attr = packed_values
+        packed = array('H', bytes(getattr(document, attr)))
+        setattr(document, old_attr, ','.join(
+            f'{pool[index].hex}:{value}' for index, value in enumerate(packed)
+            if value != MISSING_VALUE
+        ))
+
+
+def convert_documents(convert):
+    def convert_all(apps, schema_editor):
+        for model_name, sets in PACKED_SETS.items():
+            model = apps.get_model('assessments', model_name)
+            packed_values = PACKED_VALUES.get(model_name)
+
+            fields = ['_member_ids']
+            for old_attr, name in sets:
+                fields += [old_attr, f'_{name}_bitmap', f'{name}_count']
+            if packed_values is not None:
+                fields += list(packed_values)
+
+            documents = list(model._base_manager.only('pk', *fields))
+            for document in documents:
+                convert(document, sets, packed_values)
+            model._base_manager.bulk_update(documents, fields, batch_size=500)
+    return convert_all
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0012_attempt_number_constraint'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='ratedreport',
+            old_name='_candidate_ratings',
+            new_name='_legacy_candidate_ratings',
+        ),
+        migrations.RenameField(
+            model_name='ratedprogress',
+            old_name='_assessment_ratings',
+            new_name='_legacy_assessment_ratings',
+        ),
+        migrations.AddField(
+            model_name='completionbasedprogress',
+            name='_assessment_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='completionbasedprogress',
+            name='_attempted_assessment_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='completionbasedprogress',
+            name='_complete_assessment_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='completionbasedprogress',
+            name='_member_ids',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='completionbasedprogress',
+            name='_partially_complete_assessment_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='completionbasedprogress',
+            name='assessment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='completionbasedprogress',
+            name='attempted_assessment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='completionbasedprogress',
+            name='complete_assessment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='completionbasedprogress',
+            name='partially_complete_assessment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='completionbasedreport',
+            name='_attempted_candidate_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='completionbasedreport',
+            name='_candidate_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='completionbasedreport',
+            name='_complete_candidate_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='completionbasedreport',
+            name='_member_ids',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='completionbasedreport',
+            name='_partially_complete_candidate_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='completionbasedreport',
+            name='attempted_candidate_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='completionbasedreport',
+            name='candidate_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='completionbasedreport',
+            name='complete_candidate_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='completionbasedreport',
+            name='partially_complete_candidate_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gradedprogress',
+            name='_assessment_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='gradedprogress',
+            name='_attempted_assessment_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='gradedprogress',
+            name='_grade_a_assessment_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='gradedprogress',
+            name='_grade_a_minus_assessment_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='gradedprogress',
+            name='_grade_a_plus_assessment_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='gradedprogress',
+            name='_grade_b_assessment_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='gradedprogress',
+            name='_grade_b_minus_assessment_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='gradedprogress',
+            name='_grade_b_plus_assessment_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='gradedprogress',
+            name='_grade_c_assessment_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='gradedprogress',
+            name='_grade_c_minus_assessment_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='gradedprogress',
+            name='_grade_c_plus_assessment_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='gradedprogress',
+            name='_grade_d_assessment_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='gradedprogress',
+            name='_grade_d_minus_assessment_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='gradedprogress',
+            name='_grade_d_plus_assessment_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='gradedprogress',
+            name='_grade_f_assessment_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='gradedprogress',
+            name='_member_ids',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='gradedprogress',
+            name='assessment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gradedprogress',
+            name='attempted_assessment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gradedprogress',
+            name='grade_a_assessment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gradedprogress',
+            name='grade_a_minus_assessment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gradedprogress',
+            name='grade_a_plus_assessment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gradedprogress',
+            name='grade_b_assessment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gradedprogress',
+            name='grade_b_minus_assessment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gradedprogress',
+            name='grade_b_plus_assessment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gradedprogress',
+            name='grade_c_assessment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gradedprogress',
+            name='grade_c_minus_assessment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gradedprogress',
+            name='grade_c_plus_assessment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gradedprogress',
+            name='grade_d_assessment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gradedprogress',
+            name='grade_d_minus_assessment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gradedprogress',
+            name='grade_d_plus_assessment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gradedprogress',
+            name='grade_f_assessment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gradedreport',
+            name='_attempted_candidate_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='gradedreport',
+            name='_candidate_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='gradedreport',
+            name='_grade_a_candidate_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='gradedreport',
+            name='_grade_a_minus_candidate_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='gradedreport',
+            name='_grade_a_plus_candidate_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='gradedreport',
+            name='_grade_b_candidate_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='gradedreport',
+            name='_grade_b_minus_candidate_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='gradedreport',
+            name='_grade_b_plus_candidate_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='gradedreport',
+            name='_grade_c_candidate_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='gradedreport',
+            name='_grade_c_minus_candidate_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='gradedreport',
+            name='_grade_c_plus_candidate_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='gradedreport',
+            name='_grade_d_candidate_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='gradedreport',
+            name='_grade_d_minus_candidate_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='gradedreport',
+            name='_grade_d_plus_candidate_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='gradedreport',
+            name='_grade_f_candidate_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='gradedreport',
+            name='_member_ids',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='gradedreport',
+            name='attempted_candidate_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gradedreport',
+            name='candidate_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gradedreport',
+            name='grade_a_candidate_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gradedreport',
+            name='grade_a_minus_candidate_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gradedreport',
+            name='grade_a_plus_candidate_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gradedreport',
+            name='grade_b_candidate_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gradedreport',
+            name='grade_b_minus_candidate_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gradedreport',
+            name='grade_b_plus_candidate_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gradedreport',
+            name='grade_c_candidate_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gradedreport',
+            name='grade_c_minus_candidate_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gradedreport',
+            name='grade_c_plus_candidate_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gradedreport',
+            name='grade_d_candidate_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gradedreport',
+            name='grade_d_minus_candidate_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gradedreport',
+            name='grade_d_plus_candidate_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gradedreport',
+            name='grade_f_candidate_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='passfailprogress',
+            name='_assessment_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='passfailprogress',
+            name='_attempted_assessment_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='passfailprogress',
+            name='_member_ids',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='passfailprogress',
+            name='_passed_assessment_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='passfailprogress',
+            name='assessment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='passfailprogress',
+            name='attempted_assessment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='passfailprogress',
+            name='passed_assessment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='passfailreport',
+            name='_attempted_candidate_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='passfailreport',
+            name='_candidate_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='passfailreport',
+            name='_member_ids',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='passfailreport',
+            name='_passed_candidate_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='passfailreport',
+            name='attempted_candidate_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='passfailreport',
+            name='candidate_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='passfailreport',
+            name='passed_candidate_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='ratedprogress',
+            name='_assessment_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='ratedprogress',
+            name='_attempted_assessment_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='ratedprogress',
+            name='_member_ids',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='ratedprogress',
+            name='assessment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='ratedprogress',
+            name='attempted_assessment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='ratedreport',
+            name='_attempted_candidate_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='ratedreport',
+            name='_candidate_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='ratedreport',
+            name='_member_ids',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='ratedreport',
+            name='attempted_candidate_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='ratedreport',
+            name='candidate_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='ratedprogress',
+            name='_assessment_ratings',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='ratedreport',
+            name='_candidate_ratings',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.RunPython(convert_documents(pack_document), convert_documents(unpack_document)),
+        migrations.RemoveField(
+            model_name='completionbasedprogress',
+            name='_assessment_ids',
+        ),
+        migrations.RemoveField(
+            model_name='completionbasedprogress',
+            name='_attempted_assessment_ids',
+        ),
+        migrations.RemoveField(
+            model_name='completionbasedprogress',
+            name='_complete_assessments',
+        ),
+        migrations.RemoveField(
+            model_name='completionbasedprogress',
+            name='_partially_complete_assessments',
+        ),
+        migrations.RemoveField(
+            model_name='completionbasedreport',
+            name='_attempt_candidate_ids',
+        ),
+        migrations.RemoveField(
+            model_name='completionbasedreport',
+            name='_candidate_ids',
+        ),
+        migrations.RemoveField(
+            model_name='completionbasedreport',
+            name='_complete_candidate_ids',
+        ),
+        migrations.RemoveField(
+            model_name='completionbasedreport',
+            name='_partially_complete_candidate_ids',
+        ),
+        migrations.RemoveField(
+            model_name='gradedprogress',
+            name='_assessment_ids',
+        ),
+        migrations.RemoveField(
+            model_name='gradedprogress',
+            name='_attempted_assessment_ids',
+        ),
+        migrations.RemoveField(
+            model_name='gradedprogress',
+            name='_grade_a_assessment_ids',
+        ),
+        migrations.RemoveField(
+            model_name='gradedprogress',
+            name='_grade_a_minus_assessment_ids',
+        ),
+        migrations.RemoveField(
+            model_name='gradedprogress',
+            name='_grade_a_plus_assessment_ids',
+        ),
+        migrations.RemoveField(
+            model_name='gradedprogress',
+            name='_grade_b_assessment_ids',
+        ),
+        migrations.RemoveField(
+            model_name='gradedprogress',
+            name='_grade_b_minus_assessment_ids',
+        ),
+        migrations.RemoveField(
+            model_name='gradedprogress',
+            name='_grade_b_plus_assessment_ids',
+        ),
+        migrations.RemoveField(
+            model_name='gradedprogress',
+            name='_grade_c_assessment_ids',
+        ),
+        migrations.RemoveField(
+            model_name='gradedprogress',
+            name='_grade_c_minus_assessment_ids',
+        ),
+        migrations.RemoveField(
+            model_name='gradedprogress',
+            name='_grade_c_plus_assessment_ids',
+        ),
+        migrations.RemoveField(
+            model_name='gradedprogress',
+            name='_grade_d_assessment_ids',
+        ),
+        migrations.RemoveField(
+            model_name='gradedprogress',
+            name='_grade_d_minus_assessment_ids',
+        ),
+        migrations.RemoveField(
+            model_name='gradedprogress',
+            name='_grade_d_plus_assessment_ids',
+        ),
+        migrations.RemoveField(
+            model_name='gradedprogress',
+            name='_grade_f_assessment_ids',
+        ),
+        migrations.RemoveField(
+            model_name='gradedreport',
+            name='_attempt_candidate_ids',
+        ),
+        migrations.RemoveField(
+            model_name='gradedreport',
+            name='_candidate_ids',
+        ),
+        migrations.RemoveField(
+            model_name='gradedreport',
+            name='_grade_a_candidate_ids',
+        ),
+        migrations.RemoveField(
+            model_name='gradedreport',
+            name='_grade_a_minus_candidate_ids',
+        ),
+        migrations.RemoveField(
+            model_name='gradedreport',
+            name='_grade_a_plus_candidate_ids',
+        ),
+        migrations.RemoveField(
+            model_name='gradedreport',
+            name='_grade_b_candidate_ids',
+        ),
+        migrations.RemoveField(
+            model_name='gradedreport',
+            name='_grade_b_minus_candidate_ids',
+        ),
+        migrations.RemoveField(
+            model_name='gradedreport',
+            name='_grade_b_plus_candidate_ids',
+        ),
+        migrations.RemoveField(
+            model_name='gradedreport',
+            name='_grade_c_candidate_ids',
+        ),
+        migrations.RemoveField(
+            model_name='gradedreport',
+            name='_grade_c_minus_candidate_ids',
+        ),
+        migrations.RemoveField(
+            model_name='gradedreport',
+            name='_grade_c_plus_candidate_ids',
+        ),
+        migrations.RemoveField(
+            model_name='gradedreport',
+            name='_grade_d_candidate_ids',
+        ),
+        migrations.RemoveField(
+            model_name='gradedreport',
+            name='_grade_d_minus_candidate_ids',
+        ),
+        migrations.RemoveField(
+            model_name='gradedreport',
+            name='_grade_d_plus_candidate_ids',
+        ),
+        migrations.RemoveField(
+            model_name='gradedreport',
+            name='_grade_f_candidate_ids',
+        ),
+        migrations.RemoveField(
+            model_name='passfailprogress',
+            name='_assessment_ids',
+        ),
+        migrations.RemoveField(
+            model_name='passfailprogress',
+            name='_attempted_assessment_ids',
+        ),
+        migrations.RemoveField(
+            model_name='passfailprogress',
+            name='_passed_assessments',
+        ),
+        migrations.RemoveField(
+            model_name='passfailreport',
+            name='_attempt_candidate_ids',
+        ),
+        migrations.RemoveField(
+            model_name='passfailreport',
+            name='_candidate_ids',
+        ),
+        migrations.RemoveField(
+            model_name='passfailreport',
+            name='_passed_candidate_ids',
+        ),
+        migrations.RemoveField(
+            model_name='ratedprogress',
+            name='_assessment_ids',
+        ),
+        migrations.RemoveField(
+            model_name='ratedprogress',
+            name='_attempted_assessment_ids',
+        ),
+        migrations.RemoveField(
+            model_name='ratedreport',
+            name='_attempt_candidate_ids',
+        ),
+        migrations.RemoveField(
+            model_name='ratedreport',
+            name='_candidate_ids',
+        ),
+        migrations.RemoveField(
+            model_name='ratedprogress',
+            name='_legacy_assessment_ratings',
+        ),
+        migrations.RemoveField(
+            model_name='ratedreport',
+            name='_legacy_candidate_ratings',
+        ),
+    ]
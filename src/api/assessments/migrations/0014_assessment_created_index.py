@@ -0,0 +1,17 @@
+# Generated by Django 3.0.5 on 2026-10-18 14:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0013_packed_member_sets'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assessment',
+            index=models.Index(fields=['schema_id', 'created_at', 'id'], name='index_ass_schema_created'),
+        ),
+    ]
@@ -1,8 +1,11 @@
 import re
 
+from collections import defaultdict
+
 from enum import Enum
 from uuid import uuid4, UUID
 
+from django.contrib.contenttypes.fields import GenericRelation
 from django.core import validators
 from django.core.exceptions import MultipleObjectsReturned
 from django.db import models
@@ -61,6 +64,57 @@ class AssessmentSchema(BaseModel):
     ##
     attempt_type = AttemptTypeField()
 
+    class Manager(models.Manager):
+        """
+        There are only a handful of assessment schemas and they rarely change,
+        so every schema, along with its default options, is loaded once per 
+        process and lookups by type or id are served from memory.
+
+        The cache is cleared whenever a schema or assessment options are saved
+        or deleted (see `assessments.signals`).
+        """
+        def __init__(self):
+            super().__init__()
+            self._cache = None
+
+        def _get_cache(self):
+            if self._cache is None:
+                default_options = {
+                    options.schema_id: options 
+                    for options in AssessmentOptions.objects.filter(subject_node=None)
+                }
+                cache = {'type': {}, 'id': {}}
+                for schema in self.select_related('school', 'subject'):
+                    if schema.id in default_options:
+                        schema._default_options = default_options[schema.id]
+                    cache['type'][schema.type] = schema
+                    cache['id'][schema.id] = schema
+                self._cache = cache
+            return self._cache
+
+        def get_for_type(self, schema_type):
+            try:
+                return self._get_cache()['type'][schema_type]
+            except KeyError:
+                raise self.model.DoesNotExist(f'No assessment schema with type {schema_type}')
+
+        def get_for_id(self, schema_id):
+            try:
+                return self._get_cache()['id'][schema_id]
+            except KeyError:
+                raise self.model.DoesNotExist(f'No assessment schema with id {schema_id}')
+
+        def clear_cache(self):
+            self._cache = None
+
+    objects = Manager()
+
+    @property
+    def default_options(self):
+        if not hasattr(self, '_default_options'):
+            self._default_options = AssessmentOptions.objects.get_options(self, None)
+        return self._default_options
+
     @property
     def attempt_set(self):
         return (Attempt
@@ -99,10 +153,10 @@ class AssessmentSchema(BaseModel):
         exist in any queryset annotation.
 
         """
-        if not hasattr(self, '_assessmen/vot_properties'):
+        if not hasattr(self, '_assessment_properties'):
             props = dict(Attempt.objects_of_type(self.attempt_type).assessment_properties)
             props.update(
-                type=property(lambda assessment: assessment.schema.type)
+                type=property(lambda assessment: self.type)
             )
             self._assessment_properties = props
         return self._assessment_properties
@@ -112,7 +166,33 @@ class AssessmentSchema(BaseModel):
             raise ValueError('Expected a subject node')
         if subject_node.node_type != self.subject_node_type:
             raise ValueError(f'Can only get assessment options on {self.type} for {self.subject_node_type} subject nodes')
-        return AssessmentOptions.objects.get_options(self, subject_node)
+        return self.get_assessment_options_for_node_id(subject_node.id)
+
+    def get_assessment_options_for_node_id(self, subject_node_id):
+        """
+        The options for the subject node, or the default options of the schema if
+        the node has no options of its own.
+
+        All the options of the schema are loaded on first use, so resolving
+        options is a dictionary lookup. The loaded options are discarded along
+        with the schema whenever any options are saved or deleted.
+        """
+        if not hasattr(self, '_assessment_options'):
+            self._assessment_options = {}
+            for options in AssessmentOptions.objects.filter(schema=self):
+                options.schema = self
+                self._assessment_options[options.subject_node_id] = options
+
+            if None in self._assessment_options:
+                self._default_options = self._assessment_options[None]
+
+        try:
+            return self._assessment_options[subject_node_id]
+        except KeyError:
+            return self.default_options
+
+    def get_option(self, subject_node, name):
+        return self.get_assessment_options(subject_node).get_option(name)
 
     def get_or_generate_progress(self, student, subject_node=None):
 
@@ -144,6 +224,19 @@ class AssessmentSchema(BaseModel):
 
         return report
 
+    def get_or_generate_reports(self, subject_nodes, subject_class=None):
+        """
+        Bulk version of `get_or_generate_report` which gets or generates the reports
+        for all the subject nodes in a fixed number of queries.
+        """
+        for subject_node in subject_nodes:
+            if subject_node.node_type != self.subject_node_type:
+                raise ValueError(f'subject_node must be of type {self.subject_node_type}')
+
+        return (Report
+            .objects_of_type(self.attempt_type)
+            .get_or_generate_for_nodes(self, subject_nodes, subject_class=subject_class))
+
     def annotate_assessments(self, assessment_set):
         attempts = Attempt.objects_of_type(self.attempt_type)
         return attempts.annotate_assessments(assessment_set)
@@ -187,11 +280,11 @@ class AssessmentOptions(BaseModel):
         if value is not None:
             return value
 
-        if self.subject_node is None:
+        if self.subject_node_id is None:
             raise KeyError(f'No such assessment option: {option_name}')
 
         try:
-            attempt_option_defaults = AssessmentOptions.objects.get_options(self.schema, None)
+            attempt_option_defaults = AssessmentSchema.objects.get_for_id(self.schema_id).default_options
             return attempt_option_defaults.get_option(option_name)
         except AssessmentOptions.DoesNotExist:
             raise KeyError(f'No assessment options default exists')
@@ -243,7 +336,7 @@ class AssessmentOptions(BaseModel):
             try:
                 return self.get(schema=schema, subject_node=subject_node)
             except ObjectDoesNotExist:
-                return self.get_or_create(schema=schema, subject_node=None)[0]
+                return self.get_or_create(schema=schema, subject_node=None, defaults={'id': uuid4()})[0]
             
     objects = Manager.from_queryset(QuerySet)()
 
@@ -275,6 +368,11 @@ class Assessment(BaseModel):
     #   - be of the same type as the schema's 'subject_node_type'
     subject_node    = models.ForeignKey(SubjectNode, related_name='+', on_delete=models.CASCADE)
 
+    comments        = GenericRelation(
+        Comment, 
+        content_type_field='attached_to_type', 
+        object_id_field='attached_to_id'
+    )
 
     class Meta:
         indexes = [
@@ -289,6 +387,11 @@ class Assessment(BaseModel):
             models.Index(
                 fields=['schema_id', 'subject_node_id', 'student_id'],
                 name='index_ass_schema_student_node'
+            ),
+            # Cursor pagination seeks on (created_at, id) within each schema
+            models.Index(
+                fields=['schema_id', 'created_at', 'id'],
+                name='index_ass_schema_created'
             )
 
         ]
@@ -302,36 +405,107 @@ class Assessment(BaseModel):
 
     @property
     def options(self):
-        return self.schema.get_assessment_options(self.subject_node)
+        schema = AssessmentSchema.objects.get_for_id(self.schema_id)
+        return schema.get_assessment_options_for_node_id(self.subject_node_id)
 
     def get_option(self, param_name):
         return self.options.get_option(param_name)
 
     @property
     def attempt_set(self):
-        return self.schema.attempt_set.filter(assessment=self)
+        schema = AssessmentSchema.objects.get_for_id(self.schema_id)
+        return schema.attempt_set.filter(assessment=self)
 
     @property
-    def comments(self):
-        return Comment.objects.filter(attached_to_id=self.id)
+    def attempts(self):
+        """
+        The attempts at the assessment, in the order they were made.
+        """
+        if '_attempts' not in self.__dict__:
+            self._attempts = list(self.attempt_set.order_by('attempt_number'))
+        return self._attempts
+
+    @classmethod
+    def hydrate(cls, assessments):
+        """
+        Fills in the attributes contributed by the schema of each of the assessments 
+        (`is_attempted`, `attempted_at`, `rating`, etc.), along with their schema and
+        attempts, so that none of them need to be fetched for each assessment.
+
+        Takes one query for the latest attempts of all the assessments, one 
+        query per attempt type for their attempts and one query for their comments. 
+        Assessments which have already been hydrated are skipped.
+        """
+        assessments = [
+            assessment for assessment in assessments 
+            if not assessment.__dict__.get('_is_hydrated', False)
+        ]
+        if not assessments:
+            return
+
+        latest_attempts = AssessmentLatestAttempt.objects.in_bulk(
+            [assessment.id for assessment in assessments]
+        )
 
+        assessments_by_attempt_type = defaultdict(list)
+        for assessment in assessments:
+            assessment.schema = AssessmentSchema.objects.get_for_id(assessment.schema_id)
+            cls.latest_attempt.related.set_cached_value(
+                assessment, 
+                latest_attempts.get(assessment.id)
+            )
+            assessments_by_attempt_type[assessment.schema.attempt_type].append(assessment)
+
+        for attempt_type, typed_assessments in assessments_by_attempt_type.items():
+            attempts = defaultdict(list)
+            attempt_set = (Attempt
+                .objects_of_type(attempt_type)
+                .filter(assessment_id__in=[assessment.id for assessment in typed_assessments])
+                .order_by('attempt_number'))
+            for attempt in attempt_set:
+                attempts[attempt.assessment_id].append(attempt)
+
+            for assessment in typed_assessments:
+                for attempt in attempts[assessment.id]:
+                    attempt.assessment = assessment
+                assessment._attempts = attempts[assessment.id]
+
+                # Annotated values take precedence over the property implementations
+                for name, prop in assessment.schema.assessment_properties.items():
+                    if name not in assessment.__dict__:
+                        setattr(assessment, name, prop.__get__(assessment))
+                assessment._is_hydrated = True
+
+        models.prefetch_related_objects(
+            assessments, 
+            models.Prefetch('comments', queryset=Comment.objects.order_by('created_at', 'id'))
+        )
+        for assessment in assessments:
+            for comment in assessment.comments.all():
+                Comment.attached_to.set_cached_value(comment, assessment)
 
     def __getattr__(self, attr_name):
-        schema_props = self.schema.assessment_properties
+        if attr_name.startswith('_'):
+            raise AttributeError(f'{type(self)} has no attribute {attr_name}')
+
+        schema_props = AssessmentSchema.objects.get_for_id(self.schema_id).assessment_properties
 
         if attr_name in schema_props:
-            print('using assessment property implementation', attr_name)
             prop = schema_props[attr_name]
             return prop.__get__(self)
-        else:
-            raise AttributeError(f'{type(self)} has no attribute {attr_name}')
+
+        # `__getattr__` is also called when a descriptor raises an AttributeError 
+        # (eg. `latest_attempt` when there is no attempt). Raise the original error.
+        return super().__getattribute__(attr_name)
 
     class QuerySet(models.QuerySet):
         def filter_node(self, subject_node, include_descendants=False):
-            qs = self.filter(subject_node=subject_node)
-            if include_descendants:
-                qs = qs.union(self.filter(subject_node__in=subject_node.get_descendants()))
-            return self.filter(pk__in=qs.values('id'))
+            if not include_descendants:
+                return self.filter(subject_node=subject_node)
+
+            # The path of every descendant extends the path of the node, and a 
+            # prefix match can use the index on the path column.
+            return self.filter(subject_node__path__startswith=subject_node.path)
 
         def filter_class(self, subject_class):
             return self.filter(student__in=subject_class.students.all())
@@ -344,7 +518,7 @@ class Assessment(BaseModel):
 
             if assessment_type is not None:
                 qs = qs.filter(type=assessment_type)
-                schema = AssessmentSchema.objects.get(type=assessment_type)
+                schema = AssessmentSchema.objects.get_for_type(assessment_type)
                 qs = schema.annotate_assessments(qs)
             return qs
 
@@ -355,7 +529,7 @@ class Assessment(BaseModel):
 
         @property
         def schema(self):
-            return self.assessment_type and AssessmentSchema.objects.get(type=self.assessment_type)
+            return self.assessment_type and AssessmentSchema.objects.get_for_type(self.assessment_type)
 
         def get_queryset(self):
             return (super().get_queryset()
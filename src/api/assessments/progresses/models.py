@@ -6,23 +6,25 @@ from subjects.models import SubjectNode
 from schools.models import Student
 
 from base.models import (
-    comma_delimited_models_property,
-    comma_delimited_model_count_property,
+    packed_models_property,
+    packed_model_ids_property,
+    packed_model_values_property,
     calculated_percentage_property
 )
 
 from ..attempts.models import (
+    Attempt,
     AttemptType,
     CompletionState,
     GradeState
 )
 
 
-def _comma_delimited_assessments_property(delegate_prop):
-    return comma_delimited_models_property('assessments.Assessment', delegate_prop)
+def _packed_assessments_property(attr, count_attr):
+    return packed_models_property('assessments.Assessment', '_member_ids', attr, count_attr)
 
-def _comma_delimited_assessment_count_property(delegate_prop):
-    return comma_delimited_model_count_property(delegate_prop)
+def _packed_assessment_ids_property(attr):
+    return packed_model_ids_property('_member_ids', attr)
 
 
 class Progress(Document):
@@ -63,30 +65,89 @@ class Progress(Document):
     #   - Be a strict ancestor node type of the node type of the assessment schema
     subject_node = models.ForeignKey(SubjectNode, related_name='+', on_delete=models.CASCADE)
 
-    _assessment_ids             = models.TextField(default='')
+    # The ids of every assessment referenced by the progress. Each set of 
+    # assessments is stored as a bitmap over the members, alongside its count.
+    _member_ids                              = models.BinaryField(default=b'')
 
-    assessments                 = _comma_delimited_assessments_property('_assessment_ids')
-    assessment_count            = _comma_delimited_assessment_count_property('_assessment_ids')
+    _assessment_bitmap                       = models.BinaryField(default=b'')
+    assessment_count                         = models.PositiveIntegerField(default=0)
+    assessments                              = _packed_assessments_property('_assessment_bitmap', 'assessment_count')
+    assessment_ids                           = _packed_assessment_ids_property('_assessment_bitmap')
 
-    _attempted_assessment_ids   = models.TextField(default='')
+    _attempted_assessment_bitmap             = models.BinaryField(default=b'')
+    attempted_assessment_count               = models.PositiveIntegerField(default=0)
+    attempted_assessments                    = _packed_assessments_property('_attempted_assessment_bitmap', 'attempted_assessment_count')
+    attempted_assessment_ids                 = _packed_assessment_ids_property('_attempted_assessment_bitmap')
 
-    attempted_assessments       = _comma_delimited_assessments_property('_attempted_assessment_ids')
-    attempted_assessment_count  = _comma_delimited_assessment_count_property('_attempted_assessment_ids')
+    # A watermark over the inputs of the snapshot, taken when the progress was
+    # last generated. The progress only needs to be regenerated if an assessment,
+    # attempt or assessment option covered by the snapshot has been added, updated
+    # or removed since then.
+    inputs_updated_at           = models.DateTimeField(null=True)
+    input_count                 = models.PositiveIntegerField(default=0)
 
     @property
     def requires_regeneration(self):
-        # TODO: Don't do this quite so much
-        return True
+        inputs_updated_at, input_count = self.snapshot_watermark()
+        return (
+            inputs_updated_at != self.inputs_updated_at
+            or input_count != self.input_count
+        )
 
     def generate(self):
         super().generate()
 
+        self.inputs_updated_at, self.input_count = self.snapshot_watermark()
+
         self.assessments            = self.snapshot_assessment_set(only_attempted=False)
         self.attempted_assessments  = self.snapshot_assessment_set()
         return self
 
+    def snapshot_watermark(self):
+        """
+        Returns the most recent `updated_at` and the total count of the
+        assessments, attempts and assessment options which contribute to
+        the progress.
+
+        Each component is a single aggregate over indexed columns, so
+        checking whether the progress is stale is much cheaper than
+        regenerating it.
+        """
+        from assessments.models import Assessment, AssessmentOptions
+
+        if not hasattr(self, '_snapshot_watermark'):
+            assessments = Assessment._base_manager.filter(
+                schema_id=self.assessment_schema_id,
+                student_id=self.student_id
+            )
+            options = AssessmentOptions._base_manager.filter(
+                schema_id=self.assessment_schema_id
+            )
+            if self.subject_node is not None:
+                assessments = assessments.filter(
+                    subject_node__path__startswith=self.subject_node.path
+                )
+                options = options.filter(
+                    models.Q(subject_node__path__startswith=self.subject_node.path)
+                    | models.Q(subject_node=None)
+                )
+
+            attempt_model = Attempt.objects_of_type(self.attempt_type).model
+            attempts = attempt_model._base_manager.filter(assessment__in=assessments)
+
+            watermarks = [
+                qs.aggregate(updated_at=models.Max('updated_at'), count=models.Count('id'))
+                for qs in (assessments, attempts, options)
+            ]
+
+            self._snapshot_watermark = (
+                max((w['updated_at'] for w in watermarks if w['updated_at'] is not None), default=None),
+                sum(w['count'] for w in watermarks)
+            )
+        return self._snapshot_watermark
+
     def snapshot_assessment_set(self, only_attempted=True):
-        from api.assessments.models import Assessment
+        from assessments.models import Assessment
 
         if not hasattr(self, '_snapshot_assessment_set'):
             qs = Assessment.objects_of_type(self.assessment_type)
@@ -121,26 +182,29 @@ class Progress(Document):
         }[attempt_type]
 
 class PassFailProgress(Progress):
-    _passed_assessments = models.TextField(default='')
-    passed_assessments = _comma_delimited_assessments_property('_passed_assessments')
-    passed_assessment_count = _comma_delimited_assessment_count_property('_passed_assessments')
+    _passed_assessment_bitmap                = models.BinaryField(default=b'')
+    passed_assessment_count                  = models.PositiveIntegerField(default=0)
+    passed_assessments                       = _packed_assessments_property('_passed_assessment_bitmap', 'passed_assessment_count')
+    passed_assessment_ids                    = _packed_assessment_ids_property('_passed_assessment_bitmap')
 
     percent_passed =calculated_percentage_property('passed_assessment_count', 'attempted_assessment_count')
 
     def generate(self):
         super().generate()
-        passed_assessments = self.snapshot_assessment_set().filter(is_pass=True)
+        self.passed_assessments = self.snapshot_assessment_set().filter(is_pass=True)
 
         return self
 
 class CompletionBasedProgress(Progress):
-    _partially_complete_assessments         = models.TextField(default='')
-    partially_complete_assessments          = _comma_delimited_assessments_property('_partially_completed_assessments')
-    partially_complete_assessment_count     = _comma_delimited_assessment_count_property('_partially_completed_assessments')
+    _partially_complete_assessment_bitmap    = models.BinaryField(default=b'')
+    partially_complete_assessment_count      = models.PositiveIntegerField(default=0)
+    partially_complete_assessments           = _packed_assessments_property('_partially_complete_assessment_bitmap', 'partially_complete_assessment_count')
+    partially_complete_assessment_ids        = _packed_assessment_ids_property('_partially_complete_assessment_bitmap')
 
-    _complete_assessments                   = models.TextField(default='')
-    complete_assessments                    = _comma_delimited_assessments_property('_complete_assessments')
-    complete_assessment_count               = _comma_delimited_assessment_count_property('_complete_assessments')
+    _complete_assessment_bitmap              = models.BinaryField(default=b'')
+    complete_assessment_count                = models.PositiveIntegerField(default=0)
+    complete_assessments                     = _packed_assessments_property('_complete_assessment_bitmap', 'complete_assessment_count')
+    complete_assessment_ids                  = _packed_assessment_ids_property('_complete_assessment_bitmap')
 
     percent_partially_complete = calculated_percentage_property('partially_complete_assessment_count', 'attempted_assessment_count')
 
@@ -166,57 +230,70 @@ class CompletionBasedProgress(Progress):
 
 
 class GradedProgress(Progress):    
-    _grade_f_assessment_ids                  = models.TextField(default='')
-    grade_f_assessments                      = _comma_delimited_assessments_property('_grade_f_assessment_ids')
-    grade_f_assessment_count                 = _comma_delimited_assessment_count_property('_grade_f_assessment_ids')
-
-    _grade_d_plus_assessment_ids             = models.TextField(default='')
-    grade_d_plus_assessments                 = _comma_delimited_assessments_property('_grade_d_plus_assessment_ids')
-    grade_d_plus_assessment_count            = _comma_delimited_assessment_count_property('_grade_d_plus_assessment_ids')
-
-    _grade_d_assessment_ids                  = models.TextField(default='')
-    grade_d_assessments                      = _comma_delimited_assessments_property('_grade_d_assessment_ids')
-    grade_d_assessment_count                 = _comma_delimited_assessment_count_property('_grade_d_assessment_ids')
-
-    _grade_d_minus_assessment_ids            = models.TextField(default='')
-    grade_d_minus_assessments                = _comma_delimited_assessments_property('_grade_d_minus_assessment_ids')
-    grade_d_minus_assessment_count           = _comma_delimited_assessment_count_property('_grade_d_minus_assessment_ids')
-
-    _grade_c_plus_assessment_ids             = models.TextField(default='')
-    grade_c_plus_assessments                 = _comma_delimited_assessments_property('_grade_c_plus_assessment_ids')
-    grade_c_plus_assessment_count            = _comma_delimited_assessment_count_property('_grade_c_plus_assessment_ids')
-
-    _grade_c_assessment_ids                  = models.TextField(default='')
-    grade_c_assessments                      = _comma_delimited_assessments_property('_grade_c_assessment_ids')
-    grade_c_assessment_count                 = _comma_delimited_assessment_count_property('_grade_c_assessment_ids')
-
-    _grade_c_minus_assessment_ids            = models.TextField(default='')
-    grade_c_minus_assessments                = _comma_delimited_assessments_property('_grade_c_minus_assessment_ids')
-    grade_c_minus_assessment_count           = _comma_delimited_assessment_count_property('_grade_c_minus_assessment_ids')
-
-    _grade_b_minus_assessment_ids            = models.TextField(default='')
-    grade_b_minus_assessments                = _comma_delimited_assessments_property('_grade_b_minus_assessment_ids')
-    grade_b_minus_assessment_count           = _comma_delimited_assessment_count_property('_grade_b_minus_assessment_ids')
-
-    _grade_b_assessment_ids                  = models.TextField(default='')
-    grade_b_assessments                      = _comma_delimited_assessments_property('_grade_b_assessment_ids')
-    grade_b_assessment_count                 = _comma_delimited_assessment_count_property('_grade_b_assessment_ids')
-
-    _grade_b_plus_assessment_ids             = models.TextField(default='')
-    grade_b_plus_assessments                 = _comma_delimited_assessments_property('_grade_b_plus_assessment_ids')
-    grade_b_plus_assessment_count            = _comma_delimited_assessment_count_property('_grade_b_plus_assessment_ids')
-
-    _grade_a_minus_assessment_ids            = models.TextField(default='')
-    grade_a_minus_assessments                = _comma_delimited_assessments_property('_grade_a_minus_assessment_ids')
-    grade_a_minus_assessment_count           = _comma_delimited_assessment_count_property('_grade_a_minus_assessment_ids')
-
-    _grade_a_assessment_ids                  = models.TextField(default='')
-    grade_a_assessments                      = _comma_delimited_assessments_property('_grade_a_assessment_ids')
-    grade_a_assessment_count                 = _comma_delimited_assessment_count_property('_grade_a_assessment_ids')
-
-    _grade_a_plus_assessment_ids             = models.TextField(default='')
-    grade_a_plus_assessments                 = _comma_delimited_assessments_property('_grade_a_plus_assessment_ids')
-    grade_a_plus_assessment_count            = _comma_delimited_assessment_count_property('_grade_a_plus_assessment_ids')
+    _grade_f_assessment_bitmap               = models.BinaryField(default=b'')
+    grade_f_assessment_count                 = models.PositiveIntegerField(default=0)
+    grade_f_assessments                      = _packed_assessments_property('_grade_f_assessment_bitmap', 'grade_f_assessment_count')
+    grade_f_assessment_ids                   = _packed_assessment_ids_property('_grade_f_assessment_bitmap')
+
+    _grade_d_plus_assessment_bitmap          = models.BinaryField(default=b'')
+    grade_d_plus_assessment_count            = models.PositiveIntegerField(default=0)
+    grade_d_plus_assessments                 = _packed_assessments_property('_grade_d_plus_assessment_bitmap', 'grade_d_plus_assessment_count')
+    grade_d_plus_assessment_ids              = _packed_assessment_ids_property('_grade_d_plus_assessment_bitmap')
+
+    _grade_d_assessment_bitmap               = models.BinaryField(default=b'')
+    grade_d_assessment_count                 = models.PositiveIntegerField(default=0)
+    grade_d_assessments                      = _packed_assessments_property('_grade_d_assessment_bitmap', 'grade_d_assessment_count')
+    grade_d_assessment_ids                   = _packed_assessment_ids_property('_grade_d_assessment_bitmap')
+
+    _grade_d_minus_assessment_bitmap         = models.BinaryField(default=b'')
+    grade_d_minus_assessment_count           = models.PositiveIntegerField(default=0)
+    grade_d_minus_assessments                = _packed_assessments_property('_grade_d_minus_assessment_bitmap', 'grade_d_minus_assessment_count')
+    grade_d_minus_assessment_ids             = _packed_assessment_ids_property('_grade_d_minus_assessment_bitmap')
+
+    _grade_c_plus_assessment_bitmap          = models.BinaryField(default=b'')
+    grade_c_plus_assessment_count            = models.PositiveIntegerField(default=0)
+    grade_c_plus_assessments                 = _packed_assessments_property('_grade_c_plus_assessment_bitmap', 'grade_c_plus_assessment_count')
+    grade_c_plus_assessment_ids              = _packed_assessment_ids_property('_grade_c_plus_assessment_bitmap')
+
+    _grade_c_assessment_bitmap               = models.BinaryField(default=b'')
+    grade_c_assessment_count                 = models.PositiveIntegerField(default=0)
+    grade_c_assessments                      = _packed_assessments_property('_grade_c_assessment_bitmap', 'grade_c_assessment_count')
+    grade_c_assessment_ids                   = _packed_assessment_ids_property('_grade_c_assessment_bitmap')
+
+    _grade_c_minus_assessment_bitmap         = models.BinaryField(default=b'')
+    grade_c_minus_assessment_count           = models.PositiveIntegerField(default=0)
+    grade_c_minus_assessments                = _packed_assessments_property('_grade_c_minus_assessment_bitmap', 'grade_c_minus_assessment_count')
+    grade_c_minus_assessment_ids             = _packed_assessment_ids_property('_grade_c_minus_assessment_bitmap')
+
+    _grade_b_minus_assessment_bitmap         = models.BinaryField(default=b'')
+    grade_b_minus_assessment_count           = models.PositiveIntegerField(default=0)
+    grade_b_minus_assessments                = _packed_assessments_property('_grade_b_minus_assessment_bitmap', 'grade_b_minus_assessment_count')
+    grade_b_minus_assessment_ids             = _packed_assessment_ids_property('_grade_b_minus_assessment_bitmap')
+
+    _grade_b_assessment_bitmap               = models.BinaryField(default=b'')
+    grade_b_assessment_count                 = models.PositiveIntegerField(default=0)
+    grade_b_assessments                      = _packed_assessments_property('_grade_b_assessment_bitmap', 'grade_b_assessment_count')
+    grade_b_assessment_ids                   = _packed_assessment_ids_property('_grade_b_assessment_bitmap')
+
+    _grade_b_plus_assessment_bitmap          = models.BinaryField(default=b'')
+    grade_b_plus_assessment_count            = models.PositiveIntegerField(default=0)
+    grade_b_plus_assessments                 = _packed_assessments_property('_grade_b_plus_assessment_bitmap', 'grade_b_plus_assessment_count')
+    grade_b_plus_assessment_ids              = _packed_assessment_ids_property('_grade_b_plus_assessment_bitmap')
+
+    _grade_a_minus_assessment_bitmap         = models.BinaryField(default=b'')
+    grade_a_minus_assessment_count           = models.PositiveIntegerField(default=0)
+    grade_a_minus_assessments                = _packed_assessments_property('_grade_a_minus_assessment_bitmap', 'grade_a_minus_assessment_count')
+    grade_a_minus_assessment_ids             = _packed_assessment_ids_property('_grade_a_minus_assessment_bitmap')
+
+    _grade_a_assessment_bitmap               = models.BinaryField(default=b'')
+    grade_a_assessment_count                 = models.PositiveIntegerField(default=0)
+    grade_a_assessments                      = _packed_assessments_property('_grade_a_assessment_bitmap', 'grade_a_assessment_count')
+    grade_a_assessment_ids                   = _packed_assessment_ids_property('_grade_a_assessment_bitmap')
+
+    _grade_a_plus_assessment_bitmap          = models.BinaryField(default=b'')
+    grade_a_plus_assessment_count            = models.PositiveIntegerField(default=0)
+    grade_a_plus_assessments                 = _packed_assessments_property('_grade_a_plus_assessment_bitmap', 'grade_a_plus_assessment_count')
+    grade_a_plus_assessment_ids              = _packed_assessment_ids_property('_grade_a_plus_assessment_bitmap')
 
     def grade_assessments(self, grade):
         return getattr(self, f'grade_{grade.name.lower()}_assessments')
@@ -230,9 +307,9 @@ class GradedProgress(Progress):
     @property
     def grade_assessment_bins(self):
         return {
-            grade: {
-                'count': self.grade_candidate_count(grade), 
-                'assessments': self.grade_assessments(grade)
+            grade.value: {
+                'assessment_count': self.grade_assessment_count(grade), 
+                'assessments': getattr(self, f'grade_{grade.name.lower()}_assessment_ids')
             } for grade in GradeState
         }
 
@@ -240,38 +317,21 @@ class GradedProgress(Progress):
         super().generate()
 
         assessment_set = self.snapshot_assessment_set()
-        for grade in GradeState.values:
+        for grade in GradeState:
             grade_assessments = assessment_set.all().filter(grade=grade)
-            self.set_grade_candidates(grade, grade_assessments)
+            self.set_grade_assessments(grade, grade_assessments)
 
         return self
 
 
 class RatedProgress(Progress):
-    _assessment_ratings = models.TextField(default='')
-
-    @property
-    def assessment_ratings(self):
-        assessment_rating_pairs = (
-            [rating.split(':') for rating in self._assessment_ratings]
-            if self._assessment_ratings else []
-        )
-
-        return {
-            UUID(hex=assessment_id): rating
-            for assessment_id, rating in assessment_rating_pairs
-        }
-
-    @assessment_ratings.setter
-    def assessment_ratings(self, ratings):
-        pairs = [f'{assessment_id}:{rating}' for assessment_id, rating in ratings.items()]
-        self._assessment_ratings = pairs.join(',')
+    _assessment_ratings = models.BinaryField(default=b'')
+    assessment_ratings = packed_model_values_property('_member_ids', '_assessment_ratings')
 
     def generate(self):
         super().generate()
 
-        assessments = self.snapshot_assessment_set()
-        self.candidate_ratings = {
+        self.assessment_ratings = {
             result['id']: result['rating']
             for result in self.snapshot_assessment_set().values('id', 'rating')
         }
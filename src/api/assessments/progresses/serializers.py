@@ -7,8 +7,8 @@ from subjects.models import SubjectNode
 
 from ..attempts.models import AttemptType
 
-def RelatedAssessmentsField():
-    return serializers.ListField(child=serializers.PrimaryKeyRelatedField(read_only=True))
+def RelatedAssessmentsField(source=None):
+    return serializers.ListField(child=serializers.UUIDField(), source=source, read_only=True)
 
 
 class ProgressSerializer(DocumentSerializer):
@@ -32,13 +32,13 @@ class ProgressSerializer(DocumentSerializer):
 
     assessment_count = serializers.IntegerField()
 
-    attempted_assessments = RelatedAssessmentsField()
+    attempted_assessments = RelatedAssessmentsField('attempted_assessment_ids')
     attempted_assessment_count = serializers.IntegerField()
 
     percent_attempted = serializers.FloatField()
 
     def to_representation(self, instance):
-        from api.assessments.serializers import AssessmentSerializer
+        from ..serializers import AssessmentSerializer
 
         representation = super().to_representation(instance)
 
@@ -53,17 +53,17 @@ class ProgressSerializer(DocumentSerializer):
 
 
 class PassFailProgressSerializer(ProgressSerializer):
-    passed_assessments          = RelatedAssessmentsField()
+    passed_assessments          = RelatedAssessmentsField('passed_assessment_ids')
     passed_assessment_count     = serializers.IntegerField()
 
     percent_passed              = serializers.FloatField()
 
 
 class CompletionBasedProgressSerializer(ProgressSerializer):
-    partially_complete_assessments = RelatedAssessmentsField()
+    partially_complete_assessments = RelatedAssessmentsField('partially_complete_assessment_ids')
     partially_complete_assessment_count = serializers.IntegerField()
 
-    complete_assessments = RelatedAssessmentsField()
+    complete_assessments = RelatedAssessmentsField('complete_assessment_ids')
     complete_assessment_count = serializers.IntegerField()
 
     percent_partially_complete = serializers.FloatField()    
@@ -76,7 +76,8 @@ class GradedProgressSerializer(ProgressSerializer):
         assessment_count = serializers.IntegerField()
 
     grade_assessments = serializers.DictField(
-        child=GradeSerializer()
+        child=GradeSerializer(),
+        source='grade_assessment_bins'
     )
 
 class RatedProgressSerializer(ProgressSerializer):
@@ -1,13 +1,17 @@
-from uuid import UUID
+import statistics
+
+from collections import defaultdict
+from uuid import uuid4
 
 from datetime import datetime
-from django.db import models
+from django.db import models, transaction
 
 from ext.django.db.models import Document
 
 from base.models import (
-    comma_delimited_models_property,
-    comma_delimited_model_count_property,
+    packed_models_property,
+    packed_model_ids_property,
+    packed_model_values_property,
     calculated_percentage_property
 )
 from schools.models import SubjectClass, Student
@@ -21,11 +25,11 @@ from assessments.attempts.models import (
 )
 
 
-def _comma_delimited_students_property(attr):
-    return comma_delimited_models_property(Student, attr)
+def _packed_students_property(attr, count_attr):
+    return packed_models_property(Student, '_member_ids', attr, count_attr)
 
-def _comma_delimited_student_count_property(attr):
-    return comma_delimited_model_count_property(attr)
+def _packed_student_ids_property(attr):
+    return packed_model_ids_property('_member_ids', attr)
 
 
 class Report(Document):
@@ -73,28 +77,52 @@ class Report(Document):
     # A null subject_class will generate a report covering all students in all classes at the school.
     subject_class = models.ForeignKey(SubjectClass, related_name='+', null=True, on_delete=models.CASCADE)
 
-    _candidate_ids                  = models.TextField(default='')
-
-    candidates                      = _comma_delimited_students_property('_candidate_ids')
-    candidate_count                 = _comma_delimited_student_count_property('_candidate_ids')
+    # The ids of every student referenced by the report. Each set of students 
+    # is stored as a bitmap over the members, alongside its count.
+    _member_ids                             = models.BinaryField(default=b'')
 
-    _attempt_candidate_ids          = models.TextField(default='')
+    _candidate_bitmap                       = models.BinaryField(default=b'')
+    candidate_count                         = models.PositiveIntegerField(default=0)
+    candidates                              = _packed_students_property('_candidate_bitmap', 'candidate_count')
+    candidate_ids                           = _packed_student_ids_property('_candidate_bitmap')
 
-    attempted_candidates              = _comma_delimited_students_property('_attempt_candidate_ids')
-    attempted_candidate_count         = _comma_delimited_student_count_property('_attempt_candidate_ids')
+    _attempted_candidate_bitmap             = models.BinaryField(default=b'')
+    attempted_candidate_count               = models.PositiveIntegerField(default=0)
+    attempted_candidates                    = _packed_students_property('_attempted_candidate_bitmap', 'attempted_candidate_count')
+    attempted_candidate_ids                 = _packed_student_ids_property('_attempted_candidate_bitmap')
 
     @property
     def requires_regeneration(self):
-        # TODO: Don't generate quite as much
-        return True
+        return self.stale_report_set.exists()
+
+    @property
+    def stale_report_set(self):
+        return StaleReport.objects.filter_key(
+            self.assessment_schema_id,
+            self.subject_node_id,
+            self.subject_class_id
+        )
+
+    # The values of each attempted assessment that are required to generate the report.
+    snapshot_fields = ('student_id',)
 
     def generate(self):
+        # Remove the report from the stale set before taking the snapshot, so that
+        # any attempt recorded while the report is being generated marks it stale again.
+        self.stale_report_set.delete()
+
         if self.generation == 1:
             self.candidates = self.snapshot_candidate_ids()
 
-        attempted_assessments = self.snapshot_assessment_set().only('student_id')
-        self.attempted_candidates = [assessment.student_id for assessment in attempted_assessments]
+        snapshot = self.snapshot_assessment_set().values(*self.snapshot_fields)
+        return self.generate_from_snapshot(list(snapshot))
 
+    def generate_from_snapshot(self, snapshot):
+        """
+        Populates the report from a list containing the `snapshot_fields` 
+        of each attempted assessment covered by the report.
+        """
+        self.attempted_candidates = [assessment['student_id'] for assessment in snapshot]
         return super().generate()
 
     @property
@@ -149,17 +177,123 @@ class Report(Document):
 
     def snapshot_assessment_set(self):
         if not hasattr(self, '_snapshot_assessment_set'):
-            from api.assessments.models import Assessment
-
-            qs = Assessment.objects_of_type(self.assessment_type)
-            qs = qs.filter_node(self.subject_node, include_descendants=False)
-            if self.subject_class is not None:
-                qs = qs.filter_class(self.subject_class)
-            qs = qs.filter(attempted_at__isnull=False)
-            self._snapshot_assessment_set = qs
+            self._snapshot_assessment_set = type(self).objects.snapshot_assessment_set(
+                self.assessment_schema,
+                [self.subject_node_id],
+                subject_class=self.subject_class
+            )
 
         return self._snapshot_assessment_set.all()
 
+    class Manager(Document.Manager):
+        def snapshot_assessment_set(self, assessment_schema, subject_node_ids, subject_class=None):
+            """
+            The attempted assessments of the schema for any of the given subject nodes, 
+            restricted to the students of the subject class if one is provided.
+            """
+            from assessments.models import Assessment
+
+            qs = Assessment.objects_of_type(assessment_schema.type)
+            qs = qs.filter(subject_node_id__in=subject_node_ids)
+            if subject_class is not None:
+                qs = qs.filter_class(subject_class)
+            return qs.filter(attempted_at__isnull=False)
+
+        def get_or_generate_for_nodes(self, assessment_schema, subject_nodes, subject_class=None):
+            """
+            Gets the reports of the schema for each of the subject nodes, generating 
+            any which do not yet exist or have been marked stale.
+
+            The snapshots of all the reports are taken with a single query and saved 
+            in bulk, so the number of queries does not depend on the number of nodes.
+
+            Returns the reports in the same order as the subject nodes.
+            """
+            subject_nodes = list(subject_nodes)
+            subject_class_id = subject_class and subject_class.id
+
+            reports = {
+                report.subject_node_id: report
+                for report in self.filter(
+                    assessment_schema=assessment_schema,
+                    subject_class_id=subject_class_id,
+                    subject_node__in=subject_nodes
+                )
+            }
+            stale_node_ids = set(
+                StaleReport.objects
+                .filter(
+                    assessment_schema=assessment_schema,
+                    subject_class_id=subject_class_id,
+                    subject_node_id__in=reports.keys()
+                )
+                .values_list('subject_node_id', flat=True)
+            )
+
+            new_reports = [
+                self.model(
+                    assessment_schema=assessment_schema,
+                    subject_node=subject_node,
+                    subject_class=subject_class
+                )
+                for subject_node in subject_nodes
+                if subject_node.id not in reports
+            ]
+            stale_reports = [reports[subject_node_id] for subject_node_id in stale_node_ids]
+
+            if new_reports or stale_reports:
+                # The stale marks are only removed if the reports are regenerated.
+                with transaction.atomic():
+                    # As in `generate`, the keys are removed before taking the snapshot.
+                    (StaleReport.objects
+                        .filter(
+                            assessment_schema=assessment_schema,
+                            subject_class_id=subject_class_id,
+                            subject_node_id__in=stale_node_ids
+                        )
+                        .delete())
+
+                    if new_reports:
+                        candidate_ids = new_reports[0].snapshot_candidate_ids()
+                        for report in new_reports:
+                            report.candidates = candidate_ids
+
+                    snapshots = defaultdict(list)
+                    assessment_set = self.snapshot_assessment_set(
+                        assessment_schema,
+                        [report.subject_node_id for report in new_reports + stale_reports],
+                        subject_class=subject_class
+                    )
+                    for assessment in assessment_set.values('subject_node_id', *self.model.snapshot_fields):
+                        snapshots[assessment['subject_node_id']].append(assessment)
+
+                    for report in new_reports + stale_reports:
+                        report.generate_from_snapshot(snapshots[report.subject_node_id])
+
+                    # A concurrent request may have generated any of the new reports first, 
+                    # in which case its report is kept.
+                    self.bulk_create(new_reports, ignore_conflicts=True)
+                    self.bulk_update(stale_reports, [
+                        field.name for field in self.model._meta.concrete_fields
+                        if not field.primary_key
+                    ])
+
+                if new_reports:
+                    reports.update(
+                        (report.subject_node_id, report)
+                        for report in self.filter(
+                            assessment_schema=assessment_schema,
+                            subject_class_id=subject_class_id,
+                            subject_node_id__in=[report.subject_node_id for report in new_reports]
+                        )
+                    )
+
+            for report in reports.values():
+                report.assessment_schema = assessment_schema
+            return [reports[subject_node.id] for subject_node in subject_nodes]
+
+    objects = Manager()
+
     @staticmethod
     def objects_of_type(attempt_type):
         return {
@@ -170,111 +304,129 @@ class Report(Document):
         }[attempt_type]
 
 class PassFailReport(Report):
-    _passed_candidate_ids         = models.TextField(default='')
-    passed_candidates             = _comma_delimited_students_property('_passed_candidate_ids')
-    passed_candidate_count        = _comma_delimited_student_count_property('_passed_candidate_ids')
+    _passed_candidate_bitmap                = models.BinaryField(default=b'')
+    passed_candidate_count                  = models.PositiveIntegerField(default=0)
+    passed_candidates                       = _packed_students_property('_passed_candidate_bitmap', 'passed_candidate_count')
+    passed_candidate_ids                    = _packed_student_ids_property('_passed_candidate_bitmap')
 
     percent_passed = calculated_percentage_property('passed_candidate_count', 'attempted_candidate_count')
 
-    def generate(self):
-        super().generate()
-        passed_assessments = (
-            self.snapshot_assessment_set()
-            .filter(is_pass=True)
-        )
+    snapshot_fields = Report.snapshot_fields + ('is_pass',)
 
-        self.passed_candidates = [assessment.student_id for assessment in passed_assessments]
+    def generate_from_snapshot(self, snapshot):
+        super().generate_from_snapshot(snapshot)
+        self.passed_candidates = [
+            assessment['student_id'] for assessment in snapshot
+            if assessment['is_pass']
+        ]
         return self
 
 class CompletionBasedReport(Report):
-    _partially_complete_candidate_ids       = models.TextField(default='')
-    partially_complete_candidates           = _comma_delimited_students_property('_partially_complete_candidate_ids')
-    partially_complete_candidate_count      = _comma_delimited_student_count_property('_partially_complete_candidate_ids')
+    _partially_complete_candidate_bitmap    = models.BinaryField(default=b'')
+    partially_complete_candidate_count      = models.PositiveIntegerField(default=0)
+    partially_complete_candidates           = _packed_students_property('_partially_complete_candidate_bitmap', 'partially_complete_candidate_count')
+    partially_complete_candidate_ids        = _packed_student_ids_property('_partially_complete_candidate_bitmap')
 
-    _complete_candidate_ids                 = models.TextField(default='')
-    complete_candidates                     = _comma_delimited_students_property('_complete_candidate_ids')
-    complete_candidate_count                 = _comma_delimited_student_count_property('_complete_candidate_ids')
+    _complete_candidate_bitmap              = models.BinaryField(default=b'')
+    complete_candidate_count                = models.PositiveIntegerField(default=0)
+    complete_candidates                     = _packed_students_property('_complete_candidate_bitmap', 'complete_candidate_count')
+    complete_candidate_ids                  = _packed_student_ids_property('_complete_candidate_bitmap')
 
     percent_partially_complete = calculated_percentage_property('partially_complete_candidate_count', 'attempted_candidate_count')
     percent_complete = calculated_percentage_property('complete_candidate_count', 'attempted_candidate_count')
 
-    def generate(self):
-        super().generate()
-        partially_complete_assessments = (
-            self.snapshot_assessment_set()
-            .filter(completion_state__in=[CompletionState.PARTIALLY_COMPLETE, CompletionState.COMPLETE])
-        )
-        self.partially_complete_candidates = [ass.student_id for ass in partially_complete_assessments]
+    snapshot_fields = Report.snapshot_fields + ('completion_state',)
 
-        complete_assessments = (
-            self.snapshot_assessment_set()
-            .filter(completion_state=CompletionState.COMPLETE)
-        )
-        self.complete_candidates = [ass.student_id for ass in complete_assessments]
+    def generate_from_snapshot(self, snapshot):
+        super().generate_from_snapshot(snapshot)
+        self.partially_complete_candidates = [
+            assessment['student_id'] for assessment in snapshot
+            if assessment['completion_state'] in [CompletionState.PARTIALLY_COMPLETE, CompletionState.COMPLETE]
+        ]
+        self.complete_candidates = [
+            assessment['student_id'] for assessment in snapshot
+            if assessment['completion_state'] == CompletionState.COMPLETE
+        ]
         return self
 
 
 class GradedReport(Report):    
-    _grade_f_candidate_ids                  = models.TextField(default='')
-    grade_f_candidates                      = _comma_delimited_students_property('_grade_f_candidate_ids')
-    grade_f_candidate_count                 = _comma_delimited_student_count_property('_grade_f_candidate_ids')
-
-    _grade_d_plus_candidate_ids             = models.TextField(default='')
-    grade_d_plus_candidates                 = _comma_delimited_students_property('_grade_d_plus_candidate_ids')
-    grade_d_plus_candidate_count            = _comma_delimited_student_count_property('_grade_d_plus_candidate_ids')
-
-    _grade_d_candidate_ids                  = models.TextField(default='')
-    grade_d_candidates                      = _comma_delimited_students_property('_grade_d_candidate_ids')
-    grade_d_candidate_count                 = _comma_delimited_student_count_property('_grade_d_candidate_ids')
-
-    _grade_d_minus_candidate_ids            = models.TextField(default='')
-    grade_d_minus_candidates                = _comma_delimited_students_property('_grade_d_minus_candidate_ids')
-    grade_d_minus_candidate_count           = _comma_delimited_student_count_property('_grade_d_minus_candidate_ids')
-
-    _grade_c_plus_candidate_ids             = models.TextField(default='')
-    grade_c_plus_candidates                 = _comma_delimited_students_property('_grade_c_plus_candidate_ids')
-    grade_c_plus_candidate_count            = _comma_delimited_student_count_property('_grade_c_plus_candidate_ids')
-
-    _grade_c_candidate_ids                  = models.TextField(default='')
-    grade_c_candidates                      = _comma_delimited_students_property('_grade_c_candidate_ids')
-    grade_c_candidate_count                 = _comma_delimited_student_count_property('_grade_c_candidate_ids')
-
-    _grade_c_minus_candidate_ids            = models.TextField(default='')
-    grade_c_minus_candidates                = _comma_delimited_students_property('_grade_c_minus_candidate_ids')
-    grade_c_minus_candidate_count           = _comma_delimited_student_count_property('_grade_c_minus_candidate_ids')
-
-    _grade_b_minus_candidate_ids            = models.TextField(default='')
-    grade_b_minus_candidates                = _comma_delimited_students_property('_grade_b_minus_candidate_ids')
-    grade_b_minus_candidate_count           = _comma_delimited_student_count_property('_grade_b_minus_candidate_ids')
-
-    _grade_b_candidate_ids                  = models.TextField(default='')
-    grade_b_candidates                      = _comma_delimited_students_property('_grade_b_candidate_ids')
-    grade_b_candidate_count                 = _comma_delimited_student_count_property('_grade_b_candidate_ids')
-
-    _grade_b_plus_candidate_ids             = models.TextField(default='')
-    grade_b_plus_candidates                 = _comma_delimited_students_property('_grade_b_plus_candidate_ids')
-    grade_b_plus_candidate_count            = _comma_delimited_student_count_property('_grade_b_plus_candidate_ids')
-
-    _grade_a_minus_candidate_ids            = models.TextField(default='')
-    grade_a_minus_candidates                = _comma_delimited_students_property('_grade_a_minus_candidate_ids')
-    grade_a_minus_candidate_count           = _comma_delimited_student_count_property('_grade_a_minus_candidate_ids')
-
-    _grade_a_candidate_ids                  = models.TextField(default='')
-    grade_a_candidates                      = _comma_delimited_students_property('_grade_a_candidate_ids')
-    grade_a_candidate_count                 = _comma_delimited_student_count_property('_grade_a_candidate_ids')
-
-    _grade_a_plus_candidate_ids             = models.TextField(default='')
-    grade_a_plus_candidates                 = _comma_delimited_students_property('_grade_a_plus_candidate_ids')
-    grade_a_plus_candidate_count            = _comma_delimited_student_count_property('_grade_a_plus_candidate_ids')
+    _grade_f_candidate_bitmap               = models.BinaryField(default=b'')
+    grade_f_candidate_count                 = models.PositiveIntegerField(default=0)
+    grade_f_candidates                      = _packed_students_property('_grade_f_candidate_bitmap', 'grade_f_candidate_count')
+    grade_f_candidate_ids                   = _packed_student_ids_property('_grade_f_candidate_bitmap')
+
+    _grade_d_plus_candidate_bitmap          = models.BinaryField(default=b'')
+    grade_d_plus_candidate_count            = models.PositiveIntegerField(default=0)
+    grade_d_plus_candidates                 = _packed_students_property('_grade_d_plus_candidate_bitmap', 'grade_d_plus_candidate_count')
+    grade_d_plus_candidate_ids              = _packed_student_ids_property('_grade_d_plus_candidate_bitmap')
+
+    _grade_d_candidate_bitmap               = models.BinaryField(default=b'')
+    grade_d_candidate_count                 = models.PositiveIntegerField(default=0)
+    grade_d_candidates                      = _packed_students_property('_grade_d_candidate_bitmap', 'grade_d_candidate_count')
+    grade_d_candidate_ids                   = _packed_student_ids_property('_grade_d_candidate_bitmap')
+
+    _grade_d_minus_candidate_bitmap         = models.BinaryField(default=b'')
+    grade_d_minus_candidate_count           = models.PositiveIntegerField(default=0)
+    grade_d_minus_candidates                = _packed_students_property('_grade_d_minus_candidate_bitmap', 'grade_d_minus_candidate_count')
+    grade_d_minus_candidate_ids             = _packed_student_ids_property('_grade_d_minus_candidate_bitmap')
+
+    _grade_c_plus_candidate_bitmap          = models.BinaryField(default=b'')
+    grade_c_plus_candidate_count            = models.PositiveIntegerField(default=0)
+    grade_c_plus_candidates                 = _packed_students_property('_grade_c_plus_candidate_bitmap', 'grade_c_plus_candidate_count')
+    grade_c_plus_candidate_ids              = _packed_student_ids_property('_grade_c_plus_candidate_bitmap')
+
+    _grade_c_candidate_bitmap               = models.BinaryField(default=b'')
+    grade_c_candidate_count                 = models.PositiveIntegerField(default=0)
+    grade_c_candidates                      = _packed_students_property('_grade_c_candidate_bitmap', 'grade_c_candidate_count')
+    grade_c_candidate_ids                   = _packed_student_ids_property('_grade_c_candidate_bitmap')
+
+    _grade_c_minus_candidate_bitmap         = models.BinaryField(default=b'')
+    grade_c_minus_candidate_count           = models.PositiveIntegerField(default=0)
+    grade_c_minus_candidates                = _packed_students_property('_grade_c_minus_candidate_bitmap', 'grade_c_minus_candidate_count')
+    grade_c_minus_candidate_ids             = _packed_student_ids_property('_grade_c_minus_candidate_bitmap')
+
+    _grade_b_minus_candidate_bitmap         = models.BinaryField(default=b'')
+    grade_b_minus_candidate_count           = models.PositiveIntegerField(default=0)
+    grade_b_minus_candidates                = _packed_students_property('_grade_b_minus_candidate_bitmap', 'grade_b_minus_candidate_count')
+    grade_b_minus_candidate_ids             = _packed_student_ids_property('_grade_b_minus_candidate_bitmap')
+
+    _grade_b_candidate_bitmap               = models.BinaryField(default=b'')
+    grade_b_candidate_count                 = models.PositiveIntegerField(default=0)
+    grade_b_candidates                      = _packed_students_property('_grade_b_candidate_bitmap', 'grade_b_candidate_count')
+    grade_b_candidate_ids                   = _packed_student_ids_property('_grade_b_candidate_bitmap')
+
+    _grade_b_plus_candidate_bitmap          = models.BinaryField(default=b'')
+    grade_b_plus_candidate_count            = models.PositiveIntegerField(default=0)
+    grade_b_plus_candidates                 = _packed_students_property('_grade_b_plus_candidate_bitmap', 'grade_b_plus_candidate_count')
+    grade_b_plus_candidate_ids              = _packed_student_ids_property('_grade_b_plus_candidate_bitmap')
+
+    _grade_a_minus_candidate_bitmap         = models.BinaryField(default=b'')
+    grade_a_minus_candidate_count           = models.PositiveIntegerField(default=0)
+    grade_a_minus_candidates                = _packed_students_property('_grade_a_minus_candidate_bitmap', 'grade_a_minus_candidate_count')
+    grade_a_minus_candidate_ids             = _packed_student_ids_property('_grade_a_minus_candidate_bitmap')
+
+    _grade_a_candidate_bitmap               = models.BinaryField(default=b'')
+    grade_a_candidate_count                 = models.PositiveIntegerField(default=0)
+    grade_a_candidates                      = _packed_students_property('_grade_a_candidate_bitmap', 'grade_a_candidate_count')
+    grade_a_candidate_ids                   = _packed_student_ids_property('_grade_a_candidate_bitmap')
+
+    _grade_a_plus_candidate_bitmap          = models.BinaryField(default=b'')
+    grade_a_plus_candidate_count            = models.PositiveIntegerField(default=0)
+    grade_a_plus_candidates                 = _packed_students_property('_grade_a_plus_candidate_bitmap', 'grade_a_plus_candidate_count')
+    grade_a_plus_candidate_ids              = _packed_student_ids_property('_grade_a_plus_candidate_bitmap')
 
     def grade_candidates(self, grade):
-        return getattr(self, f'grade_{grade_state.name.lower()}_candidates')
+        return getattr(self, f'grade_{grade.name.lower()}_candidates')
 
     def set_grade_candidates(self, grade, candidates):
-        setattr(self, f'grade_{grade_state.name.lower()}_candidates', candidates)
+        setattr(self, f'grade_{grade.name.lower()}_candidates', candidates)
+
+    def grade_candidate_ids(self, grade):
+        return getattr(self, f'grade_{grade.name.lower()}_candidate_ids')
 
     def grade_candidate_count(self, grade):
-        return getattr(self, f'grade_{grade_state.name.lower()}_count')
+        return getattr(self, f'grade_{grade.name.lower()}_candidate_count')
 
     @property
     def grade_candidates_bins(self):
@@ -286,60 +438,140 @@ class GradedReport(Report):
             grade: {
                 'count': self.grade_candidate_count(grade),
                 'candidates': self.grade_candidates(grade)
-            }
+            } for grade in GradeState
         }
 
-    def generate(self):
-        super().generate()
-        assessment_set = self.snapshot_assessment_set()
+    snapshot_fields = Report.snapshot_fields + ('grade',)
 
-        for grade in GradeState.values:
-            grade_assessments = assessment_set.all().filter(grade=grade)
+    def generate_from_snapshot(self, snapshot):
+        super().generate_from_snapshot(snapshot)
+
+        for grade in GradeState:
             self.set_grade_candidates(grade, [
-                assessment.student_id
-                for assessment in grade_assessments.only('candidate_id')
+                assessment['student_id'] for assessment in snapshot
+                if assessment['grade'] == grade
             ])
+        return self
 
 class RatedReport(Report):
     rating_average          = models.DecimalField(decimal_places=2, max_digits=5, null=True)
     rating_std_dev          = models.DecimalField(decimal_places=2, max_digits=5, null=True)
 
-    _candidate_ratings = models.TextField(default='')
-
-    @property
-    def candidate_ratings(self):
-        candidate_rating_pairs = (
-            [rating.split(':') for rating in self._candidate_ratings.split(',')] 
-            if self._candidate_ratings else []
-        )
-        return {
-            UUID(hex=candidate_id): rating
-            for candidate_id, rating in candidate_rating_pairs
-        }
-
-    @candidate_ratings.setter
-    def candidate_ratings(self, ratings):
-        pairs = [f'{candidate_id}:{rating}' for candidate_id, rating in ratings.items()]
-        self._candidate_ratings = ','.join(pairs)
+    _candidate_ratings = models.BinaryField(default=b'')
+    candidate_ratings = packed_model_values_property('_member_ids', '_candidate_ratings')
 
     @property
     def max_available_rating(self):
         return self.get_assessment_option('max_available_rating')
 
-    def generate(self):
-        super().generate()
+    snapshot_fields = Report.snapshot_fields + ('rating',)
+
+    def generate_from_snapshot(self, snapshot):
+        super().generate_from_snapshot(snapshot)
 
-        assessment_set = self.snapshot_assessment_set()
         self.candidate_ratings = {
-            result['student_id']: result['rating']
-            for result in assessment_set.values('student_id', 'rating')
+            assessment['student_id']: assessment['rating']
+            for assessment in snapshot
         }
 
-        self.rating_average = assessment_set.aggregate(rating_average=models.Avg('rating'))['rating_average'] or 0
-        self.rating_std_dev = assessment_set.aggregate(rating_std_dev=models.StdDev('rating'))['rating_std_dev'] or 0
+        ratings = [assessment['rating'] for assessment in snapshot if assessment['rating'] is not None]
+        self.rating_average = statistics.mean(ratings) if ratings else 0
+        self.rating_std_dev = statistics.pstdev(ratings) if ratings else 0
 
         return self
 
 
+class StaleReport(models.Model):
+    """
+    The set of (assessment schema, subject node, subject class) report keys
+    whose inputs have changed since the report was last generated.
+
+    A key is marked stale whenever an attempt on an assessment covered by the
+    report is saved or deleted, or when the students of the report's class
+    change. The key is removed when the report is regenerated, so reports
+    which are not in the stale set are served directly from their stored columns.
+    """
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['assessment_schema_id', 'subject_node_id', 'subject_class_id'],
+                name='unique_stalereport'
+            ),
+            models.UniqueConstraint(
+                fields=['assessment_schema_id', 'subject_node_id'],
+                condition=models.Q(subject_class_id=None),
+                name='unique_wo_class_stalereport'
+            )
+        ]
+
+    id = models.UUIDField(primary_key=True, default=uuid4)
+
+    assessment_schema = models.ForeignKey('assessments.AssessmentSchema', related_name='+', on_delete=models.CASCADE)
+    subject_node = models.ForeignKey(SubjectNode, related_name='+', on_delete=models.CASCADE)
+    subject_class = models.ForeignKey(SubjectClass, related_name='+', null=True, on_delete=models.CASCADE)
+
+    marked_at = models.DateTimeField(auto_now=True)
+
+    class QuerySet(models.QuerySet):
+        def filter_key(self, assessment_schema_id, subject_node_id, subject_class_id):
+            return self.filter(
+                assessment_schema_id=assessment_schema_id,
+                subject_node_id=subject_node_id,
+                subject_class_id=subject_class_id
+            )
 
+    class Manager(models.Manager):
+        def mark_stale(self, keys):
+            """
+            Adds the given (assessment_schema_id, subject_node_id, subject_class_id)
+            keys to the stale set. Keys which are already stale are ignored.
+            """
+            self.bulk_create(
+                [
+                    StaleReport(
+                        assessment_schema_id=assessment_schema_id,
+                        subject_node_id=subject_node_id,
+                        subject_class_id=subject_class_id
+                    )
+                    for assessment_schema_id, subject_node_id, subject_class_id in set(keys)
+                ],
+                ignore_conflicts=True
+            )
 
+        def mark_assessments_stale(self, assessments):
+            """
+            Marks stale the reports which cover any of the assessments. 
+
+            That is, the reports for the schema and node of each assessment, 
+            both with no subject class and for each of the classes of
+            the assessment's student.
+            """
+            assessments = list(assessments)
+
+            student_classes = defaultdict(set)
+            memberships = (SubjectClass.students.through.objects
+                .filter(student_id__in={assessment.student_id for assessment in assessments})
+                .values_list('student_id', 'subjectclass_id'))
+            for student_id, subject_class_id in memberships:
+                student_classes[student_id].add(subject_class_id)
+
+            keys = []
+            for assessment in assessments:
+                for subject_class_id in [None, *student_classes[assessment.student_id]]:
+                    keys.append((assessment.schema_id, assessment.subject_node_id, subject_class_id))
+            self.mark_stale(keys)
+
+        def mark_classes_stale(self, subject_class_ids):
+            """
+            Marks stale all existing reports for the given subject classes. 
+            """
+            keys = []
+            for attempt_type in AttemptType:
+                keys.extend(
+                    Report.objects_of_type(attempt_type)
+                    .filter(subject_class_id__in=subject_class_ids)
+                    .values_list('assessment_schema_id', 'subject_node_id', 'subject_class_id')
+                )
+            self.mark_stale(keys)
+
+    objects = Manager.from_queryset(QuerySet)()
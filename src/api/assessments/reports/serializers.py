@@ -5,13 +5,15 @@ from base.serializers import DocumentSerializer
 from schools.models import SubjectClass
 from subjects.models import SubjectNode
 
-from ..models import AttemptType
+from ..models import AttemptType, GradeState
 
 
 
-def RelatedStudentsField():
+def RelatedStudentsField(source=None):
 	return serializers.ListField(
-		child=serializers.PrimaryKeyRelatedField(read_only=True)
+		child=serializers.UUIDField(),
+		source=source,
+		read_only=True
 	)
 
 class ReportSerializer(DocumentSerializer):
@@ -33,27 +35,27 @@ class ReportSerializer(DocumentSerializer):
 	school = serializers.PrimaryKeyRelatedField(source='assessment_schema.school', read_only=True)
 	subject = serializers.PrimaryKeyRelatedField(source='assessment_schema.subject', read_only=True)
 
-	candidates = RelatedStudentsField()
+	candidates = RelatedStudentsField('candidate_ids')
 	candidate_count = serializers.IntegerField()
 
-	attempted_candidates = RelatedStudentsField()
+	attempted_candidates = RelatedStudentsField('attempted_candidate_ids')
 	attempted_candidate_count = serializers.IntegerField()
 
 	percent_attempted = serializers.FloatField()
 	
 
 class PassFailReportSerializer(ReportSerializer):
-	passed_candidates = RelatedStudentsField()
+	passed_candidates = RelatedStudentsField('passed_candidate_ids')
 	passed_candidate_count = serializers.IntegerField()
 
 	percent_passed = serializers.FloatField()
 
 
 class CompletionBasedReportSerializer(ReportSerializer):
-	partially_complete_candidates = RelatedStudentsField()
+	partially_complete_candidates = RelatedStudentsField('partially_complete_candidate_ids')
 	partially_complete_candidate_count = serializers.IntegerField()
 
-	complete_candidates = RelatedStudentsField()
+	complete_candidates = RelatedStudentsField('complete_candidate_ids')
 	complete_candidate_count = serializers.IntegerField()
 
 	percent_partially_complete = serializers.FloatField()	
@@ -69,11 +71,12 @@ class GradedReportSerializer(ReportSerializer):
 
 	def to_representation(self, instance):
 		representation = super().to_representation(instance)
-		for grade in GradeState.values:
-			representation[str(grade)] = GradedReportSerializer.Grade(
-				instance.candidate_grades[grade], 
-				data={'grade': str(grade)}
-			).data
+		for grade in GradeState:
+			representation[grade.value] = GradedReportSerializer.Grade({
+				'grade': grade.value,
+				'candidates': instance.grade_candidate_ids(grade),
+				'candidate_count': instance.grade_candidate_count(grade)
+			}).data
 		return representation
 
 
@@ -0,0 +1,46 @@
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from schools.models import SubjectClass
+
+from ..models import Assessment
+from ..attempts.models import (
+    PassFailAttempt,
+    CompletionBasedAttempt,
+    RatedAttempt,
+    GradedAttempt
+)
+from .models import StaleReport
+
+
+ATTEMPT_MODELS = (PassFailAttempt, CompletionBasedAttempt, RatedAttempt, GradedAttempt)
+
+
+def mark_attempt_reports_stale(sender, instance, **kwargs):
+    # The assessment will not exist if the attempt is being deleted along with it.
+    assessments = Assessment._base_manager.filter(pk=instance.assessment_id)
+    StaleReport.objects.mark_assessments_stale(assessments)
+
+for attempt_model in ATTEMPT_MODELS:
+    post_save.connect(mark_attempt_reports_stale, sender=attempt_model)
+    post_delete.connect(mark_attempt_reports_stale, sender=attempt_model)
+
+
+@receiver(post_delete, sender=Assessment)
+def mark_assessment_reports_stale(sender, instance, **kwargs):
+    StaleReport.objects.mark_assessments_stale([instance])
+
+
+@receiver(m2m_changed, sender=SubjectClass.students.through)
+def mark_class_reports_stale(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            StaleReport.objects.mark_classes_stale([instance.pk])
+    else:
+        # The instance is a student, and pk_set contains the ids of the classes.
+        if action in ('post_add', 'post_remove'):
+            StaleReport.objects.mark_classes_stale(pk_set)
+        elif action == 'pre_clear':
+            StaleReport.objects.mark_classes_stale(
+                instance.subjectclass_set.values_list('id', flat=True)
+            )
@@ -29,6 +29,13 @@ from .reports.serializers import *
 ##
 ###################################
 
+class AssessmentListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        assessments = list(data.all() if hasattr(data, 'all') else data)
+        Assessment.hydrate(assessments)
+        return super().to_representation(assessments)
+
+
 class AssessmentSerializer(serializers.Serializer):
     """
     From the perspective of the API, there is no schema, only assessments
@@ -71,6 +78,12 @@ class AssessmentSerializer(serializers.Serializer):
     comments = CommentSerializer(many=True)
     comments_count = serializers.IntegerField(read_only=True, source='comments.count')
 
+    class Meta:
+        list_serializer_class = AssessmentListSerializer
+
+    def to_representation(self, instance):
+        Assessment.hydrate([instance])
+        return super().to_representation(instance)
 
     def schema_serializer(self, instance):
         serializer_cls = schema_serializer_class_for_type(instance.type)
@@ -79,14 +92,14 @@ class AssessmentSerializer(serializers.Serializer):
     def validate(self, data):
         # There must be a schema that exists for the assessment
         try:
-            data['schema'] = AssessmentSchema.objects.filter(
-                type=data['type'],
-                school=data['student'].school,
-            ).get()
+            data['schema'] = AssessmentSchema.objects.get_for_type(data['type'])
         except AssessmentSchema.DoesNotExist:
+            data['schema'] = None
+
+        if data['schema'] is None or data['schema'].school_id != data['student'].school_id:
             raise ValidationError(
-                f'Cannot create {type} assessment for student. '
-                f'There is no assessment schema of the given type for students at {school.name}.'
+                f'Cannot create {data["type"]} assessment for student. '
+                f'There is no assessment schema of the given type for students at {data["student"].school.name}.'
             )
         return data
 
@@ -132,12 +145,7 @@ class RatingsBasedAssessmentSerializer(AssessmentSerializer):
     rating                  = serializers.IntegerField()
     rating_percent          = serializers.FloatField(allow_null=True)
 
-    attempts = RatedAttemptSerializer(many=True, read_only=True, source='attempt_set')
-
-    def to_representation(self, instance):
-        if instance is None:
-            import pdb; pdb.set_trace()
-        return super().to_representation(instance)
+    attempts = RatedAttemptSerializer(many=True, read_only=True)
 
 class UnitAssessmentSerializer(RatingsBasedAssessmentSerializer):
     unit = serializers.UUIDField(source='schema.unit.id', read_only=True)
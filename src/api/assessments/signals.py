@@ -0,0 +1,10 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import AssessmentSchema, AssessmentOptions
+
+
+@receiver([post_save, post_delete], sender=AssessmentSchema)
+@receiver([post_save, post_delete], sender=AssessmentOptions)
+def clear_assessment_schema_cache(sender, **kwargs):
+    AssessmentSchema.objects.clear_cache()
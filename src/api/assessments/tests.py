@@ -1,3 +1,410 @@
-from django.test import TestCase
+from unittest import mock
+from uuid import uuid4
 
-# Create your tests here.
+from django.apps import apps
+from django.core.exceptions import ImproperlyConfigured
+from django.db import IntegrityError, transaction
+from django.test import TestCase, override_settings
+
+from rest_framework.test import APIClient
+
+from base.models import Comment
+from subjects.models import SubjectNode
+from users.models import User
+from utils.importer import _excel
+from utils.importer.pipeline import AssessmentImport
+
+from .models import Assessment, AssessmentSchema
+from .attempts.models import AssessmentLatestAttempt, RatedAttempt
+from .reports.models import RatedReport, StaleReport
+
+
+class AssessmentTestCase(TestCase):
+    """
+    Runs against the assessments imported from the source workbook by the
+    data migrations. The process-level caches are cleared before each test,
+    since the rows they were built from are rolled back after each test.
+    """
+    def setUp(self):
+        AssessmentSchema.objects.clear_cache()
+        SubjectNode.objects.clear_tree()
+
+        self.unit_schema = AssessmentSchema.objects.get_for_type('unit-assessment')
+
+    def unattempted_unit_assessment(self):
+        return Assessment.unit_assessments.filter(is_attempted=False).order_by('id').first()
+
+    def attempted_unit_assessment(self):
+        return Assessment.unit_assessments.filter(is_attempted=True).order_by('id').first()
+
+
+class ProgressRegenerationTest(AssessmentTestCase):
+    def test_progress_is_regenerated_after_an_attempt(self):
+        assessment = self.unattempted_unit_assessment()
+        subject_node = self.unit_schema.subject.node
+
+        progress = self.unit_schema.get_or_generate_progress(assessment.student, subject_node)
+        self.assertNotIn(assessment.id, progress.attempted_assessment_ids)
+        self.assertFalse(self.unit_schema.progress_set.get(pk=progress.pk).requires_regeneration)
+
+        RatedAttempt.objects.create(id=uuid4(), assessment=assessment, rating=3)
+        self.assertTrue(self.unit_schema.progress_set.get(pk=progress.pk).requires_regeneration)
+
+        progress = self.unit_schema.get_or_generate_progress(assessment.student, subject_node)
+        self.assertIn(assessment.id, progress.attempted_assessment_ids)
+        self.assertFalse(self.unit_schema.progress_set.get(pk=progress.pk).requires_regeneration)
+
+
+class ReportRegenerationTest(AssessmentTestCase):
+    def test_report_is_regenerated_after_an_attempt(self):
+        assessment = self.unattempted_unit_assessment()
+        subject_node = SubjectNode.objects.get(pk=assessment.subject_node_id)
+
+        report = self.unit_schema.get_or_generate_report(subject_node=subject_node)
+        self.assertNotIn(assessment.student_id, report.attempted_candidate_ids)
+        self.assertFalse(self.unit_schema.report_set.get(pk=report.pk).requires_regeneration)
+
+        RatedAttempt.objects.create(id=uuid4(), assessment=assessment, rating=3)
+        self.assertTrue(self.unit_schema.report_set.get(pk=report.pk).requires_regeneration)
+
+        report = self.unit_schema.get_or_generate_report(subject_node=subject_node)
+        self.assertIn(assessment.student_id, report.attempted_candidate_ids)
+        self.assertEqual(report.candidate_ratings[assessment.student_id], 3)
+        self.assertFalse(report.stale_report_set.exists())
+
+    def test_bulk_reports_match_their_snapshots(self):
+        schema = AssessmentSchema.objects.get_for_type('block-assessment')
+        subject_nodes = list(
+            SubjectNode.objects.filter(node_type=schema.subject_node_type).order_by('path')[:5]
+        )
+
+        reports = schema.get_or_generate_reports(subject_nodes)
+
+        self.assertEqual([report.subject_node_id for report in reports], [node.id for node in subject_nodes])
+        for report in reports:
+            attempted_student_ids = set(Assessment.block_assessments
+                .filter(subject_node_id=report.subject_node_id, is_attempted=True)
+                .values_list('student_id', flat=True))
+            self.assertEqual(set(report.attempted_candidate_ids), attempted_student_ids)
+            self.assertEqual(report.attempted_candidate_count, len(attempted_student_ids))
+
+        # Marking a report stale only regenerates that report
+        StaleReport.objects.mark_stale([(schema.id, subject_nodes[0].id, None)])
+        with mock.patch.object(RatedReport, 'generate_from_snapshot', autospec=True,
+                               side_effect=RatedReport.generate_from_snapshot) as generate:
+            schema.get_or_generate_reports(subject_nodes)
+        self.assertEqual([call.args[0].subject_node_id for call in generate.call_args_list], [subject_nodes[0].id])
+
+
+class LatestAttemptTest(AssessmentTestCase):
+    def test_assessments_are_annotated_from_the_latest_attempt(self):
+        for assessment in Assessment.unit_assessments.filter(is_attempted=True).order_by('id')[:20]:
+            latest = assessment.attempts[-1]
+            self.assertEqual(assessment.rating, latest.rating)
+            self.assertEqual(assessment.attempted_at, latest.created_at)
+
+    def test_latest_attempt_is_maintained(self):
+        assessment = self.attempted_unit_assessment()
+        attempt_numbers = list(RatedAttempt._base_manager
+            .filter(assessment_id=assessment.id)
+            .order_by('attempt_number')
+            .values_list('attempt_number', flat=True))
+
+        attempt = RatedAttempt.objects.create(id=uuid4(), assessment=assessment, rating=1)
+        latest = AssessmentLatestAttempt.objects.get(pk=assessment.id)
+        self.assertEqual((latest.attempt_number, latest.rating), (attempt_numbers[-1] + 1, 1))
+
+        attempt = RatedAttempt._base_manager.get(pk=attempt.pk)
+        attempt.rating = 2
+        attempt.save()
+        self.assertEqual(AssessmentLatestAttempt.objects.get(pk=assessment.id).rating, 2)
+
+        attempt.delete()
+        latest = AssessmentLatestAttempt.objects.get(pk=assessment.id)
+        self.assertEqual(latest.attempt_number, attempt_numbers[-1])
+
+        for attempt in RatedAttempt._base_manager.filter(assessment_id=assessment.id):
+            attempt.delete()
+        self.assertFalse(AssessmentLatestAttempt.objects.filter(pk=assessment.id).exists())
+
+    def test_rebuild(self):
+        assessment = self.attempted_unit_assessment()
+        latest = AssessmentLatestAttempt.objects.get(pk=assessment.id)
+
+        AssessmentLatestAttempt.objects.filter(pk=assessment.id).delete()
+        self.assertEqual(AssessmentLatestAttempt.objects.rebuild(assessment_ids=[assessment.id]), 1)
+
+        rebuilt = AssessmentLatestAttempt.objects.get(pk=assessment.id)
+        self.assertEqual((rebuilt.attempt_number, rebuilt.rating), (latest.attempt_number, latest.rating))
+
+
+class AttemptNumberTest(AssessmentTestCase):
+    def test_attempts_are_numbered_in_sequence(self):
+        assessment = self.unattempted_unit_assessment()
+
+        attempts = [
+            RatedAttempt.objects.create(id=uuid4(), assessment=assessment, rating=rating)
+            for rating in (1, 2)
+        ]
+        attempts += RatedAttempt.objects.bulk_create_attempts([
+            RatedAttempt(id=uuid4(), assessment=assessment, rating=rating)
+            for rating in (3, 4)
+        ])
+
+        self.assertEqual([attempt.attempt_number for attempt in attempts], [1, 2, 3, 4])
+        self.assertEqual(AssessmentLatestAttempt.objects.get(pk=assessment.id).attempt_number, 4)
+
+    def test_attempt_number_conflict_is_retried(self):
+        assessment = self.attempted_unit_assessment()
+        RatedAttempt.objects.create(id=uuid4(), assessment=assessment, rating=2)
+        max_attempt_number = RatedAttempt.objects.filter(assessment_id=assessment.id).max_attempt_number()
+
+        # A counter which is behind the attempt table, as if a concurrent
+        # attempt claimed the next number first.
+        AssessmentLatestAttempt.objects.filter(pk=assessment.id).update(attempt_number=max_attempt_number - 1)
+        attempt = RatedAttempt.objects.create(id=uuid4(), assessment=assessment, rating=3)
+
+        self.assertEqual(attempt.attempt_number, max_attempt_number + 1)
+
+    def test_missing_counter_is_numbered_from_the_attempt_table(self):
+        assessment = self.attempted_unit_assessment()
+        max_attempt_number = RatedAttempt.objects.filter(assessment_id=assessment.id).max_attempt_number()
+
+        AssessmentLatestAttempt.objects.filter(pk=assessment.id).delete()
+        attempts = RatedAttempt.objects.bulk_create_attempts([
+            RatedAttempt(id=uuid4(), assessment=assessment, rating=3)
+        ])
+
+        self.assertEqual(attempts[0].attempt_number, max_attempt_number + 1)
+
+    def test_other_integrity_errors_are_not_retried(self):
+        assessment = self.unattempted_unit_assessment()
+
+        with mock.patch.object(AssessmentLatestAttempt.objects, 'next_attempt_number',
+                               wraps=AssessmentLatestAttempt.objects.next_attempt_number) as next_attempt_number:
+            with self.assertRaises(IntegrityError), transaction.atomic():
+                # Attempts have no default id
+                RatedAttempt.objects.create(assessment=assessment, rating=3)
+        self.assertEqual(next_attempt_number.call_count, 1)
+
+
+class BulkAttemptsTest(AssessmentTestCase):
+    url = '/api/assessments/attempts/?type=unit-assessment'
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.first())
+
+    def test_status_of_each_attempt(self):
+        assessments = list(Assessment.unit_assessments.filter(is_attempted=False).order_by('id')[:2])
+
+        response = self.client.post(self.url, {'attempts': [
+            {'assessment': str(assessments[0].id), 'rating': 3},
+            {'assessment': 'not-an-id', 'rating': 3},
+            'not-an-attempt',
+            {'assessment': str(assessments[1].id), 'rating': 4},
+            {'assessment': str(assessments[0].id), 'rating': 5},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual(response.json()['count'], 3)
+        self.assertEqual(
+            [result['status'] for result in results],
+            ['created', 'invalid', 'invalid', 'created', 'created']
+        )
+        self.assertEqual([results[i]['attempt_number'] for i in (0, 3, 4)], [1, 1, 2])
+        self.assertIn('assessment', results[1]['errors'])
+
+        self.assertEqual(AssessmentLatestAttempt.objects.get(pk=assessments[0].id).rating, 5)
+        self.assertTrue(StaleReport.objects.filter(
+            assessment_schema_id=self.unit_schema.id,
+            subject_node_id=assessments[1].subject_node_id,
+            subject_class_id=None
+        ).exists())
+
+    def test_body_must_contain_a_list_of_attempts(self):
+        for body in ([], {'attempts': 1}, {}):
+            response = self.client.post(self.url, body, format='json')
+            self.assertEqual(response.status_code, 400, body)
+
+
+class PackedMembersTest(TestCase):
+    def test_sets_are_encoded_over_the_member_pool(self):
+        report = RatedReport()
+        a, b, c, d = (uuid4() for _ in range(4))
+
+        report.candidates = [a, b, c]
+        report.attempted_candidates = [a]
+        report.candidate_ratings = {a: 3, b: None}
+
+        self.assertEqual(set(report.candidate_ids), {a, b, c})
+        self.assertEqual(report.candidate_count, 3)
+        self.assertEqual(list(report.attempted_candidate_ids), [a])
+        self.assertEqual(report.candidate_ratings, {a: 3})
+        self.assertEqual(len(report._member_ids), 3 * 16)
+
+    def test_member_pool_only_holds_current_members(self):
+        report = RatedReport()
+        a, d = uuid4(), uuid4()
+        report.attempted_candidates = [a]
+        report.candidate_ratings = {a: 3}
+
+        for _ in range(10):
+            report.candidates = [uuid4(), d]
+
+        self.assertEqual(len(report._member_ids), 3 * 16)
+        self.assertEqual(list(report.attempted_candidate_ids), [a])
+        self.assertEqual(report.candidate_ratings, {a: 3})
+        self.assertIn(d, report.candidate_ids)
+
+        report.attempted_candidates = []
+        report.candidate_ratings = {}
+        report.candidates = [d]
+        self.assertEqual(len(report._member_ids), 16)
+        self.assertEqual(list(report.candidate_ids), [d])
+
+
+class SchemaCacheTest(AssessmentTestCase):
+    def test_lookups_are_served_from_memory(self):
+        schema = AssessmentSchema.objects.get_for_type('unit-assessment')
+
+        with self.assertNumQueries(0):
+            self.assertIs(AssessmentSchema.objects.get_for_type('unit-assessment'), schema)
+            self.assertIs(AssessmentSchema.objects.get_for_id(schema.id), schema)
+
+        with self.assertRaises(AssessmentSchema.DoesNotExist):
+            AssessmentSchema.objects.get_for_type('not-a-type')
+
+    def test_options_fall_back_to_the_schema_defaults(self):
+        options = self.unit_schema.get_assessment_options_for_node_id(uuid4())
+        self.assertEqual(options, self.unit_schema.default_options)
+
+    def test_hydrated_assessments_need_no_queries(self):
+        assessments = list(Assessment._base_manager.order_by('id')[:20])
+        Assessment.hydrate(assessments)
+
+        with self.assertNumQueries(0):
+            for assessment in assessments:
+                assessment.schema
+                assessment.is_attempted
+                assessment.attempts
+                list(assessment.comments.all())
+
+    def test_filter_node_selects_the_subtree(self):
+        subject_node = SubjectNode.objects.filter(node_type='unit').order_by('path').first()
+        node_ids = [subject_node.id, *subject_node.get_descendants().values_list('id', flat=True)]
+        assessments = Assessment.lesson_prelearning_assessments
+
+        self.assertEqual(
+            set(assessments.filter_node(subject_node, include_descendants=True).values_list('id', flat=True)),
+            set(assessments.filter(subject_node_id__in=node_ids).values_list('id', flat=True))
+        )
+
+
+class AssessmentImportTest(TestCase):
+    def test_upsert_of_an_unchanged_workbook_writes_nothing(self):
+        assessment_import = AssessmentImport(apps, upsert=True).run()
+
+        self.assertEqual(assessment_import.row_count, 0)
+        self.assertEqual(assessment_import.update_count, 0)
+
+    def test_workbook_must_be_configured(self):
+        with mock.patch.dict(_excel._sheet_rows, clear=True), override_settings(SOURCE_WORKBOOK=None):
+            with self.assertRaises(ImproperlyConfigured):
+                _excel.load_sheets()
+
+
+class PaginationTest(AssessmentTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.first())
+
+    def get(self, url):
+        response = self.client.get(url, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200, url)
+        return response.json()
+
+    def test_cursor_pages_cover_every_assessment_once(self):
+        url = '/api/assessments/?type=block-assessment&pagination=cursor&cursor='
+        assessment_ids = []
+        while url:
+            page = self.get(url)
+            assessment_ids += [assessment['id'] for assessment in page['results']]
+            url = page['next']
+
+        self.assertEqual(len(assessment_ids), len(set(assessment_ids)))
+        self.assertEqual(
+            set(assessment_ids),
+            {str(assessment_id) for assessment_id in Assessment.block_assessments.values_list('id', flat=True)}
+        )
+
+    def test_cursor_pagination_is_opt_in(self):
+        page = self.get(f'/api/assessments/?type=block-assessment&cursor={uuid4()}')
+        self.assertIn('page_number', page)
+
+        response = self.client.get(
+            f'/api/assessments/?type=block-assessment&pagination=cursor&cursor={uuid4()}',
+            HTTP_ACCEPT='application/json'
+        )
+        self.assertEqual(response.status_code, 404)
+
+
+class CommentsTest(AssessmentTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.first()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        self.assessment = self.unattempted_unit_assessment()
+        self.url = f'/api/assessments/{self.assessment.id}/comments/?type=unit-assessment'
+
+    def add_comment(self, content, reply_to=None):
+        return Comment.objects.create(
+            id=uuid4(),
+            attached_to=self.assessment,
+            created_by=self.user,
+            content=content,
+            reply_to=reply_to
+        )
+
+    def test_thread_contains_every_reply(self):
+        comment = self.add_comment('comment')
+        reply = self.add_comment('reply', reply_to=comment)
+        nested_reply = self.add_comment('nested reply', reply_to=reply)
+        self.add_comment('unrelated')
+
+        with self.assertNumQueries(1):
+            thread = list(Comment.objects.thread(comment.id))
+        self.assertEqual(thread, [comment, reply, nested_reply])
+        self.assertEqual(list(Comment.objects.thread(reply.id)), [reply, nested_reply])
+
+        response = self.client.get(f'{self.url}&thread={reply.id}', HTTP_ACCEPT='application/json')
+        self.assertEqual([c['content'] for c in response.json()['results']], ['reply', 'nested reply'])
+
+    def test_comments_are_paged_by_cursor(self):
+        existing_ids = {str(comment.id) for comment in Comment.objects.attached_to_model(self.assessment)}
+        comments = [self.add_comment(f'comment {i}') for i in range(30)]
+
+        url = f'{self.url}&cursor='
+        comment_ids = []
+        while url:
+            page = self.client.get(url, HTTP_ACCEPT='application/json').json()
+            self.assertEqual(page['count'], len(existing_ids) + len(comments))
+            comment_ids += [comment['id'] for comment in page['results']]
+            url = page['next']
+
+        self.assertEqual(
+            comment_ids,
+            [str(comment.id) for comment in Comment.objects.attached_to_model(self.assessment)]
+        )
+        self.assertEqual(set(comment_ids), existing_ids | {str(comment.id) for comment in comments})
+
+        for param in ('cursor=not-an-id', 'thread=not-an-id'):
+            response = self.client.get(f'{self.url}&{param}', HTTP_ACCEPT='application/json')
+            self.assertEqual(response.status_code, 400, param)
+        response = self.client.get(f'{self.url}&cursor={uuid4()}', HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 404)
@@ -19,6 +19,7 @@ from schools.models import SubjectClass, Student
 
 from .models import (
     Assessment, 
+    Attempt,
     AssessmentSchema, 
     Progress,
     Report
@@ -79,7 +80,7 @@ class AssessmentViewSet(SaveableModelViewSet, CommentableModelMixin):
 
     def get_queryset(self):
         assessment_type = self.get_assessment_type()
-        qs = Assessment.objects_of_type(assessment_type)
+        qs = Assessment.objects_of_type(assessment_type).all()
 
         student_param = self.request.query_params.get('student', None)
         if student_param is not None:
@@ -103,7 +104,7 @@ class AssessmentViewSet(SaveableModelViewSet, CommentableModelMixin):
         if assessment_type is None:
             return Response({'errors': {'type': 'Report must be run on an assessment type'}}, status=status.HTTP_400_BAD_REQUEST)
 
-        schema = AssessmentSchema.objects.get(type=assessment_type)
+        schema = AssessmentSchema.objects.get_for_type(assessment_type)
 
         node = self.get_node_from_params()
         subject_class = self.get_subject_class_from_params()
@@ -112,17 +113,12 @@ class AssessmentViewSet(SaveableModelViewSet, CommentableModelMixin):
         # which are of the schema's subject node type
         all_report_nodes = node.get_descendants_of_type(schema.subject_node_type)
 
-        if not all_report_nodes.exists():
+        if not all_report_nodes:
             raise ValidationError(detail={'node': f'Node has no descendants of type {schema.subject_node_type}'})
 
-        page_nodes = self.paginate_queryset(all_report_nodes.all())
+        page_nodes = self.paginate_queryset(all_report_nodes)
 
-        reports = [] 
-        for node in page_nodes: 
-            print('generating report for', node, subject_class)
-            report = schema.get_or_generate_report(subject_class=subject_class, subject_node=node)
-            report.save()
-            reports.append(report)
+        reports = schema.get_or_generate_reports(page_nodes, subject_class=subject_class)
 
         report_serializer = ReportSerializer.for_attempt_type(schema.attempt_type, reports, many=True)
         return Response({
@@ -137,7 +133,7 @@ class AssessmentViewSet(SaveableModelViewSet, CommentableModelMixin):
         if assessment_type is None:
             return Response({'errors': {'type': 'Progress must be run for an assessment type'}}, status=status.HTTP_400_BAD_REQUEST)
 
-        schema = AssessmentSchema.objects.get(type=assessment_type)
+        schema = AssessmentSchema.objects.get_for_type(assessment_type)
         student_id = self.request.query_params.get('student', None)
         if student_id is None:
             raise ValidationError(detail={
@@ -180,11 +176,73 @@ class AssessmentViewSet(SaveableModelViewSet, CommentableModelMixin):
         else:
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=False, methods=['post'])
+    def attempts(self, request):
+        """
+        Create attempts at many assessments of a single type in one request.
+
+        Expects a list of `attempts`, each of which is validated in the same 
+        way as a single attempt. Valid attempts are created together and 
+        the response contains the status of each attempt, in the order given.
+        """
+        schema = AssessmentSchema.objects.get_for_type(self.get_assessment_type())
+
+        items = request.data.get('attempts', None) if isinstance(request.data, dict) else None
+        if not isinstance(items, list):
+            raise ValidationError(detail={'attempts': 'Expected a list of attempts'})
+
+        assessment_ids = set()
+        for item in items:
+            try:
+                assessment_ids.add(UUID(str(item['assessment'])))
+            except (TypeError, KeyError, ValueError):
+                pass
+
+        context = dict(
+            self.get_serializer_context(),
+            assessment_schema=schema,
+            assessments=Assessment._base_manager.in_bulk(assessment_ids)
+        )
+
+        results = [None] * len(items)
+        valid_attempts = []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                results[index] = {'status': 'invalid', 'errors': {'non_field_errors': ['Expected an attempt']}}
+                continue
+
+            serializer = AttemptSerializer.for_attempt_type(
+                schema.attempt_type, 
+                data={'assessment_type': schema.type, **item}, 
+                context=context
+            )
+            if serializer.is_valid():
+                valid_attempts.append((index, serializer.build_attempt(serializer.validated_data)))
+            else:
+                results[index] = {'status': 'invalid', 'errors': serializer.errors}
+
+        if valid_attempts:
+            attempts = (Attempt
+                .objects_of_type(schema.attempt_type)
+                .bulk_create_attempts([attempt for _, attempt in valid_attempts]))
+
+            for (index, _), attempt in zip(valid_attempts, attempts):
+                results[index] = {
+                    'status': 'created', 
+                    'id': attempt.id, 
+                    'attempt_number': attempt.attempt_number
+                }
+
+        return Response({
+            'count': len(valid_attempts),
+            'results': results
+        })
+
     @action(detail=True, 
             methods=['get', 'put', 'post'],
             permission_classes=[IsAuthenticated])
     def comments(self, request, **kwargs):
-        if request.method == 'get':
+        if request.method == 'GET':
             return self.list_comments(request, **kwargs)
         else:
             return self.create_comment(request, **kwargs)
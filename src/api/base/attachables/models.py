@@ -2,7 +2,8 @@
 from uuid import uuid4
 
 from django.utils import timezone
-from django.db import models
+from django.db import connections, models
+from django.db.models.expressions import RawSQL
 
 from django.contrib.auth.models import User
 
@@ -20,9 +21,65 @@ class Attachable(ObservableModel):
 
     created_by = models.ForeignKey('users.User', on_delete=models.CASCADE)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['attached_to_type', 'attached_to_id', 'created_at'],
+                name='index_attached_to_created'
+            )
+        ]
+
 
 class Comment(Attachable):
     reply_to = models.ForeignKey('base.Comment', on_delete=models.CASCADE, null=True)
 
     # Markdown encoded content.
     content = models.TextField()
+
+    class QuerySet(models.QuerySet):
+        def attached_to_model(self, model_instance):
+            content_type = ContentType.objects.get_for_model(model_instance)
+            return self.filter(
+                attached_to_type=content_type, 
+                attached_to_id=model_instance.pk
+            ).order_by('created_at', 'id')
+
+        def after(self, comment_id):
+            """
+            The comments created after the given comment, in order of (created_at, id).
+
+            Seeks to the comment on the attached_to index rather than counting 
+            an offset into the comments, so every page costs the same.
+            """
+            created_at = Attachable._base_manager.filter(pk=comment_id).values('created_at')
+            return self.filter(
+                models.Q(created_at__gt=models.Subquery(created_at)) 
+                | models.Q(created_at=models.Subquery(created_at), id__gt=comment_id)
+            ).order_by('created_at', 'id')
+
+        def thread(self, comment_id):
+            """
+            The comment, along with all its replies (and their replies, etc.) 
+            in the order they were created.
+
+            The thread is loaded with a single recursive query, regardless of its depth.
+            """
+            connection = connections[self.db]
+            qn = connection.ops.quote_name
+
+            pk_column = qn(Comment._meta.pk.column)
+            reply_to_column = qn(Comment._meta.get_field('reply_to').column)
+            comment_table = qn(Comment._meta.db_table)
+
+            thread_ids = RawSQL(
+                f'WITH RECURSIVE thread(id) AS ('
+                f'    SELECT {pk_column} FROM {comment_table} WHERE {pk_column} = %s'
+                f'    UNION ALL'
+                f'    SELECT reply.{pk_column} FROM {comment_table} reply'
+                f'    INNER JOIN thread ON reply.{reply_to_column} = thread.id'
+                f') SELECT id FROM thread',
+                [Comment._meta.pk.get_db_prep_value(comment_id, connection)]
+            )
+            return self.filter(pk__in=thread_ids).order_by('created_at', 'id')
+
+    objects = models.Manager.from_queryset(QuerySet)()
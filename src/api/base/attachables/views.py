@@ -1,6 +1,11 @@
-from uuid import uuid4
+from uuid import UUID, uuid4
 
+from django.http import Http404
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .models import Comment
 from .serializers import CommentSerializer
 
 
@@ -18,10 +23,50 @@ class CommentableModelMixin:
 		if not hasattr(attached_to, 'comments'):
 			raise AttributeError('attachable must implement \'comments\'')
 
-		page = self.paginate_queryset(attached_to.comments.all())
-
-		serializer = CommentSerializer(many=True)(page)
-		return Response(serializer.data)
+		# The full thread of replies to a comment
+		thread_id = self.get_comment_id_param(request, 'thread')
+		if thread_id is not None:
+			comments = list(Comment.objects.attached_to_model(attached_to).thread(thread_id))
+			if not comments:
+				raise Http404
+			for comment in comments:
+				Comment.attached_to.set_cached_value(comment, attached_to)
+			serializer = CommentSerializer(comments, many=True)
+			return Response({'count': len(comments), 'results': serializer.data})
+
+		# Comments are paged by a cursor holding the id of the last comment of the 
+		# previous page, rather than an offset. An empty cursor selects the first page.
+		comments = Comment.objects.attached_to_model(attached_to)
+		count = comments.count()
+
+		page = comments
+		cursor_id = self.get_comment_id_param(request, 'cursor')
+		if cursor_id is not None:
+			if not comments.filter(pk=cursor_id).exists():
+				raise Http404
+			page = comments.after(cursor_id)
+
+		page_size = self.paginator.get_page_size(request)
+		page = list(page[:page_size + 1])
+		next_cursor = page[page_size - 1].pk if len(page) > page_size else None
+		for comment in page:
+			Comment.attached_to.set_cached_value(comment, attached_to)
+
+		serializer = CommentSerializer(page[:page_size], many=True)
+		return Response({
+			'count': count,
+			'next': next_cursor and replace_query_param(request.build_absolute_uri(), 'cursor', next_cursor),
+			'results': serializer.data
+		})
+
+	def get_comment_id_param(self, request, param):
+		value = request.query_params.get(param, None)
+		if not value:
+			return None
+		try:
+			return UUID(value)
+		except ValueError:
+			raise ValidationError(detail={param: 'Expected a comment id'})
 
 	def create_comment(self, request, *args, **kwargs):
 		if request.method == 'PUT':
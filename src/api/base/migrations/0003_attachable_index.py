@@ -0,0 +1,17 @@
+# Generated by Django 3.0.5 on 2026-10-18 14:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0002_auto_20200505_1636'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attachable',
+            index=models.Index(fields=['attached_to_type', 'attached_to_id', 'created_at'], name='index_attached_to_created'),
+        ),
+    ]
@@ -1,3 +1,5 @@
+from array import array
+from functools import lru_cache
 from uuid import uuid4, UUID
 from datetime import datetime
 
@@ -26,13 +28,137 @@ def calculated_percentage_property(partial_attr, total_attr):
     return property(get_value)
 
 
-def comma_delimited_model_count_property(attr):
-    def count(self):
-        attr_value = getattr(self, attr)
-        return len(attr_value.split(',')) if attr_value else 0
-    return property(count)
+# Documents which store sets of models keep a single pool of member ids, packed
+# into a BinaryField as an array of 16 byte UUIDs. Each set of models is then 
+# stored as a bitmap over the pool, with the number of members of the set stored 
+# in a separate field.
+#
+# When a set is assigned, members which are no longer in any set of the document
+# are dropped from the pool (and the other sets are re-indexed), so the pool only
+# ever holds the members of the document's current sets.
 
-def comma_delimited_models_property(model, attr):
+MISSING_PACKED_VALUE = 0xFFFF
+
+class PackedMembersProperty(property):
+    """
+    A property which is stored in `attr`, either as a bitmap or as an array of values
+    over the pool of members in `members_attr`.
+    """
+    def __init__(self, fget, fset=None, *, members_attr, attr, stores_values=False):
+        super().__init__(fget, fset)
+        self.members_attr = members_attr
+        self.attr = attr
+        self.stores_values = stores_values
+
+
+def packed_uuid_index(packed, member_id):
+    """
+    The index of the id in the packed array of ids, or `None` if it is not a member.
+    """
+    packed = bytes(packed)
+    member_bytes = member_id.bytes
+    offset = packed.find(member_bytes)
+    while offset != -1 and offset % 16 != 0:
+        offset = packed.find(member_bytes, offset + 1)
+    return offset // 16 if offset != -1 else None
+
+
+class PackedMemberSet():
+    """
+    A read only set of ids, represented as a bitmap over a packed array of member ids.
+    Iterating the set only unpacks the ids of its members.
+    """
+    def __init__(self, members, bitmap):
+        self.members = bytes(members)
+        self.bits = int.from_bytes(bytes(bitmap), 'little')
+
+    def __len__(self):
+        return bin(self.bits).count('1')
+
+    def __iter__(self):
+        bits, index = self.bits, 0
+        while bits:
+            if bits & 1:
+                yield UUID(bytes=self.members[16 * index:16 * (index + 1)])
+            bits >>= 1
+            index += 1
+
+    def __contains__(self, member_id):
+        index = packed_uuid_index(self.members, member_id)
+        return index is not None and bool((self.bits >> index) & 1)
+
+
+def _bitmap_bytes(bits):
+    return bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+
+@lru_cache(maxsize=None)
+def _packed_attrs(model, members_attr):
+    """
+    The attrs of the bitmaps and of the value arrays stored over the pool of members
+    """
+    bitmap_attrs, value_attrs = set(), set()
+    for cls in model.__mro__:
+        for prop in vars(cls).values():
+            if isinstance(prop, PackedMembersProperty) and prop.members_attr == members_attr:
+                (value_attrs if prop.stores_values else bitmap_attrs).add(prop.attr)
+    return frozenset(bitmap_attrs), frozenset(value_attrs)
+
+def _add_packed_members(instance, members_attr, attr, member_ids):
+    """
+    Prepares the pool of members for a new value of `attr` and returns the index 
+    of each id in the pool.
+
+    Members which are in neither the new value nor any of the other sets are 
+    dropped, then any of the ids which are not yet in the pool are appended.
+    """
+    members = bytes(getattr(instance, members_attr) or b'')
+    pool = [UUID(bytes=members[offset:offset + 16]) for offset in range(0, len(members), 16)]
+
+    bitmap_attrs, value_attrs = _packed_attrs(type(instance), members_attr)
+    bitmaps = {
+        other_attr: int.from_bytes(bytes(getattr(instance, other_attr) or b''), 'little')
+        for other_attr in bitmap_attrs if other_attr != attr
+    }
+    values = {
+        other_attr: array('H', bytes(getattr(instance, other_attr) or b''))
+        for other_attr in value_attrs if other_attr != attr
+    }
+
+    new_member_ids = set(member_ids)
+    kept = [
+        index for index, member_id in enumerate(pool)
+        if member_id in new_member_ids
+        or any((bits >> index) & 1 for bits in bitmaps.values())
+        or any(index < len(packed) and packed[index] != MISSING_PACKED_VALUE for packed in values.values())
+    ]
+    if len(kept) < len(pool):
+        pool = [pool[index] for index in kept]
+        for other_attr, bits in bitmaps.items():
+            kept_bits = 0
+            for new_index, index in enumerate(kept):
+                kept_bits |= ((bits >> index) & 1) << new_index
+            setattr(instance, other_attr, _bitmap_bytes(kept_bits))
+        for other_attr, packed in values.items():
+            setattr(instance, other_attr, array('H', [
+                packed[index] if index < len(packed) else MISSING_PACKED_VALUE 
+                for index in kept
+            ]).tobytes())
+
+    indexes = {member_id: index for index, member_id in enumerate(pool)}
+    for member_id in member_ids:
+        if member_id not in indexes:
+            indexes[member_id] = len(pool)
+            pool.append(member_id)
+    setattr(instance, members_attr, b''.join(member_id.bytes for member_id in pool))
+    return [indexes[member_id] for member_id in member_ids]
+
+
+def packed_model_ids_property(members_attr, attr):
+    def get_ids(self):
+        return PackedMemberSet(getattr(self, members_attr) or b'', getattr(self, attr) or b'')
+    return PackedMembersProperty(get_ids, members_attr=members_attr, attr=attr)
+
+def packed_models_property(model, members_attr, attr, count_attr):
     def load_model():
         nonlocal model
         if isinstance(model, str):
@@ -41,18 +167,47 @@ def comma_delimited_models_property(model, attr):
 
     def get_list(self):
         model = load_model()
-        text_value = getattr(self, attr)
-        return model._base_manager.filter(
-            pk__in=[UUID(hex=id) for id in text_value.split(',')] if text_value else []
-        )
+        ids = PackedMemberSet(getattr(self, members_attr) or b'', getattr(self, attr) or b'')
+        return model._base_manager.filter(pk__in=list(ids))
 
     def set_list(self, values):
         model = load_model()
-        values = [
-            value.id if isinstance(value, model) else value
+        member_ids = list(dict.fromkeys(
+            value.pk if isinstance(value, model) else value
             for value in values
-        ]
-        text_value = ','.join(value.hex for value in values)
-        setattr(self, attr, text_value)
+        ))
+
+        bits = 0
+        for index in _add_packed_members(self, members_attr, attr, member_ids):
+            bits |= 1 << index
+        setattr(self, attr, _bitmap_bytes(bits))
+        setattr(self, count_attr, len(member_ids))
+
+    return PackedMembersProperty(get_list, set_list, members_attr=members_attr, attr=attr)
+
+def packed_model_values_property(members_attr, attr):
+    """
+    A mapping of model ids to small non-negative integers, stored as an array of 
+    unsigned shorts aligned with the pool of members.
+    """
+    def get_values(self):
+        members = bytes(getattr(self, members_attr) or b'')
+        values = array('H', bytes(getattr(self, attr) or b''))
+        return {
+            UUID(bytes=members[16 * index:16 * (index + 1)]): value
+            for index, value in enumerate(values)
+            if value != MISSING_PACKED_VALUE
+        }
+
+    def set_values(self, values):
+        values = {
+            member_id: value for member_id, value in values.items() 
+            if value is not None
+        }
+        indexes = _add_packed_members(self, members_attr, attr, list(values.keys()))
+        packed_values = array('H', [MISSING_PACKED_VALUE] * (len(getattr(self, members_attr)) // 16))
+        for index, value in zip(indexes, values.values()):
+            packed_values[index] = value
+        setattr(self, attr, packed_values.tobytes())
 
-    return property(get_list, set_list)
+    return PackedMembersProperty(get_values, set_values, members_attr=members_attr, attr=attr, stores_values=True)
@@ -1,5 +1,6 @@
+import re
 
-import emoji
+from emoji import unicode_codes
 
 from markdown.extensions import Extension
 from markdown.preprocessors import Preprocessor
@@ -10,21 +11,54 @@ class EmojifyExtension(Extension):
 		md.registerExtension(self)
 		md.preprocessors.add('emojify', EmojifyPreprocessor(md), '_end')
 
-REGEXP = emoji.get_emoji_regexp()
+
+def trie_pattern(words):
+	"""
+	A regular expression pattern which matches the longest of the words at a position.
+
+	The words are arranged in a trie, so alternatives share their common prefixes
+	and at most one branch is followed for each character of the input.
+	"""
+	trie = {}
+	for word in words:
+		node = trie
+		for char in word:
+			node = node.setdefault(char, {})
+		node[''] = {}
+
+	def node_pattern(node):
+		branches = [re.escape(char) + node_pattern(child) for char, child in sorted(node.items()) if char]
+		if not branches:
+			return ''
+		pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+		if '' in node:
+			# The word ending at this node is matched if none of the longer words are
+			pattern = '(?:' + pattern + ')?'
+		return pattern
+
+	return node_pattern(trie)
+
+# Matches the longest emoji at a position
+EMOJI_REGEXP = re.compile('(' + trie_pattern(unicode_codes.EMOJI_UNICODE.values()) + ')')
+
+ALIAS_REGEXP = re.compile('(:[a-zA-Z0-9\\+\\-_&.ô’Åéãíç()!#*]+:)')
 
 class EmojifyPreprocessor(Preprocessor):
 	def run(self, lines):
-		return [
-			self.wrap_emotes(emoji.emojize(line, use_aliases=True))
-			for line in lines
-		]
+		return self.emojify('\n'.join(lines)).split('\n')
 
-	def wrap_emotes(self, line):
+	def emojify(self, text):
 		"""
-		Wraps all emoji characters in the line with a <span class="emoji"> element
+		Replaces the emoji aliases in the text (eg. ':smile:') with their emoji,
+		then wraps all emoji characters with a <span class="emoji"> element.
+
+		Both passes are over the whole text, rather than over each line. An alias is 
+		replaced before wrapping, since it may combine with an adjacent emoji 
+		(eg. a skin tone modifier)
 		"""
-		emoji_regexp = emoji.get_emoji_regexp()
-		return emoji_regexp.sub(r'<span class="emoji">\1</span>', line)
+		aliases = unicode_codes.EMOJI_ALIAS_UNICODE
+		text = ALIAS_REGEXP.sub(lambda match: aliases.get(match.group(1), match.group(1)), text)
+		return EMOJI_REGEXP.sub(r'<span class="emoji">\1</span>', text)
 
 def makeExtension(**kwargs):
-	return EmojifyExtension(**kwargs)
\ No newline at end of file
+	return EmojifyExtension(**kwargs)
@@ -0,0 +1,57 @@
+from contextlib import contextmanager
+from functools import lru_cache
+from threading import Lock
+
+from django.conf import settings
+import markdown
+
+
+class MarkdownPool():
+	"""
+	A pool of `markdown.Markdown` instances, configured from `settings.MARKDOWN`.
+
+	Building an instance loads every configured extension, so instances are
+	shared rather than built for each serializer. An instance is only used by one
+	caller at a time, and is reset before it is returned to the pool.
+	"""
+	def __init__(self, **config):
+		self.config = config
+		self._instances = []
+		self._lock = Lock()
+
+	@contextmanager
+	def acquire(self):
+		with self._lock:
+			md = self._instances.pop() if self._instances else None
+		if md is None:
+			md = markdown.Markdown(**self.config)
+		try:
+			yield md
+		finally:
+			md.reset()
+			with self._lock:
+				self._instances.append(md)
+
+	def convert(self, source):
+		with self.acquire() as md:
+			return md.convert(source)
+
+
+_pool = None
+
+def get_pool():
+	global _pool
+	if _pool is None:
+		_pool = MarkdownPool(**settings.MARKDOWN)
+	return _pool
+
+
+@lru_cache(maxsize=getattr(settings, 'MARKDOWN_CACHE_SIZE', 1024))
+def render(source):
+	"""
+	The html for the markdown source.
+
+	Rendering is deterministic, so the html is cached by the source text and the
+	least recently rendered sources are evicted.
+	"""
+	return get_pool().convert(source)
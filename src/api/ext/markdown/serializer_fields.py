@@ -1,13 +1,8 @@
-from django.conf import settings
-import markdown
-
 from rest_framework import serializers
 
+from .render import render
 
-class MarkdownField(serializers.Serializer):
-	def __init__(self, *args, **kwargs):
-		self.markdown = markdown.Markdown(**settings.MARKDOWN)
-		super().__init__(*args, **kwargs)
 
+class MarkdownField(serializers.Serializer):
 	def to_representation(self, value):
-		return self.markdown.convert(value)
\ No newline at end of file
+		return render(value)
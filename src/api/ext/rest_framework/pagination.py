@@ -1,11 +1,161 @@
+import json
 from collections import OrderedDict
 
+from django.core.exceptions import ValidationError
+from django.db import connections, models
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 from rest_framework import pagination
 
 
+class CursorPagination(pagination.BasePagination):
+	"""
+	Pages through a queryset in (created_at, id) order.
+
+	Follows the client's cursor convention: the cursor is the id of the last item 
+	of the previous page (an empty cursor selects the first page), and the next page
+	is selected by seeking past the ordering values of that item, rather than with 
+	an offset. A deep page costs the same as the first.
+
+	The total count is omitted by default. Pass `?count=exact` to count the
+	whole queryset, or `?count=estimate` for an approximate count
+	(see `estimate_count`).
+	"""
+	ordering = ('created_at', 'id')
+	page_size = api_settings.PAGE_SIZE
+
+	cursor_query_param = 'cursor'
+	count_query_param = 'count'
+
+	# One of 'none', 'estimate' or 'exact'
+	count = 'none'
+
+	# The most rows to count for an estimate, if the database does not
+	# provide a planner estimate.
+	max_estimate_count = 1000
+
+	def paginate_queryset(self, queryset, request, view=None):
+		self.request = request
+		self.base_url = request.build_absolute_uri()
+
+		queryset = queryset.order_by(*self.ordering)
+		self.total_count = self.get_count(queryset, request)
+
+		position = self.decode_cursor(request, queryset)
+		if position is not None:
+			queryset = queryset.filter(self.seek_condition(position))
+
+		page = list(queryset[:self.page_size + 1])
+		self.has_next = len(page) > self.page_size
+		self.page = page[:self.page_size]
+		return self.page
+
+	def seek_condition(self, position):
+		"""
+		Selects the rows which are ordered after the position, ie. for ordering
+		(a, b), the rows where a > a0 or (a = a0 and b > b0)
+		"""
+		condition = models.Q()
+		for i, field in enumerate(self.ordering):
+			equal = {name: value for name, value in zip(self.ordering[:i], position)}
+			condition |= models.Q(**equal, **{f'{field}__gt': position[i]})
+		return condition
+
+	def get_count(self, queryset, request):
+		count = request.query_params.get(self.count_query_param, self.count)
+		if count == 'exact':
+			return queryset.count()
+		elif count == 'estimate':
+			return estimate_count(queryset, max_count=self.max_estimate_count)
+		return None
+
+	def encode_cursor(self, instance):
+		return str(instance.pk)
+
+	def decode_cursor(self, request, queryset):
+		"""
+		The ordering values of the item in the request's cursor
+		"""
+		cursor = request.query_params.get(self.cursor_query_param, None)
+		if not cursor:
+			return None
+		model = queryset.model
+		try:
+			pk = model._meta.pk.to_python(cursor)
+		except ValidationError:
+			raise NotFound('Invalid cursor')
+
+		position = model._base_manager.filter(pk=pk).values_list(*self.ordering).first()
+		if position is None:
+			raise NotFound('Invalid cursor')
+		return position
+
+	def get_next_link(self):
+		if not self.has_next:
+			return None
+		return replace_query_param(self.base_url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+	def get_first_link(self):
+		if not self.request.query_params.get(self.cursor_query_param):
+			return None
+		return remove_query_param(self.base_url, self.cursor_query_param)
+
+	def get_paginated_response(self, data):
+		response = OrderedDict()
+		if self.total_count is not None:
+			response['count'] = self.total_count
+		response.update([
+			('next', self.get_next_link()),
+			('first', self.get_first_link()),
+			('results', data)
+		])
+		return Response(response)
+
+
+def estimate_count(queryset, max_count=1000):
+	"""
+	An estimate of the number of rows in the queryset.
+
+	On PostgreSQL this is the query planner's estimate. Otherwise rows are
+	counted up to `max_count`, so the estimate is exact for small querysets and
+	never scans more than `max_count` rows.
+	"""
+	connection = connections[queryset.db]
+	if connection.vendor == 'postgresql':
+		sql, params = queryset.query.sql_with_params()
+		with connection.cursor() as cursor:
+			cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+			plan = cursor.fetchone()[0]
+		if isinstance(plan, str):
+			plan = json.loads(plan)
+		return int(plan[0]['Plan']['Plan Rows'])
+	return queryset[:max_count].count()
+
+
 class PageNumberPagination(pagination.PageNumberPagination):
+	"""
+	Pages through a list or queryset by page number.
+
+	Querysets are paged with a `CursorPagination` instead if the request
+	has `?pagination=cursor`, in which case they are ordered by (created_at, id)
+	rather than by the view's ordering.
+	"""
+	pagination_query_param = 'pagination'
+
+	def paginate_queryset(self, queryset, request, view=None):
+		self.cursor_pagination = None
+		if (isinstance(queryset, models.QuerySet) 
+				and request.query_params.get(self.pagination_query_param) == 'cursor'):
+			self.cursor_pagination = CursorPagination()
+			return self.cursor_pagination.paginate_queryset(queryset, request, view=view)
+		return super().paginate_queryset(queryset, request, view=view)
+
 	def get_paginated_response(self, data):
+		if self.cursor_pagination is not None:
+			return self.cursor_pagination.get_paginated_response(data)
+
 		return Response(OrderedDict([
 			('count', self.page.paginator.count),
 			('page_number', self.page.number),
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class SubjectsConfig(AppConfig):
     name = 'subjects'
+
+    def ready(self):
+        from . import signals
@@ -1,10 +1,12 @@
+from collections import defaultdict
 from functools import reduce
+from types import MappingProxyType
 
 from django.utils.translation import gettext_lazy as _
 from django.db import models
 from django.core.exceptions import ObjectDoesNotExist
 
-from treebeard.mp_tree import MP_Node
+from treebeard.mp_tree import MP_Node, MP_NodeManager
 
 from ext.django.db.models import BaseModel
 from base.models import model_typename
@@ -41,123 +43,147 @@ class SubjectNode(MP_Node):
     id = models.UUIDField(primary_key=True)
     node_type = SubjectNodeTypeField()
 
-    @classmethod
-    def add_subject(cls, subject):
-        subject_node = cls.add_root(id=subject.id, node_type=SubjectNodeType.SUBJECT)
-        for unit in subject.unit_set.all():    
-            unit_node = cls._add_unit_to_subject(subject_node, unit)
-        return subject_node
+    class Manager(MP_NodeManager):
+        """
+        The subject tree changes only when a curriculum is imported, so the 
+        whole tree is indexed once per process and ancestry and type lookups 
+        are served from memory (see `SubjectTree`).
 
-    @classmethod
-    def _add_unit_to_subject(cls, subject_node, unit):
-        unit_node = subject_node.add_child(id=unit.id, node_type=SubjectNodeType.UNIT)
-        for block in unit_node.unit().block_set.all():
-            block_node = cls._add_block_to_unit(unit_node, block)
-        return unit_node
+        The index is cleared whenever a subject node or one of the models
+        linked to a subject node is saved or deleted (see `subjects.signals`).
+        """
+        def __init__(self):
+            super().__init__()
+            self._tree = None
 
-    @classmethod
-    def _add_block_to_unit(cls, unit_node, block):
-        block_node = unit_node.add_child(id=block.id, node_type=SubjectNodeType.BLOCK)
-        for lesson in block_node.block().lesson_set.all():
-            lesson_node = cls._add_lesson_to_block(block_node, lesson)
-        return block_node
+        def tree(self):
+            if self._tree is None:
+                self._tree = SubjectTree(self.order_by('path'))
+            return self._tree
 
-    @classmethod
-    def _add_lesson_to_block(cls, block_node, lesson):
-        lesson_node = block_node.add_child(id=lesson.id, node_type=SubjectNodeType.LESSON)
-        for lessonoutcome in lesson_node.lesson().lessonoutcome_set.all():
-            lessonoutcome_node = cls._add_lessonoutcome_to_lesson(lesson_node, lessonoutcome)
-        return lesson_node
+        def clear_tree(self):
+            self._tree = None
+
+    objects = Manager()
 
     @classmethod
-    def _add_lessonoutcome_to_lesson(cls, lesson_node, lessonoutcome):
-        return lesson_node.add_child(id=lessonoutcome.id, node_type=SubjectNodeType.LESSON_OUTCOME)
+    def add_subject(cls, subject):
+        """
+        Adds a root node for the subject, along with a node for every unit, block, 
+        lesson and lesson outcome of the subject.
 
-    def subject(self):
-        if self.node_type == 'subject':
-            return Subject.objects.get(pk=self.id)
-        elif self.node_type in ['unit', 'block', 'lesson', 'lesson-outcome']:
-            return self.get_ancestors().filter(node_type='subject').get().subject()
+        The materialized paths of the nodes are computed in memory and every node 
+        is inserted with a single bulk insert.
+        """
+        children = defaultdict(list)
+        for unit in Unit._base_manager.filter(subject_id=subject.id).only('id', 'subject_id'):
+            children[unit.subject_id].append((unit.id, SubjectNodeType.UNIT))
+        for block in Block._base_manager.filter(unit__subject_id=subject.id).only('id', 'unit_id'):
+            children[block.unit_id].append((block.id, SubjectNodeType.BLOCK))
+        for lesson in Lesson._base_manager.filter(block__unit__subject_id=subject.id).only('id', 'block_id'):
+            children[lesson.block_id].append((lesson.id, SubjectNodeType.LESSON))
+        for lessonoutcome in (LessonOutcome._base_manager
+                .filter(lesson__block__unit__subject_id=subject.id)
+                .only('id', 'lesson_id')):
+            children[lessonoutcome.lesson_id].append((lessonoutcome.id, SubjectNodeType.LESSON_OUTCOME))
+
+        last_root = cls.get_last_root_node()
+        if last_root is None:
+            root_path = cls._get_path(None, 1, 1)
         else:
+            root_path = last_root._inc_path()
+
+        nodes = []
+        def add_node(node_id, node_type, path, depth):
+            node_children = children.get(node_id, [])
+            node = cls(
+                id=node_id, 
+                node_type=node_type, 
+                path=path, 
+                depth=depth, 
+                numchild=len(node_children)
+            )
+            nodes.append(node)
+            for i, (child_id, child_type) in enumerate(node_children, start=1):
+                add_node(child_id, child_type, cls._get_path(path, depth + 1, i), depth + 1)
+            return node
+
+        subject_node = add_node(subject.id, SubjectNodeType.SUBJECT, root_path, 1)
+        cls.objects.bulk_create(nodes)
+        # Bulk inserts do not send post_save
+        cls.objects.clear_tree()
+        return subject_node
+
+    def move(self, target, pos=None):
+        super().move(target, pos=pos)
+        SubjectNode.objects.clear_tree()
+
+    def _linked_ancestor(self, node_type):
+        tree = SubjectNode.objects.tree()
+        ancestor_id = tree.ancestor_id(self.id, node_type)
+        if ancestor_id is None:
             return None
+        return tree.linked_model(ancestor_id)
+
+    def subject(self):
+        return self._linked_ancestor(SubjectNodeType.SUBJECT)
 
     def unit(self):
-        if self.node_type == 'unit':
-            return Unit.objects.get(pk=self.id)
-        elif self.node_type in ['block', 'lesson', 'lesson-outcome']:
-            return self.get_ancestors().get(node_type='unit').unit()
-        else:
-            return None
+        return self._linked_ancestor(SubjectNodeType.UNIT)
 
     def block(self):
-        if self.node_type == 'block':
-            return Block.objects.get(pk=self.id)
-        elif self.node_type in ['lesson', 'lesson-outcome']:
-            return self.get_ancestors().filter(node_type='block').get().block()
-        else:
-            return None
+        return self._linked_ancestor(SubjectNodeType.BLOCK)
 
     def lesson(self):
-        if self.node_type == 'lesson':
-            return Lesson.objects.get(pk=self.id)
-        elif self.node_type in ['lesson-outcome']:
-            return self.get_ancestors().filter(node_type='lesson').get().lesson()
-        else:
-            return None
+        return self._linked_ancestor(SubjectNodeType.LESSON)
 
     def lessonoutcome(self):
-        if self.node_type == 'lesson-outcome':
-            return LessonOutcome.objects.get(pk=self.id)
-        else:
-            return None
+        return self._linked_ancestor(SubjectNodeType.LESSON_OUTCOME)
 
     def get_descendants_of_type(self, subject_node_type):
-        if subject_node_type == self.node_type:
-            return SubjectNode.objects.filter(pk__in=[self.id])
-
-        return (
-            self.get_descendants()
-            .filter(node_type=subject_node_type)
-        )
+        """
+        The nodes of the given type which are either this node or one of its descendants,
+        in tree order
+        """
+        tree = SubjectNode.objects.tree()
+        return [
+            tree.get_node(node_id) 
+            for node_id in tree.descendant_ids(self.id, subject_node_type)
+        ]
 
 
     class LinkedManager(models.Manager):
         """
-        Manage a model connected to a subject node
+        Manage a model connected to a subject node.
+
+        A linked model shares its id with its subject node, so the node is 
+        resolved from the subject tree index rather than joined in the query.
         """
         @property
         def node_type(self):
             return model_typename(self.model)
 
-        def get_queryset(self):
-            nodes = SubjectNode.objects.filter(
-                node_type=self.node_type,
-                id=models.OuterRef('id')
-            )
-
-            return (
-                super()
-                .get_queryset()
-                .annotate(node_id=models.Subquery(nodes.values('id')[:1]))
-            )
-
-        def get_node(subject_node):    
+        def get_node(self, subject_node):    
             return self.get(id=subject_node.id)
 
     class LinkedModel(BaseModel):
         class Meta:
             abstract = True
 
+        @property
+        def node_id(self):
+            return self.id
+
         @property
         def node(self):
             if not hasattr(self, '_node'):
-                self._node = SubjectNode.objects.get(pk=self.id)
+                self._node = SubjectNode.objects.tree().get_node(self.id)
             return self._node
 
         @property
         def subject(self):
             if not hasattr(self, '_subject'):
-                self._subject = Subject.objects.get(id=self.node.get_root().id)
+                self._subject = self.node.subject()
             return self._subject
 
 
@@ -188,7 +214,7 @@ class Lesson(SubjectNode.LinkedModel):
 
     @property
     def example_descriptions(self):
-        return [example.description for example in self.lessonexample_set.only('description').all()]
+        return [example.description for example in self.lessonexample_set.all()]
 
 class LessonExample(SubjectNode.LinkedModel):
     lesson = models.ForeignKey(Lesson, on_delete=models.CASCADE)
@@ -202,6 +228,119 @@ class LessonOutcome(SubjectNode.LinkedModel):
 
 ALL_SUBJECT_NODE_CLASSES = (Subject, Unit, Block, Lesson, LessonOutcome)
 
+SUBJECT_NODE_CLASSES_BY_TYPE = {
+    SubjectNodeType.SUBJECT: Subject,
+    SubjectNodeType.UNIT: Unit,
+    SubjectNodeType.BLOCK: Block,
+    SubjectNodeType.LESSON: Lesson,
+    SubjectNodeType.LESSON_OUTCOME: LessonOutcome
+}
+
+
+class SubjectTree:
+    """
+    An immutable index of every node in the subject tree, built from the 
+    materialized paths of the nodes in a single query.
+
+    Maps each node id to its node, its parent, its nearest ancestor of each 
+    node type and its descendants of each node type. The models linked to 
+    the nodes (`Subject`, `Unit`, etc.) are loaded on first use, with one query 
+    for each node type.
+    """
+    def __init__(self, nodes):
+        steplen = SubjectNode.steplen
+
+        node_ids_by_path = {}
+        self._nodes = {}
+        self._parent_ids = {}
+        self._ancestor_ids = {}
+        self._descendant_ids = {}
+
+        # Nodes are ordered by path, so every parent is indexed before its children.
+        for node in nodes:
+            parent_id = node_ids_by_path.get(node.path[:-steplen])
+            node_ids_by_path[node.path] = node.id
+
+            ancestor_ids = dict(self._ancestor_ids[parent_id]) if parent_id else {}
+            ancestor_ids[node.node_type] = node.id
+
+            self._nodes[node.id] = node
+            self._parent_ids[node.id] = parent_id
+            self._ancestor_ids[node.id] = MappingProxyType(ancestor_ids)
+            self._descendant_ids[node.id] = {}
+
+            for ancestor_id in ancestor_ids.values():
+                descendants = self._descendant_ids[ancestor_id]
+                descendants.setdefault(node.node_type, []).append(node.id)
+
+        self._descendant_ids = {
+            node_id: MappingProxyType({
+                node_type: tuple(descendant_ids)
+                for node_type, descendant_ids in descendants.items()
+            })
+            for node_id, descendants in self._descendant_ids.items()
+        }
+        self._linked_models = {}
+
+    def __contains__(self, node_id):
+        return node_id in self._nodes
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def _tree_with_node(self, node_id):
+        """
+        This tree, if it contains the node. Otherwise the node may have been added 
+        since the tree was built (possibly by another process), so the tree is 
+        rebuilt once before the node is reported missing.
+        """
+        if node_id in self._nodes:
+            return self
+        SubjectNode.objects.clear_tree()
+        tree = SubjectNode.objects.tree()
+        if node_id not in tree._nodes:
+            raise SubjectNode.DoesNotExist(f'No subject node with id {node_id}')
+        return tree
+
+    def get_node(self, node_id):
+        return self._tree_with_node(node_id)._nodes[node_id]
+
+    def node_type(self, node_id):
+        return self.get_node(node_id).node_type
+
+    def parent_id(self, node_id):
+        return self._tree_with_node(node_id)._parent_ids[node_id]
+
+    def ancestor_id(self, node_id, node_type):
+        """
+        The id of the node of the given type which is either the node or one of 
+        its ancestors, or `None` if there is no such node.
+        """
+        return self._tree_with_node(node_id)._ancestor_ids[node_id].get(node_type)
+
+    def descendant_ids(self, node_id, node_type):
+        """
+        The ids of the nodes of the given type which are either the node or one 
+        of its descendants, in tree order.
+        """
+        return self._tree_with_node(node_id)._descendant_ids[node_id].get(node_type, ())
+
+    def linked_model(self, node_id):
+        tree = self._tree_with_node(node_id)
+        if tree is not self:
+            return tree.linked_model(node_id)
+
+        node_type = self.node_type(node_id)
+        if node_type not in self._linked_models:
+            model = SUBJECT_NODE_CLASSES_BY_TYPE[node_type]
+            self._linked_models[node_type] = model._base_manager.in_bulk()
+        try:
+            return self._linked_models[node_type][node_id]
+        except KeyError:
+            raise SUBJECT_NODE_CLASSES_BY_TYPE[node_type].DoesNotExist(
+                f'No {node_type} linked to subject node {node_id}'
+            )
+
 def subject_node_is_ancestor_model(node_cls, test_parent):
     return (node_cls == test_parent
             or subject_node_is_strict_ancestor_model(node_cls, test_parent))
@@ -74,3 +74,14 @@ class SubjectSerializer(BaseSerializer):
 		model = Subject
 		model_name = 'subject'
 		fields = BaseSerializer.Meta.fields + ('name', 'units')
+
+
+def prefetch_subject_tree(subject_set):
+	"""
+	Loads every node below the subjects, with a single query for each level of the tree
+	"""
+	lesson_set = 'unit_set__block_set__lesson_set'
+	return subject_set.prefetch_related(
+		f'{lesson_set}__lessonoutcome_set',
+		f'{lesson_set}__lessonexample_set'
+	)
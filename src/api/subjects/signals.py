@@ -0,0 +1,15 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import SubjectNode, Subject, Unit, Block, Lesson, LessonExample, LessonOutcome
+
+
+@receiver([post_save, post_delete], sender=SubjectNode)
+@receiver([post_save, post_delete], sender=Subject)
+@receiver([post_save, post_delete], sender=Unit)
+@receiver([post_save, post_delete], sender=Block)
+@receiver([post_save, post_delete], sender=Lesson)
+@receiver([post_save, post_delete], sender=LessonExample)
+@receiver([post_save, post_delete], sender=LessonOutcome)
+def clear_subject_tree(sender, **kwargs):
+    SubjectNode.objects.clear_tree()
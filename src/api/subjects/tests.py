@@ -1,3 +1,71 @@
+from uuid import uuid4
+
 from django.test import TestCase
 
-# Create your tests here.
+from rest_framework.test import APIClient
+
+from users.models import User
+
+from .models import Subject, SubjectNode, SubjectNodeType, Unit
+
+
+class SubjectTreeTest(TestCase):
+    def setUp(self):
+        SubjectNode.objects.clear_tree()
+
+    def test_tree_matches_the_stored_paths(self):
+        tree = SubjectNode.objects.tree()
+        unit_node = SubjectNode.objects.filter(node_type=SubjectNodeType.UNIT).order_by('path').first()
+        subject_node = unit_node.get_parent()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(tree.get_node(unit_node.id), unit_node)
+            self.assertEqual(tree.parent_id(unit_node.id), subject_node.id)
+            self.assertEqual(tree.ancestor_id(unit_node.id, SubjectNodeType.SUBJECT), subject_node.id)
+            lesson_ids = tree.descendant_ids(unit_node.id, SubjectNodeType.LESSON)
+
+        self.assertEqual(
+            list(lesson_ids),
+            list(unit_node.get_descendants()
+                .filter(node_type=SubjectNodeType.LESSON)
+                .values_list('id', flat=True))
+        )
+
+    def test_tree_is_rebuilt_for_a_missing_node(self):
+        tree = SubjectNode.objects.tree()
+        subject = Subject.objects.create(id=uuid4(), name='Test subject')
+        subject_node = SubjectNode.add_root(id=subject.id, node_type=SubjectNodeType.SUBJECT)
+
+        self.assertEqual(tree.get_node(subject_node.id), subject_node)
+        with self.assertRaises(SubjectNode.DoesNotExist):
+            tree.get_node(uuid4())
+
+    def test_add_subject(self):
+        subject = Subject.objects.create(id=uuid4(), name='Test subject')
+        units = [Unit.objects.create(id=uuid4(), subject=subject, name=f'Unit {i}') for i in range(3)]
+
+        subject_node = SubjectNode.add_subject(subject)
+
+        self.assertEqual(subject_node.numchild, len(units))
+        self.assertEqual(
+            [node.id for node in subject_node.get_children()],
+            [unit.id for unit in units]
+        )
+        self.assertEqual(SubjectNode.find_problems(), ([], [], [], [], []))
+        self.assertEqual(subject.node, SubjectNode.objects.get(pk=subject.id))
+        self.assertEqual(units[0].node_id, units[0].id)
+
+
+class SubjectViewSetTest(TestCase):
+    def setUp(self):
+        SubjectNode.objects.clear_tree()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.first())
+
+    def test_unchanged_subjects_are_not_modified(self):
+        for url in ('/api/subjects/', f'/api/subjects/{Subject.objects.first().id}/'):
+            response = self.client.get(url, HTTP_ACCEPT='application/json')
+            self.assertEqual(response.status_code, 200)
+
+            response = self.client.get(url, HTTP_ACCEPT='application/json', HTTP_IF_NONE_MATCH=response['ETag'])
+            self.assertEqual(response.status_code, 304, url)
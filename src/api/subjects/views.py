@@ -1,11 +1,65 @@
+import json
 
+from collections import OrderedDict
+from hashlib import md5
+from uuid import UUID
+
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 from rest_framework import viewsets
 from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from .models import Subject, SubjectNode
+from .serializers import SubjectSerializer, prefetch_subject_tree
+
+
+_subject_representations = {'tree': None, 'representations': None}
+
+def subject_representations():
+	"""
+	The representation and etag of every subject, in order of name.
+
+	The whole curriculum is loaded with one query for each level of the subject tree
+	and the representations are kept for as long as the subject tree index is valid
+	(see `SubjectNode.Manager`). 
+	"""
+	tree = SubjectNode.objects.tree()
+	if _subject_representations['tree'] is not tree:
+		representations = OrderedDict()
+		for subject in prefetch_subject_tree(Subject.objects.order_by('-name')):
+			data = SubjectSerializer(subject).data
+			content = json.dumps(data, cls=JSONEncoder).encode('utf-8')
+			representations[subject.id] = (data, md5(content).hexdigest())
+
+		_subject_representations.update(tree=tree, representations=representations)
+	return _subject_representations['representations']
 
-from .models import Subject
-from .serializers import SubjectSerializer
 
 class SubjectViewSet(viewsets.ReadOnlyModelViewSet):
 	queryset = Subject.objects.order_by('-name').all()
 	serializer_class = SubjectSerializer
 
+	def conditional_response(self, response, etag):
+		etag = quote_etag(etag)
+		response['ETag'] = etag
+		return get_conditional_response(self.request, etag=etag, response=response)
+
+	def list(self, request):
+		page = self.paginate_queryset(list(subject_representations().values()))
+
+		page_etag = md5(
+			':'.join([request.get_full_path()] + [etag for _, etag in page]).encode('utf-8')
+		).hexdigest()
+		response = self.get_paginated_response([data for data, _ in page])
+		return self.conditional_response(response, page_etag)
+
+	def retrieve(self, request, pk=None):
+		try:
+			data, etag = subject_representations()[UUID(pk)]
+		except (KeyError, ValueError):
+			raise Http404(f'No subject with id {pk}')
+
+		return self.conditional_response(Response(data), etag)
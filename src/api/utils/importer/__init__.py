@@ -2,6 +2,7 @@
 from . import schools
 from . import subjects
 from . import assessments
+from . import pipeline
 
 _apps = None
 
@@ -1,22 +1,127 @@
 import openpyxl
 
 from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from functools import reduce
 
 _workbook = None
+_sheet_rows = {}
+_sheet_indexes = {}
+
+# The columns of each worksheet which are read by the importers.
+#
+# The worksheets are parsed concurrently and only these columns are sent back 
+# from the workers, so any column read via `col_index` must be listed here.
+SHEET_COLUMNS = {
+	'StudentData': 		'ABCDFIJM',
+	'Lessons': 			'ACDEFGIJK',
+	'Ican': 			'ACJ',
+	'UnitAssessFeedback': 'ABNOPQ',
+	'UnitAssessData': 	'AD',
+	'MiniAssessResults': 'ABFHIJK',
+	'MiniAssessData': 	'ACF',
+	'PreLearn': 		'ACKL',
+	'SelfAsses': 		'ABKL',
+}
 
 def get_workbook():
 	global _workbook
 	if _workbook is None:
 		workbook_file = getattr(settings, 'SOURCE_WORKBOOK', None)
 		if workbook_file is None:
-			raise Error('Invalid settings. A value for SOURCE_WORKBOOK must be configured')	
+			raise ImproperlyConfigured('Invalid settings. A value for SOURCE_WORKBOOK must be configured')	
 
 		_workbook = openpyxl.load_workbook(workbook_file, read_only=True, data_only=True)
 
 	return _workbook
 
+def _read_sheet_rows(workbook_file, sheet_name, col_letters):
+	"""
+	Reads the values of the given columns of every row of the worksheet.
+
+	Rows are returned as tuples which are only as wide as the last of the 
+	columns, with `None` in the place of the columns which are not read,
+	so that rows can still be indexed with `col_index`.
+	"""
+	workbook = openpyxl.load_workbook(workbook_file, read_only=True, data_only=True)
+	try:
+		cols = sorted(col_index(letter) for letter in col_letters)
+		width = cols[-1] + 1
+		return [
+			tuple(
+				row[i] if i in cols and i < len(row) else None
+				for i in range(width)
+			)
+			for row in workbook[sheet_name].iter_rows(max_col=width, values_only=True)
+		]
+	finally:
+		workbook.close()
+
+def load_sheets(sheet_names=None, max_workers=None):
+	"""
+	Parses the named worksheets (by default every worksheet in `SHEET_COLUMNS`)
+	concurrently, one worksheet per worker process.
+	"""
+	if sheet_names is None:
+		sheet_names = SHEET_COLUMNS.keys()
+	sheet_names = [name for name in sheet_names if name not in _sheet_rows]
+	if not sheet_names:
+		return
+
+	workbook_file = getattr(settings, 'SOURCE_WORKBOOK', None)
+	if workbook_file is None:
+		raise ImproperlyConfigured('Invalid settings. A value for SOURCE_WORKBOOK must be configured')	
+
+	with ProcessPoolExecutor(max_workers=max_workers) as executor:
+		futures = {
+			name: executor.submit(_read_sheet_rows, workbook_file, name, SHEET_COLUMNS[name]) 
+			for name in sheet_names
+		}
+		for name, future in futures.items():
+			_sheet_rows[name] = future.result()
+
+def get_sheet_rows(sheet_name):
+	"""
+	The cell values of every row of the named worksheet.
+
+	Each worksheet is read from the (read only) workbook in a single pass
+	and the rows are kept, rather than re-reading the worksheet every time it
+	is scanned. The first time any of the worksheets in `SHEET_COLUMNS` is 
+	needed, all of them are parsed at once (see `load_sheets`).
+	"""
+	if sheet_name not in _sheet_rows:
+		if sheet_name in SHEET_COLUMNS:
+			load_sheets()
+		else:
+			worksheet = get_workbook()[sheet_name]
+			_sheet_rows[sheet_name] = list(worksheet.iter_rows(values_only=True))
+	return _sheet_rows[sheet_name]
+
+def get_sheet_index(sheet_name, *key_col_letters):
+	"""
+	The rows of the named worksheet, grouped by the values in the key columns.
+
+	If a single key column is given, rows are keyed by the value of the column,
+	otherwise by a tuple of the values of each of the columns.
+
+	eg. get_sheet_index('UnitAssessFeedback', 'B', 'A')[(unit_key, student_key)]
+	"""
+	index_key = (sheet_name,) + key_col_letters
+	if index_key not in _sheet_indexes:
+		key_cols = [col_index(letter) for letter in key_col_letters]
+
+		index = defaultdict(list)
+		for row in get_sheet_rows(sheet_name):
+			if len(key_cols) == 1:
+				index[row[key_cols[0]]].append(row)
+			else:
+				index[tuple(row[col] for col in key_cols)].append(row)
+		_sheet_indexes[index_key] = dict(index)
+	return _sheet_indexes[index_key]
+
 def col_index(col_letter):
 	all_letters = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
 	if len(col_letter) == 1:
@@ -4,46 +4,55 @@ from collections import OrderedDict
 
 from django.core.exceptions import ObjectDoesNotExist
 
-from ._excel import get_workbook, col_index
+from ._excel import get_sheet_index, col_index
 
 from .subjects import Subject
 from .schools import Student
 
+def load_db_attempts(attempt_model, db_assessments):
+    """
+    The existing attempts at the assessments, by (assessment id, attempt number), in a single query
+    """
+    if attempt_model is None or not db_assessments:
+        return {}
+    return {
+        (db_attempt.assessment_id, db_attempt.attempt_number): db_attempt
+        for db_attempt in attempt_model._base_manager.filter(
+            assessment_id__in=[db_assessment.id for db_assessment in db_assessments]
+        )
+    }
+
+
 class UnitAssessment():
 
     @classmethod
-    def all_for_unit(cls, unit, student_model=None, assessment_model=None):
-        all_students = Student.all(student_model=student_model)
+    def all_for_unit(cls, unit, student_model=None, assessment_model=None, attempt_model=None, students=None):
+        all_students = students if students is not None else Student.all(student_model=student_model)
 
-        ws = get_workbook()['UnitAssessFeedback']
-        student_key_col = col_index('A')
-        unit_key_col = col_index('B')
-
-        unit_rows = [
-            row for row in ws
-            if row[unit_key_col].value == unit.key
-        ]
+        unit_student_rows = get_sheet_index('UnitAssessFeedback', 'B', 'A')
 
         def student_rows(student):
-            return [
-                row for row in unit_rows
-                if row[student_key_col].value == student.row_key
-            ]
+            return unit_student_rows.get((unit.key, student.row_key), [])
 
-        def unit_assessment_for_student(student):
-            try:
-                return assessment_model and assessment_model.unit_assessments.get(student_id=student.id, subject_node_id=unit.id)
-            except assessment_model.DoesNotExist:
-                pass
+        # The existing assessments at the unit, by student, in a single query
+        db_unit_assessments = {}
+        if assessment_model is not None:
+            db_unit_assessments = {
+                db_assessment.student_id: db_assessment
+                for db_assessment in assessment_model.unit_assessments.filter(subject_node_id=unit.id)
+            }
+        db_attempts = load_db_attempts(attempt_model, db_unit_assessments.values())
 
         return [
-            cls(student, unit , student_rows(student), db_unit_assessment=unit_assessment_for_student(student))
+            cls(student, unit , student_rows(student), 
+                db_unit_assessment=db_unit_assessments.get(student.id), db_attempts=db_attempts)
             for student in all_students
         ]
 
-    def __init__(self, student, unit, rows, db_unit_assessment=None):
+    def __init__(self, student, unit, rows, db_unit_assessment=None, db_attempts=None):
         self.id = db_unit_assessment.id if db_unit_assessment else uuid4()
         self.db_unit_assessment = db_unit_assessment
+        self.db_attempts = db_attempts or {}
 
         self.student = student
 
@@ -52,20 +61,16 @@ class UnitAssessment():
 
     @classmethod
     def assessment_data_row(cls, unit):
-        ws = get_workbook()['UnitAssessData']
-
-        unit_key_col = col_index('A')
-        is_unit_assessment_row = lambda row: row[unit_key_col].value == unit.key
-        return [row for row in ws if is_unit_assessment_row(row)][0]
+        return get_sheet_index('UnitAssessData', 'A')[unit.key][0]
 
     @classmethod
     def max_available_mark(cls, unit):
-        return cls.assessment_data_row(unit)[col_index('D')].value
+        return cls.assessment_data_row(unit)[col_index('D')]
 
 
     @property
     def comment(self):
-        return self.rows and self.rows[0][col_index('Q')].value
+        return self.rows and self.rows[0][col_index('Q')]
 
     @property
     def has_attempts(self):
@@ -74,14 +79,11 @@ class UnitAssessment():
     @property
     def attempts(self):
         if not hasattr(self, '_attempts'):
-            def db_attempt_for_row(row):
-                try:
-                    return self.db_unit_assessment and self.db_unit_assessment.attempt_set.get(attempt_number=1)
-                except ObjectDoesNotExist:
-                    return None
+            # Unit assessments are only attempted once
+            db_attempt = self.db_attempts.get((self.id, 1))
 
             self._attempts = [
-                UnitAssessmentAttempt(self, row, db_attempt=db_attempt_for_row(row))
+                UnitAssessmentAttempt(self, row, db_attempt=db_attempt)
                 for row in self.rows
             ]
         return self._attempts
@@ -97,48 +99,46 @@ class UnitAssessmentAttempt():
 
     @property
     def date(self):
-        return self.unit_assess_feedback_row[col_index('P')].value
+        return self.unit_assess_feedback_row[col_index('P')]
 
     @property
     def raw_mark(self):
-        return self.unit_assess_feedback_row[col_index('N')].value
+        return self.unit_assess_feedback_row[col_index('N')]
 
     @property
     def mark_percent(self):
-        return self.unit_assess_feedback_row[col_index('O')].value
+        return self.unit_assess_feedback_row[col_index('O')]
 
 class BlockAssessment():
 
     @classmethod
-    def all_for_block(cls, block, student_model=None, block_assessment_model=None):
-        all_students = Student.all(student_model=student_model)
-
-        ws = get_workbook()['MiniAssessResults']
-        student_key_col = col_index('A')
-        block_key_col = col_index('B')
+    def all_for_block(cls, block, student_model=None, block_assessment_model=None, attempt_model=None, students=None):
+        all_students = students if students is not None else Student.all(student_model=student_model)
 
-        block_rows = [
-            row for row in ws
-            if row[block_key_col].value == block.block_key
-        ]
+        block_student_rows = get_sheet_index('MiniAssessResults', 'B', 'A')
 
         def student_attempt_rows(student):
-            return [
-                row for row in block_rows
-                if row[student_key_col].value == student.row_key
-            ]
+            return block_student_rows.get((block.block_key, student.row_key), [])
 
-        def block_assessment_for_student(student):
-            return block_assessment_model and block_assessment_model.get(student_id=student.id, block_id=block.id)
+        # The existing assessments at the block, by student, in a single query
+        db_block_assessments = {}
+        if block_assessment_model is not None:
+            db_block_assessments = {
+                db_assessment.student_id: db_assessment
+                for db_assessment in block_assessment_model._base_manager.filter(subject_node_id=block.id)
+            }
+        db_attempts = load_db_attempts(attempt_model, db_block_assessments.values())
 
         return [
-            cls(student, block, student_attempt_rows(student), db_block_assessment=block_assessment_for_student(student)) 
+            cls(student, block, student_attempt_rows(student), 
+                db_block_assessment=db_block_assessments.get(student.id), db_attempts=db_attempts) 
             for student in all_students
         ]   
 
-    def __init__(self, student, block, attempt_rows, db_block_assessment=None):
+    def __init__(self, student, block, attempt_rows, db_block_assessment=None, db_attempts=None):
         self.id = db_block_assessment.id if db_block_assessment else uuid4()
         self.db_block_assessment = db_block_assessment
+        self.db_attempts = db_attempts or {}
 
         self.student = student 
         self.block = block
@@ -146,33 +146,18 @@ class BlockAssessment():
 
     @classmethod
     def assessment_data_row(cls, block):
-        ws = get_workbook()['MiniAssessData']
-
-        unit_key_col = col_index('C')
-        block_key_col = col_index('A')
-
-        is_block_assessment_row = lambda row: (
-            row[unit_key_col].value == block.unit.key
-            and row[block_key_col].value == block.block_key
-        )
-        return [row for row in ws if is_block_assessment_row(row)][0]
+        return get_sheet_index('MiniAssessData', 'C', 'A')[(block.unit.key, block.block_key)][0]
 
     @classmethod
     def max_available_mark(cls, block):
-        return cls.assessment_data_row(block)[col_index('F')].value
+        return cls.assessment_data_row(block)[col_index('F')]
 
     @property
     def attempts(self):
         if not hasattr(self, '_attempts'):
-            try:
-                db_attempt = self.db_block_assessment and self.db_block_assessment.attempt_set.get(
-                    attempt_number=row[col_index('I')].value
-                )
-            except ObjectDoesNotExist:
-                db_attempt = None
-
+            attempt_number_col = col_index('I')
             self._attempts = [
-                BlockAssessmentAttempt(self, row, db_attempt=db_attempt)
+                BlockAssessmentAttempt(self, row, db_attempt=self.db_attempts.get((self.id, row[attempt_number_col])))
                 for row in self.attempt_rows
             ]
         return self._attempts
@@ -189,43 +174,43 @@ class BlockAssessmentAttempt():
 
     @property
     def attempt_number(self):
-        return self.mini_assessments_row[col_index('I')].value
+        return self.mini_assessments_row[col_index('I')]
 
     @property
     def date(self):
-        return self.mini_assessments_row[col_index('H')].value.date()
+        return self.mini_assessments_row[col_index('H')].date()
 
     @property
     def raw_mark(self):
-        return self.mini_assessments_row[col_index('J')].value
+        return self.mini_assessments_row[col_index('J')]
 
     @property
     def mark_percent(self):
-        return self.mini_assessments_row[col_index('K')].value
+        return self.mini_assessments_row[col_index('K')]
 
 class LessonPrelearningAssessment():
     @classmethod
-    def all_for_lesson(cls, lesson, student_model=None, lesson_prelearning_assessment_model=None):
-        all_students = Student.all(student_model=student_model)
+    def all_for_lesson(cls, lesson, student_model=None, lesson_prelearning_assessment_model=None, students=None):
+        all_students = students if students is not None else Student.all(student_model=student_model)
 
-        ws = get_workbook()['PreLearn']
-        lesson_key_col = col_index('C')
+        lesson_student_rows = get_sheet_index('PreLearn', 'C', 'A')
 
-        lesson_rows = [row for row in ws if row[lesson_key_col].value == lesson.lessons_row_key]
-
-
-        def prelearning_assessment_for_student(student):
-            return lesson_prelearning_assessment_model and lesson_prelearning_assessment_model.objects.get(
-                student_id=student.id,
-                lesson_id=lesson.id
-            )
 
+        # The existing prelearning assessments at the lesson, by student, in a single query
+        db_prelearning_assessments = {}
+        if lesson_prelearning_assessment_model is not None:
+            db_prelearning_assessments = {
+                db_assessment.student_id: db_assessment
+                for db_assessment in lesson_prelearning_assessment_model._base_manager.filter(
+                    subject_node_id=lesson.id
+                )
+            }
         all_prelearning_assessments = (
             cls(
                 lesson, 
                 student, 
-                lesson_rows,
-                db_lesson_prelearning_assessment=prelearning_assessment_for_student(student)
+                lesson_student_rows.get((lesson.lessons_row_key, student.row_key), []),
+                db_lesson_prelearning_assessment=db_prelearning_assessments.get(student.id)
             )
             for student in all_students
         )
@@ -247,10 +232,8 @@ class LessonPrelearningAssessment():
     @property
     def prelearn_worksheet_rows(self):
         if not hasattr(self, '_prelearn_worksheet_rows'):
-            ws = get_workbook()['PreLearn']
-
             student_key_col = col_index('A')
-            is_student_row = lambda row: row[student_key_col].value == self.student.row_key
+            is_student_row = lambda row: row[student_key_col] == self.student.row_key
 
             self._prelearn_worksheet_rows = [
                 row for row in self.prelearn_worksheet_lesson_rows if is_student_row(row)
@@ -269,43 +252,42 @@ class LessonPrelearningAssessment():
 
     @property       
     def date(self):
-        return self.prelearn_worksheet_row[col_index('K')].value
+        return self.prelearn_worksheet_row[col_index('K')]
 
     @property
     def rating(self):
-        return self.prelearn_worksheet_row[col_index('L')].value
+        return self.prelearn_worksheet_row[col_index('L')]
 
 
 class LessonOutcomeSelfAssessment():
     @classmethod
-    def all_for_lesson_outcome(cls, lesson_outcome, student_model=None, lesson_outcome_self_assessment_model=None):
-        def lesson_outcome_self_assessment_for_student(student):
-            return (
-                lesson_outcome_self_assessment_model and 
-                lesson_outcome_self_assessment_model.objects.get(
-                    student_id=student.id,
-                    lesson_id=lesson.id
+    def all_for_lesson_outcome(cls, lesson_outcome, student_model=None, lesson_outcome_self_assessment_model=None, students=None):
+        # The existing self assessments at the lesson outcome, by student, in a single query
+        db_self_assessments = {}
+        if lesson_outcome_self_assessment_model is not None:
+            db_self_assessments = {
+                db_assessment.student_id: db_assessment
+                for db_assessment in lesson_outcome_self_assessment_model._base_manager.filter(
+                    subject_node_id=lesson_outcome.id
                 )
-            )
+            }
 
-        ws = get_workbook()['SelfAsses']
-        ican_key_col = col_index('B')
         rating_col = col_index('L')
+        lesson_outcome_student_rows = get_sheet_index('SelfAsses', 'B', 'A')
 
-        is_outcome_row = lambda row: all([
-            row[ican_key_col].value == lesson_outcome.ican_key,
-            row[rating_col].value is not None
-        ])
-
-        lesson_outcome_rows = [ row for row in ws if is_outcome_row(row) ]
+        def lesson_outcome_rows(student):
+            return [
+                row for row in lesson_outcome_student_rows.get((lesson_outcome.ican_key, student.row_key), [])
+                if row[rating_col] is not None
+            ]
 
-        all_students = Student.all(student_model=student_model)
+        all_students = students if students is not None else Student.all(student_model=student_model)
         all_assessments = (
             LessonOutcomeSelfAssessment(
                 lesson_outcome, 
                 student, 
-                lesson_outcome_rows,
-                db_lesson_outcome_self_assessment=lesson_outcome_self_assessment_for_student(student)
+                lesson_outcome_rows(student),
+                db_lesson_outcome_self_assessment=db_self_assessments.get(student.id)
             ) for student in all_students
         )
         return [assessment for assessment in all_assessments if assessment.has_attempt]
@@ -327,7 +309,7 @@ class LessonOutcomeSelfAssessment():
 
             self._self_assessment_rows = [
                 row for row in self.lesson_outcome_rows 
-                if row[student_key_col].value == self.student.row_key
+                if row[student_key_col] == self.student.row_key
             ]
         return self._self_assessment_rows
     
@@ -343,9 +325,9 @@ class LessonOutcomeSelfAssessment():
 
     @property
     def date(self):
-        return self.self_assessment_row[col_index('K')].value
+        return self.self_assessment_row[col_index('K')]
 
     @property
     def rating(self):
-        return self.self_assessment_row[col_index('L')].value
+        return self.self_assessment_row[col_index('L')]
 
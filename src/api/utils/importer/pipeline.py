@@ -0,0 +1,327 @@
+import time
+
+from collections import OrderedDict
+from uuid import uuid4
+
+from django.db import models, transaction
+from django.utils import timezone
+
+from . import subjects
+from . import assessments
+from .schools import Student
+
+
+class AssessmentImport():
+    """
+    Imports the assessments and attempts recorded in the source workbook.
+
+    Rows are accumulated in memory and written with `bulk_create` in batches,
+    inside a single transaction. The import runs against whichever model registry
+    it is given, so it can be run from a data migration (with the historical models)
+    as well as from the `import_assessments` management command.
+
+    In upsert mode, the natural keys of the existing assessments and attempts are
+    loaded up front, with one query for each table. Rows which already exist are
+    only written if their values differ from the workbook, so re-importing an
+    unchanged workbook writes nothing.
+    """
+
+    def __init__(self, apps, batch_size=500, upsert=False):
+        self.apps = apps
+        self.batch_size = batch_size
+        self.upsert = upsert
+
+        self.Assessment = apps.get_model('assessments', 'Assessment')
+        self.AssessmentOptions = apps.get_model('assessments', 'AssessmentOptions')
+        self.RatedAttempt = apps.get_model('assessments', 'RatedAttempt')
+        self.CompletionBasedAttempt = apps.get_model('assessments', 'CompletionBasedAttempt')
+
+        AssessmentSchema = apps.get_model('assessments', 'AssessmentSchema')
+        self.schemas = {schema.type: schema for schema in AssessmentSchema.objects.all()}
+
+        self.student_model = apps.get_model('schools', 'Student')
+        self._students = None
+
+        # Options are unique for each schema and node, and are kept if they already exist.
+        self.existing_options = {
+            (options.schema_id, options.subject_node_id): options
+            for options in self.AssessmentOptions._base_manager.only(
+                'id', 'schema_id', 'subject_node_id', '_ratedattempt_max_available_rating'
+            )
+        }
+
+        self.existing_assessments = {}
+        self.existing_attempts = {self.RatedAttempt: {}, self.CompletionBasedAttempt: {}}
+        if upsert:
+            self.existing_assessments = {
+                (schema_id, subject_node_id, student_id): assessment_id
+                for assessment_id, schema_id, subject_node_id, student_id
+                in self.Assessment._base_manager.values_list('id', 'schema_id', 'subject_node_id', 'student_id')
+            }
+            self.existing_attempts = {
+                model: {
+                    (attempt.assessment_id, attempt.attempt_number): attempt
+                    for attempt in model._base_manager.only('id', 'assessment_id', 'attempt_number', *fields)
+                }
+                for model, fields in self.update_fields.items()
+                if model in self.existing_attempts
+            }
+
+        # Pending rows, in the order they need to be inserted.
+        self._pending = OrderedDict([
+            (self.AssessmentOptions, []),
+            (self.Assessment, []),
+            (self.RatedAttempt, []),
+            (self.CompletionBasedAttempt, []),
+        ])
+        self.row_counts = OrderedDict((model, 0) for model in self._pending)
+
+        # Existing rows which differ from the workbook, by id.
+        self._updates = OrderedDict((model, {}) for model in self.update_fields)
+        self.update_counts = OrderedDict((model, 0) for model in self._updates)
+
+        # The assessments which were inserted, or which had attempts inserted or updated.
+        self.assessment_ids = set()
+        # The (schema_id, subject_node_id) of the options which were updated.
+        self.changed_options = set()
+        self.elapsed = None
+
+    @property
+    def update_fields(self):
+        return OrderedDict([
+            (self.AssessmentOptions, ['_ratedattempt_max_available_rating']),
+            (self.RatedAttempt, ['rating']),
+            (self.CompletionBasedAttempt, ['state']),
+        ])
+
+    @property
+    def row_count(self):
+        return sum(self.row_counts.values())
+
+    @property
+    def update_count(self):
+        return sum(self.update_counts.values())
+
+    @property
+    def rows_per_second(self):
+        if not self.elapsed:
+            return 0
+        return self.row_count / self.elapsed
+
+    @property
+    def students(self):
+        # The students are resolved once, rather than once for every subject node.
+        if self._students is None:
+            self._students = list(Student.all(student_model=self.student_model))
+        return self._students
+
+    def run(self, import_subjects=None):
+        if import_subjects is None:
+            import_subjects = subjects.Subject.all(subject_model=self.apps.get_model('subjects', 'Subject'))
+
+        started_at = time.perf_counter()
+        with transaction.atomic():
+            for import_subject in import_subjects:
+                self.add_subject(import_subject)
+            self.flush()
+        self.elapsed = time.perf_counter() - started_at
+        return self
+
+    def summary(self):
+        counts = ', '.join(
+            f'{count} {model.__name__}'
+            for model, count in self.row_counts.items()
+        )
+        summary = f'Imported {self.row_count} rows ({counts}) '
+        if self.upsert:
+            update_counts = ', '.join(
+                f'{count} {model.__name__}'
+                for model, count in self.update_counts.items()
+            )
+            summary += f'and updated {self.update_count} rows ({update_counts}) '
+        return summary + f'in {self.elapsed:.2f}s ({self.rows_per_second:.0f} rows/sec)'
+
+    def changed_assessments(self):
+        """
+        The assessments which were inserted or updated, along with the assessments 
+        which share any options which were updated.
+        """
+        condition = models.Q(pk__in=self.assessment_ids)
+        for schema_id, subject_node_id in self.changed_options:
+            condition |= models.Q(schema_id=schema_id, subject_node_id=subject_node_id)
+        return self.Assessment._base_manager.filter(condition)
+
+    def add(self, obj):
+        self._pending[type(obj)].append(obj)
+        if len(self._pending[self.Assessment]) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        for model, objs in self._pending.items():
+            if objs:
+                model._base_manager.bulk_create(objs, batch_size=self.batch_size)
+                self.row_counts[model] += len(objs)
+                objs.clear()
+        for model, objs in self._updates.items():
+            if objs:
+                model._base_manager.bulk_update(
+                    objs.values(), 
+                    self.update_fields[model] + ['updated_at'], 
+                    batch_size=self.batch_size
+                )
+                self.update_counts[model] += len(objs)
+                objs.clear()
+
+    def update(self, obj, **values):
+        """
+        Updates the existing row with the values, if any of them have changed.
+        Returns whether the row was changed.
+        """
+        # Compare the values as they would be stored (eg. half marks are truncated)
+        values = {
+            name: type(obj)._meta.get_field(name).to_python(value)
+            for name, value in values.items()
+        }
+        if all(getattr(obj, name) == value for name, value in values.items()):
+            return False
+        for name, value in values.items():
+            setattr(obj, name, value)
+        # `auto_now` is not applied by bulk updates
+        obj.updated_at = timezone.now()
+        self._updates[type(obj)][obj.id] = obj
+        return True
+
+    def add_assessment(self, schema_type, subject_node_id, student_id, assessment_id=None):
+        schema = self.schemas[schema_type]
+        existing_id = self.existing_assessments.get((schema.id, subject_node_id, student_id))
+
+        assessment = self.Assessment(
+            id=existing_id or assessment_id or uuid4(),
+            schema=schema,
+            subject_node_id=subject_node_id,
+            student_id=student_id
+        )
+        if existing_id is None:
+            self.assessment_ids.add(assessment.id)
+            self.add(assessment)
+        return assessment
+
+    def add_options(self, schema_type, subject_node_id, **options):
+        existing_options = self.existing_options.get((self.schemas[schema_type].id, subject_node_id))
+        if existing_options is not None:
+            if self.upsert and self.update(existing_options, **{f'_{name}': value for name, value in options.items()}):
+                self.changed_options.add((existing_options.schema_id, subject_node_id))
+            return
+        self.add(self.AssessmentOptions(
+            id=uuid4(),
+            schema=self.schemas[schema_type],
+            subject_node_id=subject_node_id,
+            **{f'_{name}': value for name, value in options.items()}
+        ))
+
+    def add_attempt(self, model, attempt_type, assessment, attempt_number, date, attempt_id=None, **values):
+        existing_attempt = self.existing_attempts[model].get((assessment.id, attempt_number))
+        if existing_attempt is not None:
+            if self.update(existing_attempt, **values):
+                self.assessment_ids.add(assessment.id)
+            return
+
+        self.assessment_ids.add(assessment.id)
+        self.add(model(
+            id=attempt_id or uuid4(),
+            attempt_type=attempt_type,
+            assessment=assessment,
+            attempt_number=attempt_number,
+            created_at=date,
+            **values
+        ))
+
+    def add_rated_attempt(self, assessment, attempt_number, rating, date, attempt_id=None):
+        from assessments.models import AttemptType
+        self.add_attempt(self.RatedAttempt, AttemptType.RATED, assessment, attempt_number, date, 
+            attempt_id=attempt_id, rating=rating)
+
+    def add_completion_based_attempt(self, assessment, attempt_number, state, date, attempt_id=None):
+        from assessments.models import AttemptType
+        self.add_attempt(self.CompletionBasedAttempt, AttemptType.COMPLETION_BASED, assessment, attempt_number, date,
+            attempt_id=attempt_id, state=state)
+
+    def add_subject(self, import_subject):
+        for import_unit in import_subject.units:
+            self.add_unit(import_unit)
+
+    def add_unit(self, import_unit):
+        self.add_options('unit-assessment', import_unit.id,
+            ratedattempt_max_available_rating=assessments.UnitAssessment.max_available_mark(import_unit))
+
+        all_unit_assessments = assessments.UnitAssessment.all_for_unit(
+            import_unit,
+            student_model=self.student_model,
+            students=self.students
+        )
+        for import_assessment in all_unit_assessments:
+            if not import_assessment.has_attempts:
+                continue
+            assessment = self.add_assessment('unit-assessment', import_unit.id, import_assessment.student.id,
+                assessment_id=import_assessment.id)
+
+            for import_attempt in import_assessment.attempts:
+                self.add_rated_attempt(assessment, 1, import_attempt.raw_mark, import_attempt.date,
+                    attempt_id=import_attempt.id)
+
+        for import_block in import_unit.blocks:
+            self.add_block(import_block)
+
+    def add_block(self, import_block):
+        self.add_options('block-assessment', import_block.id,
+            ratedattempt_max_available_rating=assessments.BlockAssessment.max_available_mark(import_block))
+
+        all_block_assessments = assessments.BlockAssessment.all_for_block(
+            import_block,
+            student_model=self.student_model,
+            students=self.students
+        )
+        for import_assessment in all_block_assessments:
+            assessment = self.add_assessment('block-assessment', import_block.id, import_assessment.student.id,
+                assessment_id=import_assessment.id)
+
+            for import_attempt in import_assessment.attempts:
+                self.add_rated_attempt(assessment, import_attempt.attempt_number, import_attempt.raw_mark,
+                    import_attempt.date, attempt_id=import_attempt.id)
+
+        for import_lesson in import_block.lessons:
+            self.add_lesson(import_lesson)
+
+    def add_lesson(self, import_lesson):
+        from assessments.models import CompletionState
+
+        all_prelearning_assessments = assessments.LessonPrelearningAssessment.all_for_lesson(
+            import_lesson,
+            student_model=self.student_model,
+            students=self.students
+        )
+        for import_assessment in all_prelearning_assessments:
+            assessment = self.add_assessment('lesson-prelearning-assessment', import_lesson.id,
+                import_assessment.student.id, assessment_id=import_assessment.id)
+
+            if (import_assessment.rating or 0) == 0:
+                completion_state = CompletionState.NONE
+            elif import_assessment.rating < 4:
+                completion_state = CompletionState.PARTIALLY_COMPLETE
+            else:
+                completion_state = CompletionState.COMPLETE
+            self.add_completion_based_attempt(assessment, 1, completion_state, import_assessment.date)
+
+        for import_lesson_outcome in import_lesson.outcomes:
+            self.add_lesson_outcome(import_lesson_outcome)
+
+    def add_lesson_outcome(self, import_lesson_outcome):
+        all_self_assessments = assessments.LessonOutcomeSelfAssessment.all_for_lesson_outcome(
+            import_lesson_outcome,
+            student_model=self.student_model,
+            students=self.students
+        )
+        for import_assessment in all_self_assessments:
+            assessment = self.add_assessment('lesson-outcome-self-assessment', import_lesson_outcome.id,
+                import_assessment.student.id, assessment_id=import_assessment.id)
+            self.add_rated_attempt(assessment, 1, import_assessment.rating, import_assessment.date)
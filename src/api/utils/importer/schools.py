@@ -1,7 +1,7 @@
 from collections import OrderedDict
 from uuid import uuid4
 
-from ._excel import get_workbook, col_index
+from ._excel import get_sheet_rows, get_sheet_index, col_index
 
 class School():
 	@classmethod
@@ -61,19 +61,25 @@ class Teacher():
 class Student():
 	@classmethod
 	def all(cls, student_model=None):
-		ws = get_workbook()['StudentData']
 		student_key_col = col_index('A')
-		student_worksheet_rows = (row for row in list(ws)[1:] if row[student_key_col].value is not None)
+		student_code_col = col_index('D')
+		student_worksheet_rows = [
+			row for row in get_sheet_rows('StudentData')[1:] 
+			if row[student_key_col] is not None
+		]
 
-		def student_for_row(row):
-			student_code = row[col_index('D')].value
-			try:
-				return student_model and student_model.objects.get(student_code=student_code)
-			except ObjectDoesNotExist:
-				return None
+		# The existing students, by student code, in a single query
+		db_students = {}
+		if student_model is not None:
+			db_students = {
+				db_student.student_code: db_student
+				for db_student in student_model.objects.filter(
+					student_code__in=[row[student_code_col] for row in student_worksheet_rows]
+				)
+			}
 
 		return (
-			cls(row, db_student=student_for_row(row))
+			cls(row, db_student=db_students.get(row[student_code_col]))
 			for row in student_worksheet_rows
 		)
 
@@ -92,43 +98,40 @@ class Student():
 
 	@property		
 	def row_key(self):
-		return self.students_worksheet_row[col_index('A')].value
+		return self.students_worksheet_row[col_index('A')]
 
 	@property
 	def code(self):
-		return self.students_worksheet_row[col_index('D')].value
+		return self.students_worksheet_row[col_index('D')]
 
 	@property
 	def first_name(self):
-		return self.students_worksheet_row[col_index('B')].value
+		return self.students_worksheet_row[col_index('B')]
 
 	@property
 	def surname(self):
-		return self.students_worksheet_row[col_index('C')].value
+		return self.students_worksheet_row[col_index('C')]
 
 	@property
 	def year_level(self):
-		return self.students_worksheet_row[col_index('F')].value
+		return self.students_worksheet_row[col_index('F')]
 
 	@property
 	def compass_number(self):
-		return self.students_worksheet_row[col_index('M')].value
+		return self.students_worksheet_row[col_index('M')]
 
 	@property
 	def class_code(self):
-		return self.students_worksheet_row[col_index('I')].value
+		return self.students_worksheet_row[col_index('I')]
 
 class Class():
 	@classmethod
 	def all(cls, subject, subject_class_model=None):
-		students_worksheet = get_workbook()['StudentData']
-		class_code_col = col_index('I')
-		
-		all_class_codes = OrderedDict(
-			(row[class_code_col].value, None) 
-			for row in students_worksheet
-			if (row[class_code_col].value or '').startswith(subject.name)
-		).keys()
+		# Class codes in order of their first row in the worksheet
+		all_class_codes = [
+			class_code for class_code in get_sheet_index('StudentData', 'I')
+			if (class_code or '').startswith(subject.name)
+		]
 
 		def subject_class_for_code(code):
 			if not subject_class_model:
@@ -159,16 +162,12 @@ class Class():
 
 	@property		
 	def teacher_code(self):
-		return self.students_worksheet_rows[0][col_index('J')].value
+		return self.students_worksheet_rows[0][col_index('J')]
 
 	@property
 	def students_worksheet_rows(self):
 		if not hasattr(self, '_students_rows'):
-			students_worksheet = get_workbook()['StudentData']
-			self._students_rows = [
-				row for row in students_worksheet
-				if row[col_index('I')].value == self.code
-			]
+			self._students_rows = get_sheet_index('StudentData', 'I').get(self.code, [])
 		return self._students_rows
 
 	def students(self, student_model=None):
@@ -178,7 +177,7 @@ class Class():
 			def student_for_row(row):
 				if student_model is None:
 					return None
-				student_code = row[student_code_col].value
+				student_code = row[student_code_col]
 				return student_model.objects.get(student_code=student_code)
 
 			self._students = [
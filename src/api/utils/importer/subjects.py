@@ -9,7 +9,7 @@ from django.core.exceptions import ObjectDoesNotExist
 from uuid import uuid4
 from collections import OrderedDict
 
-from ._excel import get_workbook, col_index
+from ._excel import get_sheet_rows, get_sheet_index, col_index
 	
 class Subject():
 	@classmethod
@@ -32,17 +32,17 @@ class Subject():
 	@property
 	def units(self):
 		if not hasattr(self, '_units'):
-			lessons_worksheet = get_workbook()['Lessons']
 			# Use the keys of an OrderedDict to emulate an ordered set
 			unit_names = OrderedDict(
-				[row[col_index('E')].value, None] 
-				for row in list(lessons_worksheet)[1:]
-				if row[col_index('E')].value is not None
+				[row[col_index('E')], None] 
+				for row in get_sheet_rows('Lessons')[1:]
+				if row[col_index('E')] is not None
 			).keys()
 
-			def unit_for_name(name):
-				return self.db_subject and self.db_subject.unit_set.get(name=name)
-			self._units = [Unit(self, name, db_unit=unit_for_name(name)) for name in unit_names]
+			db_units = {}
+			if self.db_subject:
+				db_units = {db_unit.name: db_unit for db_unit in self.db_subject.unit_set.all()}
+			self._units = [Unit(self, name, db_unit=db_units.get(name)) for name in unit_names]
 		return self._units
 
 class Unit():	
@@ -56,22 +56,22 @@ class Unit():
 	@property
 	def lessons_rows(self):
 		if not hasattr(self, '_rows'):
-			lessons_worksheet = get_workbook()['Lessons']
-			self._rows = [row for row in lessons_worksheet if row[col_index('E')].value == self.name]
+			self._rows = get_sheet_index('Lessons', 'E').get(self.name, [])
 		return self._rows		
 
 	@property
 	def key(self):
-		return self.lessons_rows[0][col_index('C')].value
+		return self.lessons_rows[0][col_index('C')]
 
 	@property
 	def blocks(self):
 		if not hasattr(self, '_blocks'):
 			# Use the keys of an OrderedDict as an OrderedSet
-			block_names = OrderedDict([row[col_index('F')].value, None] for row in self.lessons_rows).keys()
-			def block_for_name(name):	
-				return self.db_unit and self.db_unit.block_set.get(name=name)
-			self._blocks = [Block(self, name, db_block=block_for_name(name)) for name in block_names]
+			block_names = OrderedDict([row[col_index('F')], None] for row in self.lessons_rows).keys()
+			db_blocks = {}
+			if self.db_unit:
+				db_blocks = {db_block.name: db_block for db_block in self.db_unit.block_set.all()}
+			self._blocks = [Block(self, name, db_block=db_blocks.get(name)) for name in block_names]
 		return self._blocks
 
 class Block():
@@ -84,14 +84,13 @@ class Block():
 	@property	
 	def block_key(self):
 		if not hasattr(self, '_block_key'):
-			self._block_key = self.lessons_rows[0][col_index('D')].value
+			self._block_key = self.lessons_rows[0][col_index('D')]
 		return self._block_key
 
 	@property		
 	def lessons_rows(self):
 		if not hasattr(self, '_rows'):
-			lessons_worksheet = get_workbook()['Lessons']
-			self._rows = [row for row in lessons_worksheet if row[col_index('F')].value == self.name]
+			self._rows = get_sheet_index('Lessons', 'F').get(self.name, [])
 		return self._rows
 
 	@property		
@@ -111,7 +110,7 @@ class Block():
 					raise IndexError('At least one match should be returned')
 
 			self._lessons = [
-				Lesson(self, row[lesson_key_col].value, db_lesson=lesson_for_name(row[name_col].value))
+				Lesson(self, row[lesson_key_col], db_lesson=lesson_for_name(row[name_col]))
 				for row in self.lessons_rows
 			]
 		return self._lessons	
@@ -128,22 +127,18 @@ class Lesson():
 	@property		
 	def lesson_row(self):
 		if not hasattr(self, '_row'):
-			lesson_worksheet = get_workbook()['Lessons']
-			self._row = [
-		 		row for row in lesson_worksheet 
-		 		if row[col_index('A')].value == self.lesson_key
-		 	][0]
+			self._row = get_sheet_index('Lessons', 'A')[self.lesson_key][0]
 		return self._row 	
 
 	@property
 	def lessons_row_key(self):
 		if not hasattr(self, '_lessons_row_key'):
-			self._lessons_row_key = self.lesson_row[col_index('A')].value
+			self._lessons_row_key = self.lesson_row[col_index('A')]
 		return self._lessons_row_key
 
 	@property		
 	def name(self):
-		raw_name = self.lesson_row[col_index('J')].value
+		raw_name = self.lesson_row[col_index('J')]
 		if raw_name.startswith(self.code):
 			return raw_name[len(self.code):].lstrip()
 		else:
@@ -152,16 +147,16 @@ class Lesson():
 	@property
 	def code(self):
 		if not hasattr(self, '_code'):	
-			self._code = self.lesson_row[col_index('I')].value
+			self._code = self.lesson_row[col_index('I')]
 		return self._code		
 
 	@property
 	def number(self):
-		return self.lesson_row[col_index('G')].value
+		return self.lesson_row[col_index('G')]
 
 	@property		
 	def example_descriptions(self):
-		raw_description = self.lesson_row[col_index('K')].value
+		raw_description = self.lesson_row[col_index('K')]
 		if raw_description is None:
 			return []
 		return [example.strip() for example in raw_description.split(',')]
@@ -169,25 +164,23 @@ class Lesson():
 	@property
 	def outcomes(self):		
 		if not hasattr(self, '_outcomes'):
-			ican_worksheet = get_workbook()['Ican']
 			ican_keys = OrderedDict(
-				[row[col_index('A')].value, row]
-				for row in ican_worksheet
-				if row[col_index('C')].value == self.lesson_key
+				[row[col_index('A')], row]
+				for row in get_sheet_index('Ican', 'C').get(self.lesson_key, [])
 			)
 
 			statement_col = col_index('J')
 
-			def lesson_outcome_for_ican_key(ican_key):
-				row = ican_keys[ican_key]
-				try:
-					return self.db_lesson and self.db_lesson.lessonoutcome_set.get(description=row[statement_col].value)
-				except:
-					import pdb; pdb.set_trace()
-
+			# The existing outcomes of the lesson, by description, in a single query
+			db_lesson_outcomes = {}
+			if self.db_lesson:
+				db_lesson_outcomes = {
+					db_lesson_outcome.description: db_lesson_outcome 
+					for db_lesson_outcome in self.db_lesson.lessonoutcome_set.all()
+				}
 
 			self._outcomes = [
-				LessonOutcome(self, ican_key, db_lesson_outcome=lesson_outcome_for_ican_key(ican_key))
+				LessonOutcome(self, ican_key, db_lesson_outcome=db_lesson_outcomes.get(row[statement_col]))
 				for ican_key, row in ican_keys.items()
 			]
 		return self._outcomes			
@@ -203,10 +196,9 @@ class LessonOutcome():
 	@property	
 	def ican_row(self):
 		if not hasattr(self, '_row'):
-			ican_worksheet = get_workbook()['Ican']	
-			self._row = [row for row in ican_worksheet if row[col_index('A')].value == self.ican_key][0]
+			self._row = get_sheet_index('Ican', 'A')[self.ican_key][0]
 		return self._row		
 
 	@property
 	def description(self):
-		return self.ican_row[col_index('J')].value
+		return self.ican_row[col_index('J')]